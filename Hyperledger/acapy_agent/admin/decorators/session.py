@@ -0,0 +1,24 @@
+"""Session decorators for the admin API."""
+
+import functools
+
+from ..request_context import AdminRequestContext
+
+
+def shared_session(handler):
+    """Decorator to share one profile session across a route handler.
+
+    The sessions opened by the handler, or by tasks it starts, join a single
+    session which acquires its store connection on first use and holds it
+    until the handler returns, including across any awaits in between. Only
+    apply it to handlers performing several storage reads and no network
+    calls, so the connection is not held while waiting on other agents.
+    """
+
+    @functools.wraps(handler)
+    async def scoped_session(request):
+        context: AdminRequestContext = request["context"]
+        async with context.session_scope():
+            return await handler(request)
+
+    return scoped_session
@@ -8,7 +8,7 @@ from typing import Mapping, Optional, Type
 from ..config.injection_context import InjectionContext
 from ..config.injector import InjectionError, Injector, InjectType
 from ..config.settings import Settings
-from ..core.profile import Profile, ProfileSession
+from ..core.profile import Profile, ProfileSession, SessionScope
 
 
 class AdminRequestContext:
@@ -58,6 +58,10 @@ class AdminRequestContext:
         """Start a new interactive session with no transaction support requested."""
         return self.profile.session(self._context)
 
+    def session_scope(self) -> SessionScope:
+        """Create a scope sharing one session between the sessions of the request."""
+        return self.profile.session_scope(self._context)
+
     def transaction(self) -> ProfileSession:
         """Start a new interactive session with commit and rollback support.
 
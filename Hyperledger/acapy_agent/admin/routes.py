@@ -7,6 +7,7 @@ from aiohttp import web
 from aiohttp_apispec import docs, response_schema
 from marshmallow import fields
 
+from ..cache.base import BaseCache
 from ..core.plugin_registry import PluginRegistry
 from ..messaging.models.openapi import OpenAPISchema
 from ..utils.stats import Collector
@@ -42,6 +43,23 @@ class AdminStatusSchema(OpenAPISchema):
     )
 
 
+class AdminCacheStatusSchema(OpenAPISchema):
+    """Schema for the cache status endpoint."""
+
+    cache = fields.Dict(
+        keys=fields.Str(metadata={"description": "Cache key namespace"}),
+        values=fields.Dict(
+            metadata={
+                "description": (
+                    "Counts of hits, misses, expirations, evictions, lock waits, "
+                    "background refreshes and resident entries"
+                )
+            }
+        ),
+        metadata={"description": "Cache statistics by key namespace"},
+    )
+
+
 class AdminResetSchema(OpenAPISchema):
     """Schema for the reset endpoint."""
 
@@ -143,6 +161,23 @@ async def status_handler(request: web.BaseRequest):
     return web.json_response(status)
 
 
+@docs(tags=["server"], summary="Fetch the cache statistics")
+@response_schema(AdminCacheStatusSchema(), 200, description="")
+@admin_authentication
+async def cache_status_handler(request: web.BaseRequest):
+    """Request handler for the cache statistics.
+
+    Args:
+        request: aiohttp request object
+
+    Returns:
+        The web response
+
+    """
+    cache = request.app["context"].inject_or(BaseCache)
+    return web.json_response({"cache": await cache.get_stats() if cache else {}})
+
+
 @docs(tags=["server"], summary="Reset statistics")
 @response_schema(AdminResetSchema(), 200, description="")
 @admin_authentication
@@ -159,6 +194,9 @@ async def status_reset_handler(request: web.BaseRequest):
     collector = request.app["context"].inject_or(Collector)
     if collector:
         collector.reset()
+    cache = request.app["context"].inject_or(BaseCache)
+    if cache:
+        cache.stats.reset()
     return web.json_response({})
 
 
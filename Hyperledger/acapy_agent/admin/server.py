@@ -39,6 +39,7 @@ from .base_server import BaseAdminServer
 from .error import AdminSetupError
 from .request_context import AdminRequestContext
 from .routes import (
+    cache_status_handler,
     config_handler,
     liveliness_handler,
     plugins_handler,
@@ -378,6 +379,7 @@ class AdminServer(BaseAdminServer):
             web.get("/", redirect_handler, allow_head=True),
             web.get("/plugins", plugins_handler, allow_head=False),
             web.get("/status", status_handler, allow_head=False),
+            web.get("/status/cache", cache_status_handler, allow_head=False),
             web.get("/status/config", config_handler, allow_head=False),
             web.post("/status/reset", status_reset_handler),
             web.get("/status/live", liveliness_handler, allow_head=False),
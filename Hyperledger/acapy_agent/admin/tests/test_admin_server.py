@@ -10,6 +10,8 @@ from aiohttp.test_utils import unused_port
 from marshmallow import ValidationError
 
 from ...askar.profile import AskarProfile
+from ...cache.base import BaseCache
+from ...cache.in_memory import InMemoryCache
 from ...config.default_context import DefaultContextBuilder
 from ...config.injection_context import InjectionContext
 from ...core.event_bus import Event
@@ -473,6 +475,35 @@ class TestAdminServer(IsolatedAsyncioTestCase):
                 "localhost:8123/def",
             ]
 
+    async def test_query_cache_status(self):
+        settings = {"admin.admin_insecure_mode": True}
+        context = InjectionContext()
+        cache = InMemoryCache()
+        context.injector.bind_instance(BaseCache, cache)
+        await cache.set("resolver::did:example:123", "doc")
+        await cache.get("resolver::did:example:123")
+        await cache.get("connection_target::abc")
+        server = await self.get_admin_server(settings, context)
+        await server.start()
+
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/status/cache", headers={}
+        ) as response:
+            assert response.status == 200
+            result = json.loads(await response.text())["cache"]
+            assert result["resolver"]["hits"] == 1
+            assert result["resolver"]["resident"] == 1
+            assert result["connection_target"]["misses"] == 1
+            assert result["connection_target"]["resident"] == 0
+
+        async with self.client_session.post(
+            f"http://127.0.0.1:{self.port}/status/reset", headers={}
+        ) as response:
+            assert response.status == 200
+        assert (await cache.get_stats())["resolver"]["hits"] == 0
+
+        await server.stop()
+
     async def test_visit_shutting_down(self):
         settings = {
             "admin.admin_insecure_mode": True,
@@ -0,0 +1,37 @@
+from unittest import IsolatedAsyncioTestCase
+
+from ...tests import mock
+from ...utils.testing import create_test_profile
+from ..decorators.session import shared_session
+from ..request_context import AdminRequestContext
+
+
+class TestSharedSession(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.profile = await create_test_profile()
+        self.context = AdminRequestContext.test_context({}, self.profile)
+        self.request = mock.MagicMock(
+            __getitem__=lambda _, k: {"context": self.context}[k]
+        )
+
+    async def test_shared_session(self):
+        sessions = []
+
+        async def handler(request):
+            for _ in range(2):
+                async with self.context.session() as session:
+                    sessions.append(session)
+            async with self.profile.session() as session:
+                sessions.append(session)
+            return "response"
+
+        assert await shared_session(handler)(self.request) == "response"
+        assert sessions[0] is sessions[1] is sessions[2]
+        assert not sessions[0].active
+
+    async def test_not_shared_without_decorator(self):
+        async with self.context.session() as first:
+            pass
+        async with self.context.session() as second:
+            pass
+        assert first is not second
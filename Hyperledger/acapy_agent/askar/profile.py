@@ -76,6 +76,7 @@ class AskarProfile(Profile):
             keepalive = int(self.settings.get("ledger.keepalive", 5))
             read_only = bool(self.settings.get("ledger.read_only", False))
             socks_proxy = self.settings.get("ledger.socks_proxy")
+            persistent_cache = bool(self.settings.get("ledger.persistent_cache"))
             if read_only:
                 LOGGER.warning("Note: setting ledger to read-only mode")
             genesis_transactions = self.settings.get("ledger.genesis_transactions")
@@ -84,6 +85,7 @@ class AskarProfile(Profile):
                 pool_name,
                 keepalive=keepalive,
                 cache=cache,
+                persistent_cache=persistent_cache,
                 genesis_transactions=genesis_transactions,
                 read_only=read_only,
                 socks_proxy=socks_proxy,
@@ -145,6 +147,9 @@ class AskarProfile(Profile):
                         or write_ledger_config.get("id"),
                         keepalive=write_ledger_config.get("keepalive"),
                         cache=cache,
+                        persistent_cache=bool(
+                            self.settings.get("ledger.persistent_cache")
+                        ),
                         genesis_transactions=write_ledger_config.get(
                             "genesis_transactions"
                         ),
@@ -181,8 +186,13 @@ class AskarProfile(Profile):
     def session(
         self, context: Optional[InjectionContext] = None
     ) -> "AskarProfileSession":
-        """Start a new interactive session with no transaction support requested."""
-        return AskarProfileSession(self, False, context=context)
+        """Start a new interactive session with no transaction support requested.
+
+        Within a session scope of this profile, the shared session is returned.
+        """
+        return self._scoped_session(
+            context, lambda context: AskarProfileSession(self, False, context=context)
+        )
 
     def transaction(
         self, context: Optional[InjectionContext] = None
@@ -78,6 +78,7 @@ class AskarAnoncredsProfile(Profile):
             keepalive = int(self.settings.get("ledger.keepalive", 5))
             read_only = bool(self.settings.get("ledger.read_only", False))
             socks_proxy = self.settings.get("ledger.socks_proxy")
+            persistent_cache = bool(self.settings.get("ledger.persistent_cache"))
             if read_only:
                 LOGGER.warning("Note: setting ledger to read-only mode")
             genesis_transactions = self.settings.get("ledger.genesis_transactions")
@@ -86,6 +87,7 @@ class AskarAnoncredsProfile(Profile):
                 pool_name,
                 keepalive=keepalive,
                 cache=cache,
+                persistent_cache=persistent_cache,
                 genesis_transactions=genesis_transactions,
                 read_only=read_only,
                 socks_proxy=socks_proxy,
@@ -134,6 +136,9 @@ class AskarAnoncredsProfile(Profile):
                         or write_ledger_config.get("id"),
                         keepalive=write_ledger_config.get("keepalive"),
                         cache=cache,
+                        persistent_cache=bool(
+                            self.settings.get("ledger.persistent_cache")
+                        ),
                         genesis_transactions=write_ledger_config.get(
                             "genesis_transactions"
                         ),
@@ -162,8 +167,14 @@ class AskarAnoncredsProfile(Profile):
     def session(
         self, context: Optional[InjectionContext] = None
     ) -> "AskarAnoncredsProfileSession":
-        """Start a new interactive session with no transaction support requested."""
-        return AskarAnoncredsProfileSession(self, False, context=context)
+        """Start a new interactive session with no transaction support requested.
+
+        Within a session scope of this profile, the shared session is returned.
+        """
+        return self._scoped_session(
+            context,
+            lambda context: AskarAnoncredsProfileSession(self, False, context=context),
+        )
 
     def transaction(
         self, context: Optional[InjectionContext] = None
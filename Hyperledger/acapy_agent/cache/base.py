@@ -1,22 +1,106 @@
 """Abstract base classes for cache."""
 
 import asyncio
+import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Sequence, Text, Union
+from collections import Counter, defaultdict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Sequence,
+    Set,
+    Text,
+    Tuple,
+    Union,
+)
 
 from ..core.error import BaseError
 
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_NEGATIVE_TTL = 30
+NEGATIVE_RESULT_KEY = "acapy::cache::not_found"
+
 
 class CacheError(BaseError):
     """Base class for cache-related errors."""
 
 
+def negative_result(reason: str) -> dict:
+    """Create a cache value recording that a lookup found nothing.
+
+    Args:
+        reason: a description of the failed lookup, such as an error message
+
+    """
+    return {NEGATIVE_RESULT_KEY: reason}
+
+
+def is_negative_result(value: Any) -> bool:
+    """Check whether a cached value records a failed lookup."""
+    return isinstance(value, dict) and NEGATIVE_RESULT_KEY in value
+
+
+class CacheStats:
+    """Counters for cache operations, grouped by key namespace.
+
+    The namespace of a key is the prefix before its first `::` separator,
+    such as `connection_target` or `resolver`.
+    """
+
+    COUNTERS = ("hits", "misses", "expirations", "evictions", "lock_waits", "refreshes")
+    DEFAULT_NAMESPACE = "default"
+
+    def __init__(self):
+        """Initialize the cache statistics."""
+        self._counts = defaultdict(Counter)
+
+    @classmethod
+    def namespace(cls, key: Text) -> str:
+        """Get the namespace for a cache key."""
+        namespace, sep, _ = key.partition("::")
+        return namespace if sep else cls.DEFAULT_NAMESPACE
+
+    def record(self, counter: str, key: Text, count: int = 1):
+        """Increment a counter for the namespace of a cache key."""
+        self._counts[self.namespace(key)][counter] += count
+
+    def results(self, resident_keys: Iterable[Text] = ()) -> dict:
+        """Get the current counters and resident entry count per namespace."""
+        resident = Counter(self.namespace(key) for key in resident_keys)
+        results = {}
+        for namespace in sorted(set(self._counts) | set(resident)):
+            counts = self._counts[namespace]
+            results[namespace] = {counter: counts[counter] for counter in self.COUNTERS}
+            results[namespace]["resident"] = resident[namespace]
+        return results
+
+    def reset(self):
+        """Reset all counters."""
+        self._counts = defaultdict(Counter)
+
+
 class BaseCache(ABC):
     """Abstract cache interface."""
 
     def __init__(self):
         """Initialize the cache instance."""
         self._key_locks = {}
+        # looks like { "key": (<refresh timestamp>, <expiry timestamp>) }
+        self._refresh_at: Dict[Text, Tuple[float, float]] = {}
+        self._refresh_prune_size = 1024
+        self._refresh_tasks: Dict[Text, asyncio.Task] = {}
+        # tag index, looks like { "tag": {"key", ...} } and the reverse
+        self._tag_keys: Dict[Text, Set[Text]] = {}
+        self._key_tags: Dict[Text, Set[Text]] = {}
+        self.refresh_ahead = 0.0
+        self.refresh_grace = 0
+        self.stats = CacheStats()
 
     @abstractmethod
     async def get(self, key: Text):
@@ -36,6 +120,10 @@ class BaseCache(ABC):
     ):
         """Add an item to the cache with an optional ttl.
 
+        Caches shared between processes store values as JSON, and skip (with a
+        warning) values which cannot be serialized; callers must not rely on
+        such values being cached.
+
         Args:
             keys: the key or keys for which to set an item
             value: the value to store in the cache
@@ -56,6 +144,164 @@ class BaseCache(ABC):
     async def flush(self):
         """Remove all items from the cache."""
 
+    async def resident_keys(self) -> Iterable[Text]:
+        """Get the keys of the entries currently held by the cache."""
+        return ()
+
+    async def get_stats(self) -> dict:
+        """Get the cache statistics, grouped by key namespace."""
+        return self.stats.results(await self.resident_keys())
+
+    def enable_refresh_ahead(self, fraction: float, grace: int = 0):
+        """Enable refresh-ahead for entries stored with `refresh_ahead=True`.
+
+        Such an entry is refreshed in the background once it enters the final
+        `fraction` of its ttl, and is kept for `grace` seconds past its ttl so
+        that callers keep receiving the stale value while the refresh runs.
+
+        Args:
+            fraction: the trailing fraction of the ttl in which to refresh
+            grace: number of seconds to keep serving an entry past its ttl
+
+        """
+        if not 0 < fraction <= 1:
+            raise CacheError("Refresh-ahead fraction must be in (0, 1]")
+        self.refresh_ahead = fraction
+        self.refresh_grace = grace
+
+    async def set_refreshable(
+        self, keys: Union[Text, Sequence[Text]], value: Any, ttl: Optional[int] = None
+    ):
+        """Add an item to the cache, scheduling a refresh-ahead if enabled.
+
+        Args:
+            keys: the key or keys for which to set an item
+            value: the value to store in the cache
+            ttl: number of seconds that the record should be considered fresh
+
+        """
+        if not (self.refresh_ahead and ttl):
+            await self.set(keys, value, ttl)
+            return
+        now = time.monotonic()
+        schedule = (now + ttl * (1 - self.refresh_ahead), now + ttl + self.refresh_grace)
+        await self.set(keys, value, ttl + self.refresh_grace)
+        for key in [keys] if isinstance(keys, Text) else keys:
+            self._refresh_at[key] = schedule
+        if len(self._refresh_at) > self._refresh_prune_size:
+            self._refresh_at = {
+                key: sched for key, sched in self._refresh_at.items() if sched[1] > now
+            }
+            self._refresh_prune_size = max(1024, 2 * len(self._refresh_at))
+
+    def refresh_due(self, key: Text) -> bool:
+        """Check whether a cached entry should be refreshed in the background."""
+        schedule = self._refresh_at.get(key)
+        if not schedule or key in self._refresh_tasks:
+            return False
+        now = time.monotonic()
+        if now >= schedule[1]:
+            del self._refresh_at[key]
+            return False
+        return now >= schedule[0]
+
+    def refresh(
+        self, key: Text, fetch: Callable[[], Awaitable[Any]], ttl: Optional[int] = None
+    ) -> asyncio.Task:
+        """Refresh a cached entry in the background.
+
+        Only one refresh runs per key at a time. The refreshed value replaces the
+        entry, or the entry is cleared if `fetch` returns nothing. If `fetch`
+        fails, the stale value is kept until the end of its grace window.
+
+        Args:
+            key: the key to refresh
+            fetch: a coroutine function producing the new value
+            ttl: number of seconds that the new value should be considered fresh
+
+        Returns:
+            The task performing the refresh
+
+        """
+        if key in self._refresh_tasks:
+            return self._refresh_tasks[key]
+
+        async def _refresh():
+            try:
+                value = await fetch()
+                if value:
+                    await self.set_refreshable(key, value, ttl)
+                else:
+                    await self.clear(key)
+            except Exception:
+                LOGGER.warning("Error refreshing cache entry: %s", key, exc_info=True)
+            finally:
+                if self._refresh_tasks.get(key) is asyncio.current_task():
+                    del self._refresh_tasks[key]
+
+        self.stats.record("refreshes", key)
+        task = asyncio.ensure_future(_refresh())
+        self._refresh_tasks[key] = task
+        return task
+
+    async def tag(self, keys: Union[Text, Sequence[Text]], tags: Iterable[Text]):
+        """Associate cache keys with one or more tags for bulk invalidation.
+
+        Implementations holding the index in process memory should call
+        `_untag` whenever an entry is removed by expiry or eviction.
+
+        Args:
+            keys: the key or keys to tag
+            tags: the tags to associate with the keys
+
+        """
+        tags = set(tags)
+        if not tags:
+            return
+        for key in [keys] if isinstance(keys, Text) else keys:
+            self._key_tags.setdefault(key, set()).update(tags)
+            for tag in tags:
+                self._tag_keys.setdefault(tag, set()).add(key)
+
+    def _untag(self, key: Text):
+        """Remove a key from the tag index."""
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+    def _cancel_refresh(self, key: Text):
+        """Cancel any pending background refresh of a key.
+
+        Implementations should call this whenever an entry is cleared, so that
+        a refresh in flight cannot write back the value being invalidated.
+        """
+        self._refresh_at.pop(key, None)
+        task = self._refresh_tasks.pop(key, None)
+        # a refresh clearing its own key must not cancel itself
+        if task and task is not asyncio.current_task():
+            task.cancel()
+
+    def _cancel_refreshes(self):
+        """Cancel all pending background refreshes."""
+        for key in list(self._refresh_tasks):
+            self._cancel_refresh(key)
+        self._refresh_at = {}
+
+    async def clear_tag(self, tag: Text):
+        """Remove all items associated with a tag from the cache.
+
+        Args:
+            tag: the tag to invalidate
+
+        """
+        for key in list(self._tag_keys.get(tag, ())):
+            self._untag(key)
+            self._cancel_refresh(key)
+            await self.clear(key)
+
     def acquire(self, key: Text):
         """Acquire a lock on a given cache key."""
         result = CacheKeyLock(self, key)
@@ -123,13 +369,50 @@ class CacheKeyLock:
         if result:
             self._future.set_result(fut.result())
 
-    async def set_result(self, value: Any, ttl: Optional[int] = None):
-        """Set the result, updating the cache and any waiters."""
+    @property
+    def refresh_due(self) -> bool:
+        """Check whether the cached result should be refreshed in the background."""
+        return bool(self.result) and self.cache.refresh_due(self.key)
+
+    async def set_result(
+        self,
+        value: Any,
+        ttl: Optional[int] = None,
+        refresh_ahead: bool = False,
+        tags: Optional[Iterable[Text]] = None,
+    ):
+        """Set the result, updating the cache and any waiters.
+
+        Args:
+            value: the value to store
+            ttl: number of seconds that the value should persist
+            refresh_ahead: allow the value to be refreshed in the background, if
+                refresh-ahead is enabled for the cache
+            tags: tags under which the entry can be invalidated with `clear_tag`
+
+        """
         if self.done and value:
             raise CacheError("Result already set")
         self._future.set_result(value)
         if not self._parent or self._parent.done:
-            await self.cache.set(self.key, value, ttl)
+            if refresh_ahead:
+                await self.cache.set_refreshable(self.key, value, ttl)
+            else:
+                await self.cache.set(self.key, value, ttl)
+            if tags:
+                await self.cache.tag(self.key, tags)
+
+    def refresh(
+        self, fetch: Callable[[], Awaitable[Any]], ttl: Optional[int] = None
+    ) -> asyncio.Task:
+        """Refresh the cached result in the background.
+
+        Args:
+            fetch: a coroutine function producing the new value
+            ttl: number of seconds that the new value should be considered fresh
+
+        """
+        return self.cache.refresh(self.key, fetch, ttl)
 
     def __await__(self):
         """Wait for a result to be produced."""
@@ -139,6 +422,7 @@ class CacheKeyLock:
         """Async context manager entry."""
         result = None
         if self.parent:
+            self.cache.stats.record("lock_waits", self.key)
             result = await self.parent
             if result:
                 await self  # wait for parent's done handler to complete
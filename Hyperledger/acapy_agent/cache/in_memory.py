@@ -1,29 +1,68 @@
 """Basic in-memory cache implementation."""
 
+import heapq
 import time
-from typing import Any, Optional, Sequence, Text, Union
+from collections import OrderedDict
+from typing import Any, Iterable, List, Optional, Sequence, Text, Tuple, Union
 
 from .base import BaseCache
 
+DEFAULT_MAX_ENTRIES = 100000
+
 
 class InMemoryCache(BaseCache):
-    """Basic in-memory cache class."""
+    """Basic in-memory cache class.
+
+    Entries are kept in least-recently-used order and bounded by `max_entries`.
+    Expired entries are dropped lazily using a heap ordered by expiry time, so
+    `get` and `set` do not need to scan the whole cache.
+    """
 
-    def __init__(self):
-        """Initialize a `InMemoryCache` instance."""
+    def __init__(self, max_entries: Optional[int] = None):
+        """Initialize a `InMemoryCache` instance.
+
+        Args:
+            max_entries: the maximum number of entries to retain before evicting
+                the least recently used ones
+
+        """
         super().__init__()
         # looks like { "key": { "expires": <epoch timestamp>, "value": <val> } }
-        self._cache = {}
+        # ordered from least to most recently used
+        self._cache: OrderedDict = OrderedDict()
+        # min-heap of (<epoch timestamp>, "key") for entries with a ttl
+        self._expiry_heap: List[Tuple[float, Text]] = []
+        self.max_entries = max_entries or DEFAULT_MAX_ENTRIES
 
     def _remove_expired_cache_items(self):
         """Remove all expired items from cache."""
-        for key, val in self._cache.copy().items():  # iterate copy, del from original
-            cache_item_expiry = val["expires"]
-            if cache_item_expiry is None:
-                continue
-            now = time.perf_counter()
-            if now >= cache_item_expiry:
+        now = time.perf_counter()
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires, key = heapq.heappop(heap)
+            item = self._cache.get(key)
+            # skip heap entries made stale by an overwrite, clear or eviction
+            if item and item["expires"] == expires:
                 del self._cache[key]
+                self._untag(key)
+                self.stats.record("expirations", key)
+
+    def _compact_expiry_heap(self):
+        """Rebuild the expiry heap once stale entries outnumber live ones."""
+        if len(self._expiry_heap) > 2 * len(self._cache) + 64:
+            self._expiry_heap = [
+                (item["expires"], key)
+                for key, item in self._cache.items()
+                if item["expires"] is not None
+            ]
+            heapq.heapify(self._expiry_heap)
+
+    def _evict(self):
+        """Evict the least recently used entries beyond the size bound."""
+        while len(self._cache) > self.max_entries:
+            key, _ = self._cache.popitem(last=False)
+            self._untag(key)
+            self.stats.record("evictions", key)
 
     async def get(self, key: Text):
         """Get an item from the cache.
@@ -36,7 +75,13 @@ class InMemoryCache(BaseCache):
 
         """
         self._remove_expired_cache_items()
-        return self._cache.get(key)["value"] if self._cache.get(key) else None
+        item = self._cache.get(key)
+        if not item:
+            self.stats.record("misses", key)
+            return None
+        self.stats.record("hits", key)
+        self._cache.move_to_end(key)
+        return item["value"]
 
     async def set(
         self, keys: Union[Text, Sequence[Text]], value: Any, ttl: Optional[int] = None
@@ -55,6 +100,15 @@ class InMemoryCache(BaseCache):
         expires_ts = time.perf_counter() + ttl if ttl else None
         for key in [keys] if isinstance(keys, Text) else keys:
             self._cache[key] = {"expires": expires_ts, "value": value}
+            self._cache.move_to_end(key)
+            if expires_ts is not None:
+                heapq.heappush(self._expiry_heap, (expires_ts, key))
+        self._evict()
+        self._compact_expiry_heap()
+
+    async def resident_keys(self) -> Iterable[Text]:
+        """Get the keys of the entries currently held by the cache."""
+        return list(self._cache)
 
     async def clear(self, key: Text):
         """Remove an item from the cache, if present.
@@ -65,8 +119,14 @@ class InMemoryCache(BaseCache):
         """
         if key in self._cache:
             del self._cache[key]
+        self._untag(key)
+        self._cancel_refresh(key)
 
     async def flush(self):
         """Remove all items from the cache."""
 
-        self._cache = {}
+        self._cancel_refreshes()
+        self._cache = OrderedDict()
+        self._expiry_heap = []
+        self._tag_keys = {}
+        self._key_tags = {}
@@ -0,0 +1,356 @@
+"""SQLite cache implementation shared between agent processes on one host."""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional, Sequence, Text, Tuple, Union
+from uuid import uuid4
+
+from .base import BaseCache, CacheKeyLock
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 100000
+
+
+class SqliteCache(BaseCache):
+    """Cache backed by a SQLite database file in WAL mode.
+
+    Every agent process pointing at the same file sees the same entries, so
+    clearing a key in one worker invalidates it for all of them. Cache key locks
+    are backed by a lease row in the database, which extends the single-flight
+    behaviour of `acquire()` across processes. Cache tags are also kept in the
+    database, so `clear_tag` invalidates entries tagged by any process.
+
+    Database calls may block on the busy timeout while another process writes,
+    so they run on a dedicated worker thread rather than on the event loop.
+
+    Values are stored as JSON; values which cannot be serialized are not cached.
+    """
+
+    LEASE_POLL_INTERVAL = 0.05
+    LEASE_TIMEOUT = 30.0
+    PURGE_INTERVAL = 1000
+
+    def __init__(self, path: str, max_entries: Optional[int] = None):
+        """Initialize a `SqliteCache` instance.
+
+        Args:
+            path: the path to the shared cache database file
+            max_entries: the maximum number of entries to retain before evicting
+                the oldest ones
+
+        """
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries or DEFAULT_MAX_ENTRIES
+        self.owner = uuid4().hex
+        self._set_count = 0
+        # a single worker thread serializes all use of the connection
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="acapy-sqlite-cache"
+        )
+        self._conn = sqlite3.connect(
+            path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_items "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_leases "
+            "(key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_tags "
+            "(tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key)) "
+            "WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_tags_key ON cache_tags (key)"
+        )
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        """Run a blocking database call on the worker thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _purge(self) -> Tuple[Sequence[Text], Sequence[Text]]:
+        """Remove expired entries and evict the oldest entries beyond the bound.
+
+        Returns:
+            The keys of the expired and of the evicted entries
+
+        """
+        evicted = []
+        with self._conn:
+            expired = [
+                key
+                for (key,) in self._conn.execute(
+                    "DELETE FROM cache_items WHERE expires IS NOT NULL AND expires <= ? "
+                    "RETURNING key",
+                    (time.time(),),
+                ).fetchall()
+            ]
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM cache_items").fetchone()
+            if count > self.max_entries:
+                evicted = [
+                    key
+                    for (key,) in self._conn.execute(
+                        "DELETE FROM cache_items WHERE rowid IN "
+                        "(SELECT rowid FROM cache_items ORDER BY rowid LIMIT ?) "
+                        "RETURNING key",
+                        (count - self.max_entries,),
+                    ).fetchall()
+                ]
+            self._conn.execute(
+                "DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache_items)"
+            )
+        return expired, evicted
+
+    async def purge(self):
+        """Remove expired entries and evict the oldest entries beyond the bound."""
+        expired, evicted = await self._run(self._purge)
+        for key in expired:
+            self.stats.record("expirations", key)
+        for key in evicted:
+            self.stats.record("evictions", key)
+
+    def _get(self, key: Text) -> Optional[Tuple[str, Optional[float]]]:
+        return self._conn.execute(
+            "SELECT value, expires FROM cache_items WHERE key = ?", (key,)
+        ).fetchone()
+
+    async def get(self, key: Text):
+        """Get an item from the cache.
+
+        Args:
+            key: the key to retrieve an item for
+
+        Returns:
+            The record found or `None`
+
+        """
+        row = await self._run(self._get, key)
+        if not row or (row[1] is not None and row[1] <= time.time()):
+            self.stats.record("misses", key)
+            return None
+        self.stats.record("hits", key)
+        return json.loads(row[0])
+
+    def _set(self, keys: Sequence[Text], encoded: str, expires_ts: Optional[float]):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache_items (key, value, expires) "
+                "VALUES (?, ?, ?)",
+                [(key, encoded, expires_ts) for key in keys],
+            )
+
+    async def set(
+        self, keys: Union[Text, Sequence[Text]], value: Any, ttl: Optional[int] = None
+    ):
+        """Add an item to the cache with an optional ttl.
+
+        Overwrites existing cache entries.
+
+        Args:
+            keys: the key or keys for which to set an item
+            value: the value to store in the cache
+            ttl: number of seconds that the record should persist
+
+        """
+        try:
+            encoded = json.dumps(value)
+        except (TypeError, ValueError):
+            LOGGER.warning("Not caching value of type %s", type(value).__name__)
+            return
+        expires_ts = time.time() + ttl if ttl else None
+        keys = [keys] if isinstance(keys, Text) else keys
+        await self._run(self._set, keys, encoded, expires_ts)
+        self._set_count += 1
+        if self._set_count % self.PURGE_INTERVAL == 0:
+            await self.purge()
+
+    def _resident_keys(self) -> Sequence[Text]:
+        return [
+            key
+            for (key,) in self._conn.execute(
+                "SELECT key FROM cache_items WHERE expires IS NULL OR expires > ?",
+                (time.time(),),
+            )
+        ]
+
+    async def resident_keys(self) -> Iterable[Text]:
+        """Get the keys of the entries currently held by the cache."""
+        return await self._run(self._resident_keys)
+
+    def _clear(self, key: Text):
+        with self._conn:
+            self._conn.execute("DELETE FROM cache_items WHERE key = ?", (key,))
+            self._conn.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+
+    async def clear(self, key: Text):
+        """Remove an item from the cache, if present.
+
+        Args:
+            key: the key to remove
+
+        """
+        self._cancel_refresh(key)
+        await self._run(self._clear, key)
+
+    def _flush(self):
+        with self._conn:
+            self._conn.execute("DELETE FROM cache_items")
+            self._conn.execute("DELETE FROM cache_tags")
+
+    async def flush(self):
+        """Remove all items from the cache."""
+        self._cancel_refreshes()
+        await self._run(self._flush)
+
+    def _tag(self, keys: Sequence[Text], tags: Iterable[Text]):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)",
+                [(tag, key) for tag in set(tags) for key in keys],
+            )
+
+    async def tag(self, keys: Union[Text, Sequence[Text]], tags: Iterable[Text]):
+        """Associate cache keys with one or more tags for bulk invalidation.
+
+        Args:
+            keys: the key or keys to tag
+            tags: the tags to associate with the keys
+
+        """
+        keys = [keys] if isinstance(keys, Text) else keys
+        await self._run(self._tag, keys, tags)
+
+    def _clear_tag(self, tag: Text) -> Sequence[Tuple[Text]]:
+        with self._conn:
+            keys = [
+                (key,)
+                for (key,) in self._conn.execute(
+                    "DELETE FROM cache_tags WHERE tag = ? RETURNING key", (tag,)
+                ).fetchall()
+            ]
+            self._conn.executemany("DELETE FROM cache_items WHERE key = ?", keys)
+            self._conn.executemany("DELETE FROM cache_tags WHERE key = ?", keys)
+        return keys
+
+    async def clear_tag(self, tag: Text):
+        """Remove all items associated with a tag from the cache.
+
+        Args:
+            tag: the tag to invalidate
+
+        """
+        for (key,) in await self._run(self._clear_tag, tag):
+            self._cancel_refresh(key)
+
+    def acquire(self, key: Text):
+        """Acquire a lock on a given cache key."""
+        result = SqliteCacheKeyLock(self, key)
+        first = self._key_locks.setdefault(key, result)
+        if first is not result:
+            result.parent = first
+        return result
+
+    def _try_lease(self, key: Text) -> bool:
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM cache_leases WHERE key = ? AND expires <= ?", (key, now)
+            )
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO cache_leases (key, owner, expires) "
+                "VALUES (?, ?, ?)",
+                (key, self.owner, now + self.LEASE_TIMEOUT),
+            )
+        return cursor.rowcount == 1
+
+    async def try_lease(self, key: Text) -> bool:
+        """Try to take the cross-process lease on a cache key."""
+        return await self._run(self._try_lease, key)
+
+    def _release_lease(self, key: Text):
+        self._conn.execute(
+            "DELETE FROM cache_leases WHERE key = ? AND owner = ?", (key, self.owner)
+        )
+
+    async def release_lease(self, key: Text):
+        """Release the cross-process lease on a cache key, if held."""
+        await self._run(self._release_lease, key)
+
+    async def wait_lease(self, key: Text) -> Tuple[bool, Any]:
+        """Wait for the lease on a cache key, or for another process's result.
+
+        Returns:
+            A tuple of whether this process now holds the lease, and the value
+            stored by the process which held it, if any. Neither is set if the
+            lease could not be taken before `LEASE_TIMEOUT`.
+
+        """
+        deadline = time.monotonic() + self.LEASE_TIMEOUT
+        leased = await self.try_lease(key)
+        if not leased:
+            self.stats.record("lock_waits", key)
+        while not leased:
+            await asyncio.sleep(self.LEASE_POLL_INTERVAL)
+            found = await self.get(key)
+            if found:
+                return False, found
+            if time.monotonic() >= deadline:
+                LOGGER.warning("Timed out waiting for cache lease on %s", key)
+                return False, None
+            leased = await self.try_lease(key)
+        # another process may have stored a result before releasing the lease
+        found = await self.get(key)
+        if found:
+            await self.release_lease(key)
+            return False, found
+        return True, None
+
+    def close(self):
+        """Close the database connection."""
+        self._executor.submit(self._conn.close)
+        self._executor.shutdown(wait=True)
+
+
+class SqliteCacheKeyLock(CacheKeyLock):
+    """A lock on a particular cache key, shared across processes."""
+
+    def __init__(self, cache: SqliteCache, key: Text):
+        """Initialize the key lock."""
+        super().__init__(cache, key)
+        self.leased = False
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await super().__aenter__()
+        if not self.parent and not self.done:
+            self.leased, found = await self.cache.wait_lease(self.key)
+            if found:
+                self._future.set_result(found)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit, releasing the cross-process lease."""
+        if self.leased:
+            self.leased = False
+            await self.cache.release_lease(self.key)
+        await super().__aexit__(exc_type, exc_val, exc_tb)
+
+    def release(self):
+        """Release the cache lock."""
+        if self.leased:
+            # not released through the context manager: queue the release on
+            # the worker thread, ahead of any later database call
+            self.cache._executor.submit(self.cache._release_lease, self.key)
+            self.leased = False
+        super().release()
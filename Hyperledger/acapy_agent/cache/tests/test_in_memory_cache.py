@@ -1,4 +1,4 @@
-from asyncio import sleep, wait_for
+from asyncio import CancelledError, Event, sleep, wait_for
 
 import pytest
 
@@ -67,10 +67,56 @@ class TestBasicCache:
             item = await cache.get(key)
             assert item is None
 
+    @pytest.mark.asyncio
+    async def test_expired_entries_dropped_lazily(self, cache):
+        await cache.set("short", "value", 0.05)
+        await cache.set("long", "value", 10)
+        await cache.set("long", "value2", 10)  # leaves a stale heap entry
+        assert len(cache._expiry_heap) == 3
+
+        await sleep(0.05)
+
+        assert await cache.get("long") == "value2"
+        assert "short" not in cache._cache
+        assert len(cache._expiry_heap) == 2
+
+    @pytest.mark.asyncio
+    async def test_overwrite_without_ttl_not_expired(self, cache):
+        await cache.set("key", "value", 0.05)
+        await cache.set("key", "value2")
+
+        await sleep(0.05)
+
+        assert await cache.get("key") == "value2"
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        cache = InMemoryCache(max_entries=3)
+        await cache.set(["key0", "key1", "key2"], "value")
+        assert await cache.get("key0") == "value"  # mark as recently used
+        await cache.set("key3", "value")
+
+        assert len(cache._cache) == 3
+        assert await cache.get("key1") is None
+        for key in ("key0", "key2", "key3"):
+            assert await cache.get(key) == "value"
+
+    @pytest.mark.asyncio
+    async def test_expiry_heap_compacted(self):
+        cache = InMemoryCache(max_entries=10)
+        for i in range(200):
+            await cache.set(f"key{i}", "value", 60)
+        assert len(cache._cache) == 10
+        assert len(cache._expiry_heap) <= 2 * 10 + 64
+        heap_keys = {key for (_, key) in cache._expiry_heap}
+        assert set(cache._cache) <= heap_keys
+
     @pytest.mark.asyncio
     async def test_flush(self, cache):
+        await cache.set("key", "value", 10)
         await cache.flush()
         assert cache._cache == {}
+        assert cache._expiry_heap == []
 
     @pytest.mark.asyncio
     async def test_clear(self, cache):
@@ -163,6 +209,178 @@ class TestBasicCache:
         assert lock.done
         assert lock.result is None
 
+    @pytest.mark.asyncio
+    async def test_stats(self):
+        cache = InMemoryCache(max_entries=2)
+        await cache.set("resolver::did:example:1", "value", 0.05)
+        await cache.set(["schema::1", "schema::2"], "value")
+        assert await cache.get("schema::2") == "value"
+        assert await cache.get("schema::3") is None
+        await sleep(0.05)
+        assert await cache.get("untagged") is None
+
+        lock = cache.acquire("schema::4")
+        lock2 = cache.acquire("schema::4")
+        async with lock:
+            await lock.set_result("value")
+        async with lock2:
+            assert lock2.result == "value"
+
+        stats = await cache.get_stats()
+        assert stats["resolver"]["evictions"] == 1
+        assert stats["schema"] == {
+            "hits": 1,
+            "misses": 2,
+            "expirations": 0,
+            "evictions": 1,
+            "lock_waits": 1,
+            "refreshes": 0,
+            "resident": 2,
+        }
+        assert stats["default"]["misses"] == 1
+
+        cache.stats.reset()
+        assert (await cache.get_stats())["schema"]["hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_refresh_ahead(self, cache):
+        cache.enable_refresh_ahead(0.5, grace=1)
+        calls = []
+
+        async def fetch():
+            calls.append(True)
+            return f"value{len(calls)}"
+
+        async with cache.acquire("test_key") as entry:
+            await entry.set_result("value0", 0.1, refresh_ahead=True)
+        async with cache.acquire("test_key") as entry:
+            assert entry.result == "value0"
+            assert not entry.refresh_due
+
+        await sleep(0.05)
+        async with cache.acquire("test_key") as entry:
+            assert entry.refresh_due
+            task = entry.refresh(fetch, 0.1)
+            assert entry.refresh(fetch, 0.1) is task
+            assert not cache.refresh_due("test_key")
+        await task
+        assert calls == [True]
+        assert await cache.get("test_key") == "value1"
+        assert (await cache.get_stats())["default"]["refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_ahead_grace(self, cache):
+        cache.enable_refresh_ahead(0.5, grace=0.1)
+        await cache.set_refreshable("test_key", "value", 0.05)
+        await sleep(0.07)
+        # stale, but still served within the grace window
+        assert await cache.get("test_key") == "value"
+        assert cache.refresh_due("test_key")
+        await sleep(0.1)
+        assert await cache.get("test_key") is None
+        assert not cache.refresh_due("test_key")
+        assert "test_key" not in cache._refresh_at
+
+    @pytest.mark.asyncio
+    async def test_refresh_ahead_failure_or_empty(self, cache):
+        cache.enable_refresh_ahead(1, grace=1)
+        await cache.set_refreshable("test_key", "value", 1)
+
+        async def fail():
+            raise ValueError("test")
+
+        await cache.refresh("test_key", fail, 1)
+        assert await cache.get("test_key") == "value"
+
+        async def empty():
+            return None
+
+        await cache.refresh("test_key", empty, 1)
+        assert await cache.get("test_key") is None
+
+    @pytest.mark.asyncio
+    async def test_clear_cancels_refresh(self, cache):
+        cache.enable_refresh_ahead(1, grace=1)
+        await cache.set_refreshable("test_key", "value", 1)
+        fetched = Event()
+
+        async def fetch():
+            fetched.set()
+            await sleep(1)
+            return "stale"
+
+        task = cache.refresh("test_key", fetch, 1)
+        await fetched.wait()
+        await cache.clear("test_key")
+        with pytest.raises(CancelledError):
+            await task
+        assert await cache.get("test_key") is None
+        assert not cache.refresh_due("test_key")
+
+    @pytest.mark.asyncio
+    async def test_refresh_ahead_disabled(self, cache):
+        await cache.set_refreshable("test_key", "value", 1)
+        assert not cache.refresh_due("test_key")
+        assert not cache._refresh_at
+        with pytest.raises(CacheError):
+            cache.enable_refresh_ahead(0)
+
+    @pytest.mark.asyncio
+    async def test_clear_tag(self, cache):
+        await cache.set(["key0", "key1", "key2"], "value")
+        await cache.tag(["key0", "key1"], ["tag0"])
+        await cache.tag("key1", ["tag1"])
+        async with cache.acquire("key3") as entry:
+            await entry.set_result("value", tags=["tag0"])
+
+        await cache.clear_tag("tag0")
+        for key in ("key0", "key1", "key3"):
+            assert await cache.get(key) is None
+        assert await cache.get("key2") == "value"
+        assert not cache._tag_keys
+        assert not cache._key_tags
+
+        await cache.clear_tag("unknown")
+
+    @pytest.mark.asyncio
+    async def test_tag_index_pruned(self):
+        cache = InMemoryCache(max_entries=2)
+        await cache.set("expired", "value", 0.01)
+        await cache.tag("expired", ["tag"])
+        await sleep(0.01)
+        await cache.set("evicted", "value")
+        assert not cache._tag_keys
+        await cache.tag("evicted", ["tag"])
+        await cache.set(["key0", "key1"], "value")
+        assert not cache._tag_keys
+
+        await cache.tag("key1", ["tag"])
+        await cache.clear("key1")
+        assert not cache._tag_keys
+
+        await cache.set("flushed", "value")
+        await cache.tag("flushed", ["tag"])
+        await cache.flush()
+        assert not cache._tag_keys
+        assert not cache._key_tags
+
+    @pytest.mark.asyncio
+    async def test_clear_tag_cancels_refresh(self, cache):
+        cache.enable_refresh_ahead(1, grace=1)
+
+        async def fetch():
+            await sleep(1)
+            return "refreshed"
+
+        async with cache.acquire("test_key") as entry:
+            await entry.set_result("value", 1, refresh_ahead=True, tags=["tag"])
+        task = cache.refresh("test_key", fetch, 1)
+        await cache.clear_tag("tag")
+        with pytest.raises(CancelledError):
+            await task
+        assert await cache.get("test_key") is None
+        assert not cache._refresh_tasks
+
     @pytest.mark.asyncio
     async def test_repr(self, cache):
         assert isinstance(repr(cache), str)
@@ -0,0 +1,165 @@
+from asyncio import gather, sleep, wait_for
+
+import pytest
+
+from ..sqlite import SqliteCache
+
+
+@pytest.fixture()
+async def cache(tmp_path):
+    cache = SqliteCache(str(tmp_path / "cache.db"))
+    await cache.set("valid key", "value")
+    yield cache
+    cache.close()
+
+
+@pytest.fixture()
+async def other_cache(cache):
+    other = SqliteCache(cache.path)
+    yield other
+    other.close()
+
+
+class TestSqliteCache:
+    @pytest.mark.asyncio
+    async def test_get_none(self, cache):
+        assert await cache.get("doesn't exist") is None
+
+    @pytest.mark.asyncio
+    async def test_get_valid(self, cache):
+        assert await cache.get("valid key") == "value"
+
+    @pytest.mark.asyncio
+    async def test_set_multi(self, cache):
+        await cache.set([f"key{i}" for i in range(4)], {"dictkey": "dval"})
+        for key in [f"key{i}" for i in range(4)]:
+            assert await cache.get(key) == {"dictkey": "dval"}
+
+    @pytest.mark.asyncio
+    async def test_set_expires(self, cache):
+        await cache.set("key", {"dictkey": "dval"}, 0.05)
+        assert await cache.get("key") == {"dictkey": "dval"}
+
+        await sleep(0.05)
+
+        assert await cache.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_set_not_serializable(self, cache):
+        await cache.set("key", object())
+        assert await cache.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_clear_and_flush(self, cache):
+        await cache.set("key", "value")
+        await cache.clear("key")
+        assert await cache.get("key") is None
+        await cache.flush()
+        assert await cache.get("valid key") is None
+
+    @pytest.mark.asyncio
+    async def test_purge(self, cache):
+        cache.max_entries = 2
+        await cache.set("expired", "value", 0.01)
+        await cache.set(["key0", "key1", "key2"], "value")
+        await sleep(0.01)
+        await cache.purge()
+
+        assert await cache.get("valid key") is None
+        assert await cache.get("key0") is None
+        assert await cache.get("key2") == "value"
+
+        stats = await cache.get_stats()
+        assert stats["default"]["expirations"] == 1
+        assert stats["default"]["evictions"] == 2
+        assert stats["default"]["resident"] == 2
+
+    @pytest.mark.asyncio
+    async def test_clear_tag(self, cache, other_cache):
+        await cache.set(["key0", "key1", "key2"], "value")
+        await cache.tag(["key0", "key1"], ["tag0", "tag1"])
+
+        await other_cache.clear_tag("tag0")
+        assert await cache.get("key0") is None
+        assert await cache.get("key1") is None
+        assert await cache.get("key2") == "value"
+        assert not cache._conn.execute("SELECT * FROM cache_tags").fetchall()
+
+    @pytest.mark.asyncio
+    async def test_purge_tags(self, cache):
+        await cache.set("expired", "value", 0.01)
+        await cache.tag("expired", ["tag"])
+        await cache.set("cleared", "value")
+        await cache.tag("cleared", ["tag"])
+        await cache.clear("cleared")
+        await sleep(0.01)
+        await cache.purge()
+        assert not cache._conn.execute("SELECT * FROM cache_tags").fetchall()
+
+    @pytest.mark.asyncio
+    async def test_shared_between_instances(self, cache, other_cache):
+        assert await other_cache.get("valid key") == "value"
+        await other_cache.clear("valid key")
+        assert await cache.get("valid key") is None
+
+    @pytest.mark.asyncio
+    async def test_acquire_release(self, cache):
+        lock = cache.acquire("test_key")
+        async with lock:
+            assert lock.leased
+            assert not await cache.try_lease("test_key")
+        assert not lock.leased
+        assert "test_key" not in cache._key_locks
+
+    @pytest.mark.asyncio
+    async def test_acquire_single_flight_across_instances(self, cache, other_cache):
+        calls = []
+
+        async def fetch(instance):
+            async with instance.acquire("test_key") as entry:
+                if entry.result:
+                    return entry.result
+                calls.append(instance)
+                await sleep(0.1)
+                await entry.set_result("test_result")
+                return "test_result"
+
+        results = await wait_for(gather(fetch(cache), fetch(other_cache)), 5)
+        assert results == ["test_result", "test_result"]
+        assert len(calls) == 1
+        assert (
+            (await cache.get_stats())["default"]["lock_waits"]
+            + (await other_cache.get_stats())["default"]["lock_waits"]
+        ) == 1
+
+    @pytest.mark.asyncio
+    async def test_acquire_lease_released_without_result(self, cache, other_cache):
+        other_cache.LEASE_POLL_INTERVAL = 0.01
+
+        async def fail():
+            async with cache.acquire("test_key"):
+                await sleep(0.05)
+
+        async def wait():
+            await sleep(0.01)
+            async with other_cache.acquire("test_key") as entry:
+                assert entry.leased
+                assert entry.result is None
+
+        await wait_for(gather(fail(), wait()), 5)
+
+    @pytest.mark.asyncio
+    async def test_acquire_lease_timeout(self, cache, other_cache):
+        other_cache.LEASE_POLL_INTERVAL = 0.01
+        other_cache.LEASE_TIMEOUT = 0.05
+        assert await cache.try_lease("test_key")
+
+        async with other_cache.acquire("test_key") as entry:
+            assert not entry.leased
+            assert entry.result is None
+        assert (await other_cache.get_stats())["default"]["lock_waits"] == 1
+
+        # the lease held by the other instance is untouched
+        assert not await other_cache.try_lease("test_key")
+        await cache.release_lease("test_key")
+        assert await other_cache.try_lease("test_key")
@@ -0,0 +1,71 @@
+import pytest
+
+from ..base import is_negative_result, negative_result
+from ..in_memory import InMemoryCache
+from ..sqlite import SqliteCache
+from ..tiered import TieredCache
+
+
+@pytest.fixture()
+async def cache(tmp_path):
+    secondary = SqliteCache(str(tmp_path / "objects.db"))
+    yield TieredCache(InMemoryCache(), secondary, ["schema"])
+    secondary.close()
+
+
+class TestTieredCache:
+    @pytest.mark.asyncio
+    async def test_set_persistent(self, cache):
+        await cache.set(["schema::1", "schema::seqno"], {"id": "1"}, 0.01)
+        assert await cache.secondary.get("schema::1") == {"id": "1"}
+        assert await cache.secondary.get("schema::seqno") == {"id": "1"}
+
+    @pytest.mark.asyncio
+    async def test_set_not_persistent(self, cache):
+        await cache.set("resolver::did", "doc")
+        assert await cache.get("resolver::did") == "doc"
+        assert await cache.secondary.get("resolver::did") is None
+
+    @pytest.mark.asyncio
+    async def test_set_negative_not_persistent(self, cache):
+        await cache.set("schema::1", negative_result("not found"), 30)
+        assert is_negative_result(await cache.get("schema::1"))
+        assert await cache.secondary.get("schema::1") is None
+
+    @pytest.mark.asyncio
+    async def test_get_promotes(self, cache):
+        await cache.secondary.set("schema::1", {"id": "1"})
+        assert await cache.primary.get("schema::1") is None
+        assert await cache.get("schema::1") == {"id": "1"}
+        assert await cache.primary.get("schema::1") == {"id": "1"}
+
+    @pytest.mark.asyncio
+    async def test_acquire(self, cache):
+        await cache.secondary.set("schema::1", {"id": "1"})
+        async with cache.acquire("schema::1") as entry:
+            assert entry.result == {"id": "1"}
+
+    @pytest.mark.asyncio
+    async def test_clear_and_flush(self, cache):
+        await cache.set(["schema::1", "schema::2"], {"id": "1"})
+        await cache.clear("schema::1")
+        assert await cache.get("schema::1") is None
+        await cache.flush()
+        assert await cache.get("schema::2") is None
+
+    @pytest.mark.asyncio
+    async def test_clear_tag(self, cache):
+        await cache.set(["schema::1", "resolver::did"], {"id": "1"})
+        await cache.tag(["schema::1", "resolver::did"], ["tag"])
+        await cache.clear_tag("tag")
+        assert await cache.get("schema::1") is None
+        assert await cache.get("resolver::did") is None
+        assert await cache.secondary.get("schema::1") is None
+
+    @pytest.mark.asyncio
+    async def test_stats(self, cache):
+        await cache.set("schema::1", {"id": "1"})
+        await cache.get("schema::1")
+        stats = await cache.get_stats()
+        assert stats["schema"]["hits"] == 1
+        assert stats["schema"]["resident"] == 1
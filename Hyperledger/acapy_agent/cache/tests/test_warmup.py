@@ -0,0 +1,100 @@
+from asyncio import sleep
+from unittest import IsolatedAsyncioTestCase
+
+from ...connections.models.conn_record import ConnRecord
+from ...ledger.base import BaseLedger
+from ...ledger.multiple_ledger.ledger_requests_executor import (
+    IndyLedgerRequestsExecutor,
+)
+from ...revocation.indy import IndyRevocation
+from ...revocation.models.issuer_rev_reg_record import IssuerRevRegRecord
+from ...tests import mock
+from ...utils.testing import create_test_profile
+from .. import warmup as test_module
+
+TEST_REV_REG_ID = "WgWxqztrNooG92RXvxSTWv:4:WgWxqztrNooG92RXvxSTWv:3:CL:20:tag:CL_ACCUM:0"
+TEST_CRED_DEF_ID = "WgWxqztrNooG92RXvxSTWv:3:CL:20:tag"
+
+
+class TestCacheWarmup(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.profile = await create_test_profile()
+        self.ledger = mock.MagicMock(BaseLedger, autospec=True)
+        self.ledger.get_revoc_reg_def = mock.CoroutineMock(
+            return_value={"credDefId": TEST_CRED_DEF_ID}
+        )
+        self.ledger.get_credential_definition = mock.CoroutineMock(
+            return_value={"schemaId": 20}
+        )
+        self.ledger.get_schema = mock.CoroutineMock(return_value={"seqNo": 20})
+        self.profile.context.injector.bind_instance(
+            IndyLedgerRequestsExecutor,
+            mock.MagicMock(
+                IndyLedgerRequestsExecutor,
+                get_ledger_for_identifier=mock.CoroutineMock(
+                    return_value=(None, self.ledger)
+                ),
+            ),
+        )
+
+        async with self.profile.session() as session:
+            await IssuerRevRegRecord(
+                revoc_reg_id=TEST_REV_REG_ID,
+                cred_def_id=TEST_CRED_DEF_ID,
+                state=IssuerRevRegRecord.STATE_ACTIVE,
+            ).save(session)
+            await IssuerRevRegRecord(
+                revoc_reg_id="full",
+                cred_def_id=TEST_CRED_DEF_ID,
+                state=IssuerRevRegRecord.STATE_FULL,
+            ).save(session)
+            self.connections = []
+            for _ in range(3):
+                conn = ConnRecord(state=ConnRecord.State.COMPLETED.rfc160)
+                await conn.save(session)
+                self.connections.append(conn)
+            await ConnRecord(state=ConnRecord.State.REQUEST.rfc160).save(session)
+
+    async def test_warm_up_cache(self):
+        with (
+            mock.patch.object(
+                IndyRevocation, "get_ledger_registry", mock.CoroutineMock()
+            ) as mock_get_registry,
+            mock.patch.object(
+                test_module, "BaseConnectionManager", autospec=True
+            ) as mock_conn_mgr,
+        ):
+            mock_get_targets = mock_conn_mgr.return_value.get_connection_targets
+            loaded = await test_module.warm_up_cache(self.profile, connections=2)
+
+        assert loaded == 3
+        self.ledger.get_revoc_reg_def.assert_awaited_once_with(TEST_REV_REG_ID)
+        self.ledger.get_credential_definition.assert_awaited_once_with(TEST_CRED_DEF_ID)
+        self.ledger.get_schema.assert_awaited_once_with("20")
+        mock_get_registry.assert_awaited_once_with(TEST_REV_REG_ID)
+        assert {
+            call.kwargs["connection"].connection_id
+            for call in mock_get_targets.await_args_list
+        } == {conn.connection_id for conn in self.connections[1:]}
+
+    async def test_warm_up_cache_failures_ignored(self):
+        self.ledger.get_revoc_reg_def.side_effect = Exception("ledger error")
+        with mock.patch.object(test_module, "BaseConnectionManager", autospec=True):
+            loaded = await test_module.warm_up_cache(self.profile)
+        assert loaded == 3
+
+    async def test_warm_up_cache_timeout(self):
+        async def slow(**kwargs):
+            await sleep(1)
+
+        with (
+            mock.patch.object(
+                IndyRevocation, "get_ledger_registry", mock.CoroutineMock()
+            ),
+            mock.patch.object(
+                test_module, "BaseConnectionManager", autospec=True
+            ) as mock_conn_mgr,
+        ):
+            mock_conn_mgr.return_value.get_connection_targets.side_effect = slow
+            loaded = await test_module.warm_up_cache(self.profile, timeout=0.1)
+        assert loaded == 1
@@ -0,0 +1,127 @@
+"""Two-tier cache with a persistent secondary tier for immutable objects."""
+
+from typing import Any, Iterable, Optional, Sequence, Text, Union
+
+from .base import BaseCache, is_negative_result
+
+
+class TieredCache(BaseCache):
+    """Cache which backs a primary cache with a persistent secondary tier.
+
+    Entries in the configured key namespaces are written to both tiers, and are
+    kept in the secondary tier without expiry. Lookups which miss the primary
+    tier fall back to the secondary tier and repopulate the primary tier.
+    Entries in other namespaces only use the primary tier.
+    """
+
+    def __init__(
+        self, primary: BaseCache, secondary: BaseCache, namespaces: Iterable[str]
+    ):
+        """Initialize a `TieredCache` instance.
+
+        Args:
+            primary: the cache checked first, usually held in memory
+            secondary: the persistent cache checked after a primary miss
+            namespaces: the key namespaces to keep in the secondary tier
+
+        """
+        super().__init__()
+        self.primary = primary
+        self.secondary = secondary
+        self.namespaces = frozenset(namespaces)
+        self.stats = primary.stats
+        self.refresh_ahead = primary.refresh_ahead
+        self.refresh_grace = primary.refresh_grace
+
+    def _is_persistent(self, key: Text) -> bool:
+        """Check whether a key is kept in the secondary tier."""
+        return self.stats.namespace(key) in self.namespaces
+
+    async def get(self, key: Text):
+        """Get an item from the cache.
+
+        Args:
+            key: the key to retrieve an item for
+
+        Returns:
+            The record found or `None`
+
+        """
+        result = await self.primary.get(key)
+        if result is None and self._is_persistent(key):
+            result = await self.secondary.get(key)
+            if result is not None:
+                await self.primary.set(key, result)
+        return result
+
+    async def set(
+        self, keys: Union[Text, Sequence[Text]], value: Any, ttl: Optional[int] = None
+    ):
+        """Add an item to the cache with an optional ttl.
+
+        The ttl only applies to the primary tier. Negative results are never
+        written to the secondary tier.
+
+        Args:
+            keys: the key or keys for which to set an item
+            value: the value to store in the cache
+            ttl: number of seconds that the record should persist
+
+        """
+        await self.primary.set(keys, value, ttl)
+        if is_negative_result(value):
+            return
+        keys = [keys] if isinstance(keys, Text) else keys
+        persistent = [key for key in keys if self._is_persistent(key)]
+        if persistent:
+            await self.secondary.set(persistent, value)
+
+    async def resident_keys(self) -> Iterable[Text]:
+        """Get the keys of the entries currently held by the primary tier."""
+        return await self.primary.resident_keys()
+
+    async def clear(self, key: Text):
+        """Remove an item from the cache, if present.
+
+        Args:
+            key: the key to remove
+
+        """
+        self._cancel_refresh(key)
+        await self.primary.clear(key)
+        if self._is_persistent(key):
+            await self.secondary.clear(key)
+
+    async def tag(self, keys: Union[Text, Sequence[Text]], tags: Iterable[Text]):
+        """Associate cache keys with one or more tags in both tiers.
+
+        Args:
+            keys: the key or keys to tag
+            tags: the tags to associate with the keys
+
+        """
+        tags = list(tags)
+        await self.primary.tag(keys, tags)
+        keys = [keys] if isinstance(keys, Text) else keys
+        persistent = [key for key in keys if self._is_persistent(key)]
+        if persistent:
+            await self.secondary.tag(persistent, tags)
+
+    async def clear_tag(self, tag: Text):
+        """Remove all items associated with a tag from both tiers.
+
+        Args:
+            tag: the tag to invalidate
+
+        """
+        # refreshes are scheduled on this cache, but the tag index is in the tiers
+        for key in list(self.primary._tag_keys.get(tag, ())):
+            self._cancel_refresh(key)
+        await self.primary.clear_tag(tag)
+        await self.secondary.clear_tag(tag)
+
+    async def flush(self):
+        """Remove all items from the cache."""
+        self._cancel_refreshes()
+        await self.primary.flush()
+        await self.secondary.flush()
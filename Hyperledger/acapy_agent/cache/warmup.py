@@ -0,0 +1,154 @@
+"""Cache warm-up run when the agent starts."""
+
+import asyncio
+import json
+import logging
+from typing import Awaitable, Callable, Sequence
+
+from ..connections.base_manager import BaseConnectionManager
+from ..connections.models.conn_record import ConnRecord
+from ..core.profile import Profile
+from ..ledger.multiple_ledger.ledger_requests_executor import (
+    GET_REVOC_REG_DEF,
+    IndyLedgerRequestsExecutor,
+)
+from ..revocation.indy import IndyRevocation
+from ..revocation.models.issuer_rev_reg_record import IssuerRevRegRecord
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_WARMUP_CONCURRENCY = 10
+DEFAULT_WARMUP_CONNECTIONS = 100
+DEFAULT_WARMUP_TIMEOUT = 60
+
+
+def _is_anoncreds(profile: Profile) -> bool:
+    return profile.settings.get("wallet.type") == "askar-anoncreds"
+
+
+async def active_revocation_registry_ids(profile: Profile) -> Sequence[str]:
+    """Get the IDs of the active revocation registries issued by this agent."""
+    if _is_anoncreds(profile):
+        from ..anoncreds.revocation import CATEGORY_REV_REG_DEF
+
+        async with profile.session() as session:
+            entries = await session.handle.fetch_all(
+                CATEGORY_REV_REG_DEF, {"active": json.dumps(True)}
+            )
+        return [entry.name for entry in entries]
+
+    async with profile.session() as session:
+        records = await IssuerRevRegRecord.query(
+            session, {"state": IssuerRevRegRecord.STATE_ACTIVE}
+        )
+    return [record.revoc_reg_id for record in records if record.revoc_reg_id]
+
+
+async def recent_connections(profile: Profile, count: int) -> Sequence[ConnRecord]:
+    """Get the most recently created completed connections."""
+    if not count:
+        return []
+    async with profile.session() as session:
+        records, _ = await ConnRecord.query_page(
+            session,
+            {"state": ConnRecord.State.COMPLETED.rfc160},
+            limit=count,
+            descending=True,
+        )
+    return records
+
+
+async def warm_revocation_registry(profile: Profile, rev_reg_id: str):
+    """Load a revocation registry definition with its credential definition and schema.
+
+    The ledger caches each object as it is fetched.
+    """
+    ledger_exec = profile.inject_or(IndyLedgerRequestsExecutor)
+    if not ledger_exec:
+        ledger_exec = IndyLedgerRequestsExecutor(profile)
+    _, ledger = await ledger_exec.get_ledger_for_identifier(
+        rev_reg_id, txn_record_type=GET_REVOC_REG_DEF
+    )
+    if not ledger:
+        return
+    async with ledger:
+        rev_reg_def = await ledger.get_revoc_reg_def(rev_reg_id)
+        cred_def = await ledger.get_credential_definition(rev_reg_def["credDefId"])
+        if cred_def:
+            await ledger.get_schema(str(cred_def["schemaId"]))
+    if not _is_anoncreds(profile):
+        # also resolves the tails file location for the registry
+        await IndyRevocation(profile).get_ledger_registry(rev_reg_id)
+
+
+async def warm_up_cache(
+    profile: Profile,
+    *,
+    connections: int = DEFAULT_WARMUP_CONNECTIONS,
+    concurrency: int = DEFAULT_WARMUP_CONCURRENCY,
+    timeout: float = DEFAULT_WARMUP_TIMEOUT,
+) -> int:
+    """Pre-load ledger objects and connection targets used after a restart.
+
+    Loads the active revocation registry definitions issued by this agent, their
+    credential definitions and schemas, and the connection targets of the most
+    recently created connections. Items are loaded concurrently, and loading stops
+    once the time budget is spent. Failures are logged and otherwise ignored.
+
+    Args:
+        profile: The profile to warm up the cache for
+        connections: The number of recent connections to load targets for
+        concurrency: The maximum number of items to load at once
+        timeout: The time budget in seconds
+
+    Returns:
+        The number of items loaded
+
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    loaded = 0
+
+    async def load(label: str, fetch: Callable[[], Awaitable]):
+        nonlocal loaded
+        async with semaphore:
+            try:
+                await fetch()
+                loaded += 1
+            except Exception:
+                LOGGER.warning("Cache warm-up failed for %s", label, exc_info=True)
+
+    async def run():
+        loaders = [
+            (
+                rev_reg_id,
+                lambda rev_reg_id=rev_reg_id: warm_revocation_registry(
+                    profile, rev_reg_id
+                ),
+            )
+            for rev_reg_id in await active_revocation_registry_ids(profile)
+        ]
+        records = await recent_connections(profile, connections)
+        if records:
+            conn_mgr = BaseConnectionManager(profile)
+            loaders.extend(
+                (
+                    f"connection {record.connection_id}",
+                    lambda record=record: conn_mgr.get_connection_targets(
+                        connection=record
+                    ),
+                )
+                for record in records
+            )
+        await asyncio.gather(*(load(label, fetch) for label, fetch in loaders))
+
+    try:
+        await asyncio.wait_for(run(), timeout)
+    except asyncio.TimeoutError:
+        LOGGER.warning(
+            "Cache warm-up stopped after %s seconds with %d items loaded",
+            timeout,
+            loaded,
+        )
+    else:
+        LOGGER.info("Cache warm-up loaded %d items", loaded)
+    return loaded
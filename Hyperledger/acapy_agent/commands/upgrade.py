@@ -334,11 +334,15 @@ async def upgrade(
         "upgrade.upgrade_subwallets" in settings
         and len(settings.get("upgrade.upgrade_subwallets")) >= 1
     ):
-        for _wallet_id in settings.get("upgrade.upgrade_subwallets"):
-            async with root_profile.session() as session:
-                wallet_record = await WalletRecord.retrieve_by_id(
-                    session, record_id=_wallet_id
-                )
+        wallet_ids = settings.get("upgrade.upgrade_subwallets")
+        async with root_profile.session() as session:
+            wallet_records = await WalletRecord.retrieve_by_ids(session, wallet_ids)
+        missing = set(wallet_ids) - {record.wallet_id for record in wallet_records}
+        if missing:
+            raise StorageNotFoundError(
+                f"Wallet records not found: {', '.join(sorted(missing))}"
+            )
+        for wallet_record in wallet_records:
             wallet_profile = await get_wallet_profile(
                 base_context=root_profile.context, wallet_record=wallet_record
             )
@@ -491,33 +495,22 @@ async def upgrade_per_profile(
                 raise UpgradeError(
                     f"Only BaseRecord can be resaved, found: {str(rec_type)}"
                 )
-            all_records = []
             if settings:
                 batch_size = settings.get("upgrade.page_size", BATCH_SIZE)
             else:
                 batch_size = BATCH_SIZE
-            base_storage_search_inst = profile.inject(BaseStorageSearch)
-            search_session = base_storage_search_inst.search_records(
-                type_filter=rec_type.RECORD_TYPE, page_size=batch_size
-            )
-            while search_session._done is False:
-                storage_records = await search_session.fetch()
-                for storage_record in storage_records:
-                    _record = rec_type.from_storage(
-                        storage_record.id,
-                        json.loads(storage_record.value),
-                    )
-                    all_records.append(_record)
+            resaved = 0
             async with profile.session() as session:
-                for record in all_records:
+                async for record in rec_type.query_iter(session, page_size=batch_size):
                     await record.save(
                         session,
                         reason="re-saving record during the upgrade process",
                     )
-                if len(all_records) == 0:
-                    LOGGER.info(f"No records of {str(rec_type)} found")
-                else:
-                    LOGGER.info(f"All recs of {str(rec_type)} successfully re-saved")
+                    resaved += 1
+            if resaved == 0:
+                LOGGER.info(f"No records of {str(rec_type)} found")
+            else:
+                LOGGER.info(f"All recs of {str(rec_type)} successfully re-saved")
         for callable_name in executables_call_set:
             _callable = version_upgrade_config_inst.get_callable(callable_name)
             if not _callable:
@@ -14,7 +14,7 @@ from configargparse import ArgumentParser, Namespace, YAMLConfigFileParser
 from ..utils.tracing import trace_event
 from .error import ArgsParseError
 from .plugin_settings import PLUGIN_CONFIG_KEY
-from .util import BoundedInt, ByteSize
+from .util import BoundedFloat, BoundedInt, ByteSize
 
 CAT_PROVISION = "general"
 CAT_START = "start"
@@ -24,6 +24,8 @@ ENDORSER_AUTHOR = "author"
 ENDORSER_ENDORSER = "endorser"
 ENDORSER_NONE = "none"
 
+OUTBOUND_RETRY_POLICY_NAMES = ("delay", "multiplier", "max_delay", "jitter", "budget")
+
 
 class ArgumentGroup(abc.ABC):
     """A class representing a group of related command line arguments."""
@@ -164,11 +166,38 @@ class AdminGroup(ArgumentGroup):
             help=(
                 "Send webhooks containing internal state changes to the specified "
                 "URL. Optional API key to be passed in the request body can be "
-                "appended using a hash separator [#]. This is useful for a controller "
+                "appended using a hash separator [#]. Add a 'batch' query parameter "
+                "to the URL, optionally giving the maximum number of events per "
+                "batch, to deliver its webhooks in batches (see "
+                "--webhook-batch-size). This is useful for a controller "
                 "to monitor agent events and respond to those events using the "
                 "admin API. If not specified, webhooks are not published by the agent."
             ),
         )
+        parser.add_argument(
+            "--webhook-batch-size",
+            type=BoundedInt(min=1),
+            env_var="ACAPY_WEBHOOK_BATCH_SIZE",
+            metavar="<count>",
+            help=(
+                "The maximum number of events per batch for webhook URLs with a "
+                "'batch' query parameter not giving one, such as "
+                "'http://controller/webhooks?batch'. Each batch is posted to the "
+                "'batch' path of the webhook URL, without the parameter, as a JSON "
+                "array of objects with 'topic' and 'payload' keys, and is retried as "
+                "a unit. Other webhook URLs are delivered one by one. Default: 100."
+            ),
+        )
+        parser.add_argument(
+            "--webhook-batch-interval",
+            type=BoundedInt(min=1),
+            env_var="ACAPY_WEBHOOK_BATCH_INTERVAL",
+            metavar="<milliseconds>",
+            help=(
+                "The maximum time webhook events are collected for before their "
+                "batch is delivered, when batching webhooks. Default: 1000."
+            ),
+        )
         parser.add_argument(
             "--admin-client-max-request-size",
             default=1,
@@ -207,6 +236,10 @@ class AdminGroup(ArgumentGroup):
             if hook_url:
                 hook_urls.append(hook_url)
             settings["admin.webhook_urls"] = hook_urls
+            if args.webhook_batch_size:
+                settings["admin.webhook_batch_size"] = args.webhook_batch_size
+            if args.webhook_batch_interval:
+                settings["admin.webhook_batch_interval"] = args.webhook_batch_interval
 
             settings["admin.admin_client_max_request_size"] = (
                 args.admin_client_max_request_size or 1
@@ -214,6 +247,148 @@ class AdminGroup(ArgumentGroup):
         return settings
 
 
+@group(CAT_START)
+class CacheGroup(ArgumentGroup):
+    """Cache settings."""
+
+    GROUP_NAME = "Cache"
+
+    def add_arguments(self, parser: ArgumentParser):
+        """Add cache-specific command line arguments to the parser."""
+        parser.add_argument(
+            "--cache-max-entries",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_CACHE_MAX_ENTRIES",
+            help=(
+                "Set the maximum number of entries held by the in-memory cache. "
+                "The least recently used entries are evicted once the limit is "
+                "reached. Default: 100000."
+            ),
+        )
+        parser.add_argument(
+            "--cache-negative-ttl",
+            type=BoundedInt(min=0),
+            metavar="<seconds>",
+            env_var="ACAPY_CACHE_NEGATIVE_TTL",
+            help=(
+                "Set how many seconds failed DID resolutions and ledger lookups "
+                "(unknown DIDs, missing schemas or credential definitions) are "
+                "cached before being retried. Set to 0 to disable. Default: 30."
+            ),
+        )
+        parser.add_argument(
+            "--cache-refresh-ahead",
+            type=BoundedInt(min=1, max=100),
+            metavar="<percent>",
+            env_var="ACAPY_CACHE_REFRESH_AHEAD",
+            help=(
+                "Refresh hot cache entries (connection targets, resolved DID "
+                "documents, TAA acceptance) in the background once they enter the "
+                "final <percent> of their lifetime, instead of letting them expire. "
+                "Default: disabled."
+            ),
+        )
+        parser.add_argument(
+            "--cache-refresh-grace",
+            type=BoundedInt(min=0),
+            metavar="<seconds>",
+            env_var="ACAPY_CACHE_REFRESH_GRACE",
+            help=(
+                "With --cache-refresh-ahead, keep serving an expired entry for up "
+                "to <seconds> while its background refresh is pending. Default: 0."
+            ),
+        )
+        parser.add_argument(
+            "--cache-warmup",
+            action="store_true",
+            env_var="ACAPY_CACHE_WARMUP",
+            help=(
+                "Pre-load the cache in the background when the agent starts: the "
+                "active revocation registry definitions issued by this agent, their "
+                "credential definitions and schemas, and the connection targets of "
+                "the most recently updated connections. Default: false."
+            ),
+        )
+        parser.add_argument(
+            "--cache-warmup-connections",
+            type=BoundedInt(min=0),
+            metavar="<count>",
+            env_var="ACAPY_CACHE_WARMUP_CONNECTIONS",
+            help=(
+                "With --cache-warmup, the number of recently updated connections "
+                "to load connection targets for. Default: 100."
+            ),
+        )
+        parser.add_argument(
+            "--cache-warmup-concurrency",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_CACHE_WARMUP_CONCURRENCY",
+            help=(
+                "With --cache-warmup, the maximum number of items loaded at once. "
+                "Default: 10."
+            ),
+        )
+        parser.add_argument(
+            "--cache-warmup-timeout",
+            type=BoundedInt(min=1),
+            metavar="<seconds>",
+            env_var="ACAPY_CACHE_WARMUP_TIMEOUT",
+            help=(
+                "With --cache-warmup, stop loading items after <seconds>. Default: 60."
+            ),
+        )
+        parser.add_argument(
+            "--shared-cache-path",
+            type=str,
+            metavar="<path>",
+            env_var="ACAPY_SHARED_CACHE_PATH",
+            help=(
+                "Store cache entries in a SQLite database at <path> instead of "
+                "process memory. Agent processes on the same host that use the "
+                "same path share cache entries, invalidations and cache key locks."
+            ),
+        )
+
+        parser.add_argument(
+            "--cache-records",
+            action="store_true",
+            env_var="ACAPY_CACHE_RECORDS",
+            help=(
+                "Cache connection and mediation records read by ID. Updates made "
+                "by other agent processes are only seen through a shared cache, "
+                "so agents running several processes should only enable this "
+                "with --shared-cache-path. Default: false."
+            ),
+        )
+
+    def get_settings(self, args: Namespace):
+        """Extract cache settings."""
+        settings = {}
+        if args.cache_max_entries:
+            settings["cache.max_entries"] = args.cache_max_entries
+        if args.cache_negative_ttl is not None:
+            settings["cache.negative_ttl"] = args.cache_negative_ttl
+        if args.cache_refresh_ahead:
+            settings["cache.refresh_ahead"] = args.cache_refresh_ahead / 100
+        if args.cache_refresh_grace:
+            settings["cache.refresh_grace"] = args.cache_refresh_grace
+        if args.cache_warmup:
+            settings["cache.warmup"] = True
+        if args.cache_warmup_connections is not None:
+            settings["cache.warmup_connections"] = args.cache_warmup_connections
+        if args.cache_warmup_concurrency:
+            settings["cache.warmup_concurrency"] = args.cache_warmup_concurrency
+        if args.cache_warmup_timeout:
+            settings["cache.warmup_timeout"] = args.cache_warmup_timeout
+        if args.shared_cache_path:
+            settings["cache.shared_path"] = args.shared_cache_path
+        if args.cache_records:
+            settings["cache.records"] = True
+        return settings
+
+
 @group(CAT_PROVISION, CAT_START, CAT_UPGRADE)
 class DebuggerGroup(ArgumentGroup):
     """Debugger settings."""
@@ -590,6 +765,18 @@ class GeneralGroup(ArgumentGroup):
                 "wallet type is set to 'indy', otherwise 'basic'."
             ),
         )
+        parser.add_argument(
+            "--json-codec",
+            type=str,
+            choices=("orjson", "stdlib"),
+            metavar="<json-codec>",
+            env_var="ACAPY_JSON_CODEC",
+            help=(
+                "Specifies the JSON codec used to serialize records, messages "
+                "and admin responses: 'orjson' or 'stdlib'. The default (if not "
+                "specified) is 'orjson' when it is installed, otherwise 'stdlib'."
+            ),
+        )
         parser.add_argument(
             "-e",
             "--endpoint",
@@ -677,6 +864,9 @@ class GeneralGroup(ArgumentGroup):
         if args.storage_type:
             settings["storage_type"] = args.storage_type
 
+        if args.json_codec:
+            settings["json_codec"] = args.json_codec
+
         if args.endpoint:
             settings["default_endpoint"] = args.endpoint[0]
             settings["additional_endpoints"] = args.endpoint[1:]
@@ -861,6 +1051,16 @@ class LedgerGroup(ArgumentGroup):
             env_var="ACAPY_LEDGER_KEEP_ALIVE",
             help="Specifies how many seconds to keep the ledger open. Default: 5",
         )
+        parser.add_argument(
+            "--ledger-persistent-cache",
+            action="store_true",
+            env_var="ACAPY_LEDGER_PERSISTENT_CACHE",
+            help=(
+                "Keep schemas, credential definitions and revocation registry "
+                "definitions fetched from the ledger in an on-disk cache alongside "
+                "the pool configuration, so they survive restarts. Default: false."
+            ),
+        )
         parser.add_argument(
             "--ledger-socks-proxy",
             type=str,
@@ -963,6 +1163,8 @@ class LedgerGroup(ArgumentGroup):
                 settings["ledger.keepalive"] = args.ledger_keepalive
             if args.ledger_socks_proxy:
                 settings["ledger.socks_proxy"] = args.ledger_socks_proxy
+            if args.ledger_persistent_cache:
+                settings["ledger.persistent_cache"] = True
             if args.accept_taa:
                 settings["ledger.taa_acceptance_mechanism"] = args.accept_taa[0]
                 settings["ledger.taa_acceptance_version"] = args.accept_taa[1]
@@ -1247,6 +1449,87 @@ class ProtocolGroup(ArgumentGroup):
         return settings
 
 
+@group(CAT_START)
+class RetentionGroup(ArgumentGroup):
+    """Record retention settings."""
+
+    GROUP_NAME = "Retention"
+
+    def add_arguments(self, parser: ArgumentParser):
+        """Add record retention command line arguments to the parser."""
+        parser.add_argument(
+            "--retention-config",
+            type=str,
+            metavar="<path>",
+            env_var="ACAPY_RETENTION_CONFIG",
+            help=(
+                "Load record retention policies from a YAML file, mapping record "
+                "types (such as 'cred_ex_v20' or 'pres_ex_v20') to 'max_age' in "
+                "seconds, 'keep_last' records per connection and optionally the "
+                "terminal 'states' to delete. Matching records are deleted in the "
+                "background, in the base wallet and in every sub-wallet. Default: "
+                "no retention."
+            ),
+        )
+        parser.add_argument(
+            "--retention-interval",
+            type=BoundedInt(min=1),
+            metavar="<seconds>",
+            env_var="ACAPY_RETENTION_INTERVAL",
+            help=(
+                "With --retention-config, the number of seconds between sweeps. "
+                "Default: 3600."
+            ),
+        )
+        parser.add_argument(
+            "--retention-batch-size",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_RETENTION_BATCH_SIZE",
+            help=(
+                "With --retention-config, the number of records deleted in each "
+                "transaction. Default: 100."
+            ),
+        )
+        parser.add_argument(
+            "--retention-rate",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_RETENTION_RATE",
+            help=(
+                "With --retention-config, the maximum number of records deleted "
+                "per second. Default: 100."
+            ),
+        )
+        parser.add_argument(
+            "--retention-archive-dir",
+            type=str,
+            metavar="<path>",
+            env_var="ACAPY_RETENTION_ARCHIVE_DIR",
+            help=(
+                "With --retention-config, append deleted records to gzip compressed "
+                "JSON lines files in this directory, one per record type, wallet "
+                "and sweep, once their deletion is committed."
+            ),
+        )
+
+    def get_settings(self, args: Namespace) -> dict:
+        """Extract record retention settings."""
+        settings = {}
+        if args.retention_config:
+            with open(args.retention_config, "r") as stream:
+                settings["retention.policies"] = yaml.safe_load(stream)
+        if args.retention_interval:
+            settings["retention.interval"] = args.retention_interval
+        if args.retention_batch_size:
+            settings["retention.batch_size"] = args.retention_batch_size
+        if args.retention_rate:
+            settings["retention.rate"] = args.retention_rate
+        if args.retention_archive_dir:
+            settings["retention.archive_dir"] = args.retention_archive_dir
+        return settings
+
+
 @group(CAT_START)
 class StartupGroup(ArgumentGroup):
     """Startup settings."""
@@ -1365,6 +1648,123 @@ class TransportGroup(ArgumentGroup):
                 "option will require additional memory to store messages in the queue."
             ),
         )
+        parser.add_argument(
+            "--durable-outbound-queue",
+            action="store_true",
+            env_var="ACAPY_DURABLE_OUTBOUND_QUEUE",
+            help=(
+                "Keep outbound messages and webhooks in the wallet until they are "
+                "delivered, so that messages pending delivery when the agent stops "
+                "are delivered after a restart. Agents sharing the wallet only "
+                "deliver the messages left by an agent once it has stopped. "
+                "Default: false."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-circuit-failures",
+            type=BoundedInt(min=1),
+            env_var="ACAPY_OUTBOUND_CIRCUIT_FAILURES",
+            metavar="<count>",
+            help=(
+                "Stop delivering outbound messages to an endpoint after <count> "
+                "consecutive failed deliveries, until a probe message succeeds. "
+                "Default: circuits never open."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-circuit-reset",
+            type=BoundedInt(min=1),
+            env_var="ACAPY_OUTBOUND_CIRCUIT_RESET",
+            metavar="<seconds>",
+            help=(
+                "The number of seconds an endpoint stays unavailable after its "
+                "circuit opens, before a probe message is sent. Default: 30."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-circuit-fail-fast",
+            action="store_true",
+            env_var="ACAPY_OUTBOUND_CIRCUIT_FAIL_FAST",
+            help=(
+                "Fail outbound messages for endpoints whose circuit is open, "
+                "instead of holding them until the circuit closes. Each time a "
+                "held message finds the circuit open it uses up a retry. "
+                "Default: false."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-endpoint-max-in-flight",
+            type=BoundedInt(min=1),
+            env_var="ACAPY_OUTBOUND_ENDPOINT_MAX_IN_FLIGHT",
+            metavar="<count>",
+            help=(
+                "The maximum number of concurrent outbound deliveries to a single "
+                "endpoint. Further messages wait for a delivery to finish. "
+                "Default: no limit."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-retry-delay",
+            type=BoundedFloat(min=0),
+            env_var="ACAPY_OUTBOUND_RETRY_DELAY",
+            metavar="<seconds>",
+            help=(
+                "The delay before retrying a failed outbound delivery for the first "
+                "time. Default: 10."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-retry-multiplier",
+            type=BoundedFloat(min=1),
+            env_var="ACAPY_OUTBOUND_RETRY_MULTIPLIER",
+            metavar="<factor>",
+            help=(
+                "The factor applied to the outbound retry delay after each failed "
+                "delivery. Default: 2."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-retry-max-delay",
+            type=BoundedFloat(min=0),
+            env_var="ACAPY_OUTBOUND_RETRY_MAX_DELAY",
+            metavar="<seconds>",
+            help="The maximum delay between outbound delivery retries. Default: 300.",
+        )
+        parser.add_argument(
+            "--outbound-retry-jitter",
+            type=BoundedFloat(min=0, max=1),
+            env_var="ACAPY_OUTBOUND_RETRY_JITTER",
+            metavar="<fraction>",
+            help=(
+                "The maximum fraction of each outbound retry delay randomly skipped, "
+                "so that messages failing together are not retried together. "
+                "Default: 0.5."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-retry-budget",
+            type=BoundedFloat(min=0),
+            env_var="ACAPY_OUTBOUND_RETRY_BUDGET",
+            metavar="<seconds>",
+            help=(
+                "Stop retrying an outbound message this many seconds after its first "
+                "delivery attempt. Default: no limit."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-retry-scheme-policy",
+            type=str,
+            action="append",
+            nargs=2,
+            metavar=("<scheme>", "<json>"),
+            env_var="ACAPY_OUTBOUND_RETRY_SCHEME_POLICY",
+            help=(
+                "Override the outbound retry policy for endpoints using <scheme>, "
+                "with a JSON object containing any of 'delay', 'multiplier', "
+                "'max_delay', 'jitter' and 'budget'. This parameter can be "
+                "specified multiple times. For example: ws '{\"delay\": 2}'"
+            ),
+        )
         parser.add_argument(
             "--max-outbound-retry",
             default=4,
@@ -1414,10 +1814,47 @@ class TransportGroup(ArgumentGroup):
             else:
                 raise ArgsParseError("-ot/--outbound-transport is required")
             settings["transport.enable_undelivered_queue"] = args.enable_undelivered_queue
+            if args.durable_outbound_queue:
+                settings["transport.durable_outbound_queue"] = True
             if args.max_message_size:
                 settings["transport.max_message_size"] = args.max_message_size
             if args.max_outbound_retry:
                 settings["transport.max_outbound_retry"] = args.max_outbound_retry
+            if args.outbound_circuit_failures:
+                settings["transport.circuit.failure_threshold"] = (
+                    args.outbound_circuit_failures
+                )
+            if args.outbound_circuit_reset:
+                settings["transport.circuit.reset_timeout"] = args.outbound_circuit_reset
+            if args.outbound_circuit_fail_fast:
+                settings["transport.circuit.fail_fast"] = True
+            for name in OUTBOUND_RETRY_POLICY_NAMES:
+                value = getattr(args, f"outbound_retry_{name}")
+                if value is not None:
+                    settings[f"transport.retry.{name}"] = value
+            if args.outbound_retry_scheme_policy:
+                schemes = {}
+                for scheme, policy in args.outbound_retry_scheme_policy:
+                    try:
+                        policy = json.loads(policy)
+                    except json.JSONDecodeError as e:
+                        raise ArgsParseError(
+                            f"Invalid outbound retry policy for scheme '{scheme}'"
+                        ) from e
+                    if not isinstance(policy, dict) or not set(policy).issubset(
+                        OUTBOUND_RETRY_POLICY_NAMES
+                    ):
+                        raise ArgsParseError(
+                            f"Invalid outbound retry policy for scheme '{scheme}', "
+                            f"expected an object with keys from "
+                            f"{', '.join(OUTBOUND_RETRY_POLICY_NAMES)}"
+                        )
+                    schemes[scheme] = policy
+                settings["transport.retry.schemes"] = schemes
+            if args.outbound_endpoint_max_in_flight:
+                settings["transport.endpoint_max_in_flight"] = (
+                    args.outbound_endpoint_max_in_flight
+                )
             if args.ws_heartbeat_interval:
                 settings["transport.ws.heartbeat_interval"] = args.ws_heartbeat_interval
             if args.ws_timeout_interval:
@@ -1660,6 +2097,19 @@ class WalletGroup(ArgumentGroup):
                 "will fail."
             ),
         )
+        parser.add_argument(
+            "--wallet-filter-tag-queries",
+            action="store_true",
+            env_var="ACAPY_WALLET_FILTER_TAG_QUERIES",
+            help=(
+                "Match list filters on the state, role and connection of exchange "
+                "records using storage tags, once existing records have been "
+                "back-filled, instead of loading every record. Only enable once "
+                "every agent process sharing the wallet runs this version: records "
+                "saved by earlier versions lack these tags and are left out of "
+                "filtered lists and retention sweeps. Default: false."
+            ),
+        )
         parser.add_argument(
             "--replace-public-did",
             action="store_true",
@@ -1711,6 +2161,8 @@ class WalletGroup(ArgumentGroup):
             settings["wallet.storage_config"] = args.wallet_storage_config
         if args.wallet_storage_creds:
             settings["wallet.storage_creds"] = args.wallet_storage_creds
+        if args.wallet_filter_tag_queries:
+            settings["wallet.filter_tag_queries"] = True
         if args.replace_public_did:
             settings["wallet.replace_public_did"] = True
         if args.recreate_wallet:
@@ -3,6 +3,7 @@
 from ..anoncreds.registry import AnonCredsRegistry
 from ..cache.base import BaseCache
 from ..cache.in_memory import InMemoryCache
+from ..cache.sqlite import SqliteCache
 from ..connections.base_manager import BaseConnectionManager
 from ..core.event_bus import EventBus
 from ..core.goal_code_registry import GoalCodeRegistry
@@ -41,8 +42,20 @@ class DefaultContextBuilder(ContextBuilder):
             collector = Collector(log_path=timing_log)
             context.injector.bind_instance(Collector, collector)
 
-        # Shared in-memory cache
-        context.injector.bind_instance(BaseCache, InMemoryCache())
+        # Shared cache
+        max_entries = context.settings.get("cache.max_entries")
+        if context.settings.get("cache.shared_path"):
+            cache = SqliteCache(
+                context.settings["cache.shared_path"], max_entries=max_entries
+            )
+        else:
+            cache = InMemoryCache(max_entries=max_entries)
+        if context.settings.get("cache.refresh_ahead"):
+            cache.enable_refresh_ahead(
+                context.settings["cache.refresh_ahead"],
+                context.settings.get("cache.refresh_grace", 0),
+            )
+        context.injector.bind_instance(BaseCache, cache)
 
         # Global protocol registry
         context.injector.bind_instance(ProtocolRegistry, ProtocolRegistry())
@@ -3,7 +3,7 @@ from unittest import IsolatedAsyncioTestCase, mock
 from configargparse import ArgumentTypeError
 
 from .. import argparse
-from ..util import BoundedInt, ByteSize
+from ..util import BoundedFloat, BoundedInt, ByteSize
 
 
 class TestArgParse(IsolatedAsyncioTestCase):
@@ -39,6 +39,21 @@ class TestArgParse(IsolatedAsyncioTestCase):
                 "http",
                 "--max-outbound-retry",
                 "5",
+                "--durable-outbound-queue",
+                "--outbound-circuit-failures",
+                "3",
+                "--outbound-circuit-reset",
+                "60",
+                "--outbound-circuit-fail-fast",
+                "--outbound-endpoint-max-in-flight",
+                "10",
+                "--outbound-retry-delay",
+                "2.5",
+                "--outbound-retry-jitter",
+                "0.2",
+                "--outbound-retry-scheme-policy",
+                "ws",
+                '{"delay": 1, "budget": 60}',
             ]
         )
 
@@ -50,6 +65,47 @@ class TestArgParse(IsolatedAsyncioTestCase):
         assert settings.get("transport.inbound_configs") == [["http", "0.0.0.0", "80"]]
         assert settings.get("transport.outbound_configs") == ["http"]
         assert result.max_outbound_retry == 5
+        assert settings.get("transport.durable_outbound_queue") is True
+        assert settings.get("transport.circuit.failure_threshold") == 3
+        assert settings.get("transport.circuit.reset_timeout") == 60
+        assert settings.get("transport.circuit.fail_fast") is True
+        assert settings.get("transport.endpoint_max_in_flight") == 10
+        assert settings.get("transport.retry.delay") == 2.5
+        assert settings.get("transport.retry.jitter") == 0.2
+        assert "transport.retry.budget" not in settings
+        assert settings.get("transport.retry.schemes") == {
+            "ws": {"delay": 1, "budget": 60}
+        }
+
+        for policy in ("not json", '{"unknown": 1}'):
+            result.outbound_retry_scheme_policy = [["ws", policy]]
+            with self.assertRaises(argparse.ArgsParseError):
+                group.get_settings(result)
+
+    async def test_webhook_batch_settings(self):
+        parser = argparse.create_argument_parser()
+        group = argparse.AdminGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(
+            [
+                "--admin",
+                "0.0.0.0",
+                "8021",
+                "--admin-insecure-mode",
+                "--webhook-url",
+                "http://controller/webhooks",
+                "--webhook-batch-size",
+                "100",
+                "--webhook-batch-interval",
+                "250",
+            ]
+        )
+        settings = group.get_settings(result)
+
+        assert settings.get("admin.webhook_urls") == ["http://controller/webhooks"]
+        assert settings.get("admin.webhook_batch_size") == 100
+        assert settings.get("admin.webhook_batch_interval") == 250
 
     async def test_get_genesis_transactions_list_with_ledger_selection(self):
         """Test multiple ledger support related argument parsing."""
@@ -266,6 +322,10 @@ class TestArgParse(IsolatedAsyncioTestCase):
         assert settings.get("external_plugins") == ["foo"]
         assert settings.get("storage_type") == "bar"
 
+        result = parser.parse_args(["--json-codec", "stdlib", "-e", "http://1.2.3.4"])
+        settings = group.get_settings(result)
+        assert settings.get("json_codec") == "stdlib"
+
     async def test_plugin_config_file(self):
         """Test file argument parsing."""
 
@@ -480,6 +540,23 @@ class TestArgParse(IsolatedAsyncioTestCase):
 
         assert repr(bounded) == "integer"
 
+    def test_bounded_float(self):
+        bounded = BoundedFloat()
+        with self.assertRaises(ArgumentTypeError):
+            bounded("")
+        with self.assertRaises(ArgumentTypeError):
+            bounded("a")
+        assert bounded("1.5") == 1.5
+
+        bounded = BoundedFloat(min=0, max=1)
+        with self.assertRaises(ArgumentTypeError):
+            bounded("-0.5")
+        with self.assertRaises(ArgumentTypeError):
+            bounded("1.5")
+        assert bounded("0.5") == 0.5
+
+        assert repr(bounded) == "number"
+
     async def test_mediation_x_clear_and_default(self):
         parser = argparse.create_argument_parser()
         group = argparse.MediationGroup()
@@ -532,6 +609,17 @@ class TestArgParse(IsolatedAsyncioTestCase):
 
         assert settings.get("wallet.key_derivation_method") == key_derivation_method
 
+    async def test_wallet_filter_tag_queries(self):
+        parser = argparse.create_argument_parser()
+        group = argparse.WalletGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(["--wallet-test"])
+        assert "wallet.filter_tag_queries" not in group.get_settings(result)
+
+        result = parser.parse_args(["--wallet-filter-tag-queries", "--wallet-test"])
+        assert group.get_settings(result)["wallet.filter_tag_queries"] is True
+
     async def test_wallet_key_value_parsing(self):
         key_value = "some_key_value"
         parser = argparse.create_argument_parser()
@@ -625,3 +713,115 @@ class TestArgParse(IsolatedAsyncioTestCase):
         result = parser.parse_args(["-e", "test", "--universal-resolver-regex", "regex"])
         with self.assertRaises(argparse.ArgsParseError):
             group.get_settings(result)
+
+    def test_cache_settings(self):
+        """Test cache flags."""
+        parser = argparse.create_argument_parser()
+        group = argparse.CacheGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args([])
+        assert group.get_settings(result) == {}
+
+        result = parser.parse_args(["--cache-max-entries", "500"])
+        settings = group.get_settings(result)
+        assert settings.get("cache.max_entries") == 500
+
+        result = parser.parse_args(["--cache-negative-ttl", "0"])
+        settings = group.get_settings(result)
+        assert settings.get("cache.negative_ttl") == 0
+
+        result = parser.parse_args(
+            ["--cache-refresh-ahead", "20", "--cache-refresh-grace", "30"]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("cache.refresh_ahead") == 0.2
+        assert settings.get("cache.refresh_grace") == 30
+
+        result = parser.parse_args(
+            [
+                "--cache-warmup",
+                "--cache-warmup-connections",
+                "0",
+                "--cache-warmup-concurrency",
+                "4",
+                "--cache-warmup-timeout",
+                "120",
+            ]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("cache.warmup") is True
+        assert settings.get("cache.warmup_connections") == 0
+        assert settings.get("cache.warmup_concurrency") == 4
+        assert settings.get("cache.warmup_timeout") == 120
+
+        result = parser.parse_args(["--shared-cache-path", "/tmp/cache.db"])
+        settings = group.get_settings(result)
+        assert settings.get("cache.shared_path") == "/tmp/cache.db"
+
+        result = parser.parse_args(["--cache-records"])
+        assert group.get_settings(result) == {"cache.records": True}
+
+        with self.assertRaises(SystemExit):
+            parser.parse_args(["--cache-max-entries", "0"])
+        with self.assertRaises(SystemExit):
+            parser.parse_args(["--cache-refresh-ahead", "101"])
+
+    def test_retention_settings(self):
+        """Test record retention flags."""
+        parser = argparse.create_argument_parser()
+        group = argparse.RetentionGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args([])
+        assert group.get_settings(result) == {}
+
+        result = parser.parse_args(
+            [
+                "--retention-config",
+                "retention.yaml",
+                "--retention-interval",
+                "600",
+                "--retention-batch-size",
+                "50",
+                "--retention-rate",
+                "20",
+                "--retention-archive-dir",
+                "/tmp/archive",
+            ]
+        )
+        with mock.patch(
+            "builtins.open",
+            mock.mock_open(read_data="cred_ex_v20:\n  max_age: 86400\n  keep_last: 5\n"),
+        ):
+            settings = group.get_settings(result)
+        assert settings.get("retention.policies") == {
+            "cred_ex_v20": {"max_age": 86400, "keep_last": 5}
+        }
+        assert settings.get("retention.interval") == 600
+        assert settings.get("retention.batch_size") == 50
+        assert settings.get("retention.rate") == 20
+        assert settings.get("retention.archive_dir") == "/tmp/archive"
+
+        with self.assertRaises(SystemExit):
+            parser.parse_args(["--retention-rate", "0"])
+
+    def test_ledger_persistent_cache(self):
+        """Test ledger persistent cache flag."""
+        parser = argparse.create_argument_parser()
+        group = argparse.LedgerGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(["--genesis-url", "http://1.2.3.4:9000/genesis"])
+        settings = group.get_settings(result)
+        assert "ledger.persistent_cache" not in settings
+
+        result = parser.parse_args(
+            [
+                "--genesis-url",
+                "http://1.2.3.4:9000/genesis",
+                "--ledger-persistent-cache",
+            ]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("ledger.persistent_cache") is True
@@ -1,7 +1,8 @@
-from tempfile import NamedTemporaryFile
+from tempfile import NamedTemporaryFile, TemporaryDirectory
 from unittest import IsolatedAsyncioTestCase
 
 from ...cache.base import BaseCache
+from ...cache.sqlite import SqliteCache
 from ...core.profile import ProfileManager
 from ...core.protocol_registry import ProtocolRegistry
 from ...transport.wire_format import BaseWireFormat
@@ -34,3 +35,24 @@ class TestDefaultContext(IsolatedAsyncioTestCase):
         )
         result = await builder.build_context()
         assert isinstance(result, InjectionContext)
+
+    async def test_build_context_shared_cache(self):
+        """Test context init with a shared cache."""
+        with TemporaryDirectory() as tmp_dir:
+            builder = DefaultContextBuilder(
+                settings={"cache.shared_path": f"{tmp_dir}/cache.db"}
+            )
+            result = await builder.build_context()
+            cache = result.inject(BaseCache)
+            assert isinstance(cache, SqliteCache)
+            cache.close()
+
+    async def test_build_context_cache_refresh_ahead(self):
+        """Test context init with refresh-ahead enabled for the cache."""
+        builder = DefaultContextBuilder(
+            settings={"cache.refresh_ahead": 0.2, "cache.refresh_grace": 30}
+        )
+        result = await builder.build_context()
+        cache = result.inject(BaseCache)
+        assert cache.refresh_ahead == 0.2
+        assert cache.refresh_grace == 30
@@ -53,6 +53,35 @@ class BoundedInt:
         return "integer"
 
 
+class BoundedFloat:
+    """Argument value parser for a bounded floating point number."""
+
+    def __init__(self, min: Optional[float] = None, max: Optional[float] = None):
+        """Initialize the BoundedFloat parser."""
+        self.min_val = min
+        self.max_val = max
+
+    def __call__(self, arg: str) -> float:
+        """Interpret the argument value."""
+        if not arg:
+            raise ArgumentTypeError("Expected number value")
+        try:
+            val = float(arg)
+        except ValueError:
+            raise ArgumentTypeError(f"Invalid number value: '{arg}'")
+        if self.min_val is not None and val < self.min_val:
+            raise ArgumentTypeError(
+                f"Value must be greater than or equal to {self.min_val}"
+            )
+        if self.max_val is not None and val > self.max_val:
+            raise ArgumentTypeError(f"Value must be less than or equal to {self.max_val}")
+        return val
+
+    def __repr__(self):
+        """Format for in error reporting."""
+        return "number"
+
+
 class ByteSize:
     """Argument value parser for byte sizes."""
 
@@ -36,7 +36,7 @@ from ..protocols.coordinate_mediation.v1_0.models.mediation_record import (
 from ..protocols.coordinate_mediation.v1_0.route_manager import RouteManager
 from ..protocols.discovery.v2_0.manager import V20DiscoveryMgr
 from ..protocols.out_of_band.v1_0.messages.invitation import InvitationMessage
-from ..resolver.base import ResolverError
+from ..resolver.base import ResolverError, did_cache_tag
 from ..resolver.did_resolver import DIDResolver
 from ..storage.base import BaseStorage
 from ..storage.error import StorageDuplicateError, StorageNotFoundError
@@ -773,6 +773,13 @@ class BaseConnectionManager:
                 if entry.result:
                     self._logger.debug("Connection targets retrieved from cache")
                     targets = [ConnectionTarget.deserialize(row) for row in entry.result]
+                    if entry.refresh_due:
+                        entry.refresh(
+                            lambda: self._fetch_cacheable_connection_targets(
+                                connection_id
+                            ),
+                            3600,
+                        )
                 else:
                     if not connection:
                         async with self._profile.session() as session:
@@ -787,7 +794,15 @@ class BaseConnectionManager:
                         # Otherwise, a replica that participated early in exchange
                         # may have bad data set in cache.
                         self._logger.debug("Caching connection targets")
-                        await entry.set_result([row.serialize() for row in targets], 3600)
+                        cache_tags = [ConnRecord.cache_tag(connection_id)]
+                        if connection.their_did:
+                            cache_tags.append(did_cache_tag(connection.their_did))
+                        await entry.set_result(
+                            [row.serialize() for row in targets],
+                            3600,
+                            refresh_ahead=True,
+                            tags=cache_tags,
+                        )
                     else:
                         self._logger.debug(
                             "Not caching connection targets for connection in "
@@ -801,20 +816,34 @@ class BaseConnectionManager:
             targets = await self.fetch_connection_targets(connection)
         return targets
 
+    async def _fetch_cacheable_connection_targets(
+        self, connection_id: str
+    ) -> Optional[Sequence[dict]]:
+        """Fetch serialized connection targets for a completed connection.
+
+        Used to refresh the cached targets in the background. Returns `None` if
+        the connection is no longer in the completed state.
+        """
+        async with self._profile.session() as session:
+            connection = await ConnRecord.retrieve_by_id(session, connection_id)
+        if connection.state != ConnRecord.State.COMPLETED.rfc160:
+            return None
+        targets = await self.fetch_connection_targets(connection)
+        return [row.serialize() for row in targets]
+
     async def clear_connection_targets_cache(self, connection_id: str):
         """Clear the connection targets cache for a given connection ID.
 
         Historically, connections have not been updatable after the protocol
         completes. However, with DID Rotation, we need to be able to update
-        the connection targets and clear the cache of targets.
+        the connection targets and clear the cache of targets. Inbound
+        connection lookups cached for the connection are cleared as well.
         """
-        # TODO it would be better to include the DIDs of the connection in the
-        # target cache key This solution only works when using whole cluster
-        # caching or have only a single instance with local caching
+        # This solution only works when using whole cluster caching or have
+        # only a single instance with local caching
         cache = self._profile.inject_or(BaseCache)
         if cache:
-            cache_key = f"connection_target::{connection_id}"
-            await cache.clear(cache_key)
+            await cache.clear_tag(ConnRecord.cache_tag(connection_id))
 
     def diddoc_connection_targets(
         self,
@@ -971,7 +1000,11 @@ class BaseConnectionManager:
                                 "recipient_did": receipt.recipient_did,
                                 "recipient_did_public": receipt.recipient_did_public,
                             }
-                            await entry.set_result(cache_val, 3600)
+                            await entry.set_result(
+                                cache_val,
+                                3600,
+                                tags=[ConnRecord.cache_tag(connection.connection_id)],
+                            )
                         resolved = True
 
         if not connection and not resolved:
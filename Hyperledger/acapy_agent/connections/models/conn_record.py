@@ -156,6 +156,7 @@ class ConnRecord(BaseRecord):
     RECORD_TYPE_INVITATION = "connection_invitation"
     RECORD_TYPE_REQUEST = "connection_request"
     RECORD_TYPE_METADATA = "connection_metadata"
+    RETRIEVE_CACHE_TTL = BaseRecord.DEFAULT_CACHE_TTL
 
     INVITATION_MODE_ONCE = "once"
     INVITATION_MODE_MULTI = "multi"
@@ -489,6 +490,11 @@ class ConnRecord(BaseRecord):
         ser = json.loads(result.value)
         return DIDXRequest.deserialize(ser)
 
+    @staticmethod
+    def cache_tag(connection_id: str) -> str:
+        """Get the cache tag for entries derived from a connection record."""
+        return f"connection::{connection_id}"
+
     @property
     def is_ready(self) -> str:
         """Accessor for connection readiness."""
@@ -512,9 +518,8 @@ class ConnRecord(BaseRecord):
         """
         await super().post_save(session, *args, **kwargs)
 
-        # clear cache key set by connection manager
-        cache_key = f"connection_target::{self.connection_id}"
-        await self.clear_cached_key(session, cache_key)
+        # clear cache entries set by connection manager
+        await self.clear_cached_tag(session, self.cache_tag(self.connection_id))
 
     async def delete_record(self, session: ProfileSession):
         """Perform connection record deletion actions.
@@ -524,6 +529,7 @@ class ConnRecord(BaseRecord):
 
         """
         await super().delete_record(session)
+        await self.clear_cached_tag(session, self.cache_tag(self.connection_id))
 
         storage = session.inject(BaseStorage)
         # Delete metadata
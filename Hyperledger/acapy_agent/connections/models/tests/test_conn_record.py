@@ -1,5 +1,7 @@
 from unittest import IsolatedAsyncioTestCase
 
+from ....cache.base import BaseCache
+from ....cache.in_memory import InMemoryCache
 from ....did.did_key import DIDKey
 from ....protocols.didexchange.v1_0.messages.request import DIDXRequest
 from ....protocols.out_of_band.v1_0.messages.invitation import InvitationMessage
@@ -547,6 +549,28 @@ class TestConnRecord(IsolatedAsyncioTestCase):
             await record.save(session)
             assert await record.metadata_get_all(session) == {}
 
+    async def test_save_and_delete_clear_cached_entries(self):
+        cache = InMemoryCache()
+        self.profile.context.injector.bind_instance(BaseCache, cache)
+        async with self.profile.session() as session:
+            record = ConnRecord(my_did=self.test_did)
+            await record.save(session)
+            cache_tag = ConnRecord.cache_tag(record.connection_id)
+
+            await cache.set(["connection_target::1", "connection_by_verkey::1"], [])
+            await cache.tag(
+                ["connection_target::1", "connection_by_verkey::1"], [cache_tag]
+            )
+            record.alias = "updated"
+            await record.save(session)
+            assert await cache.get("connection_target::1") is None
+            assert await cache.get("connection_by_verkey::1") is None
+
+            await cache.set("connection_target::1", [])
+            await cache.tag("connection_target::1", [cache_tag])
+            await record.delete_record(session)
+            assert await cache.get("connection_target::1") is None
+
     async def test_delete_conn_record_deletes_metadata(self):
         async with self.profile.session() as session:
             record = ConnRecord(
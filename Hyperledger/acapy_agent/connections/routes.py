@@ -18,6 +18,9 @@ from ..messaging.models.base import BaseModelError
 from ..messaging.models.openapi import OpenAPISchema
 from ..messaging.models.paginated_query import (
     PaginatedQuerySchema,
+    PaginatedResultSchema,
+    get_cursor_query_param,
+    get_include_total_query_param,
     get_paginated_query_params,
 )
 from ..messaging.valid import (
@@ -31,6 +34,7 @@ from ..messaging.valid import (
     UUID4_EXAMPLE,
 )
 from ..storage.error import StorageError, StorageNotFoundError
+from ..utils import json_codec
 from ..wallet.error import WalletError
 from .base_manager import BaseConnectionManager
 
@@ -39,7 +43,7 @@ class ConnectionModuleResponseSchema(OpenAPISchema):
     """Response schema for connection module."""
 
 
-class ConnectionListSchema(OpenAPISchema):
+class ConnectionListSchema(PaginatedResultSchema):
     """Result schema for connection list."""
 
     results = fields.List(
@@ -295,25 +299,47 @@ async def connections_list(request: web.BaseRequest):
         post_filter["connection_protocol"] = request.query["connection_protocol"]
 
     limit, offset, order_by, descending = get_paginated_query_params(request)
+    cursor = get_cursor_query_param(request)
+    include_total = get_include_total_query_param(request)
 
     profile = context.profile
     try:
         async with profile.session() as session:
-            records = await ConnRecord.query(
-                session,
-                tag_filter,
-                limit=limit,
-                offset=offset,
-                order_by=order_by,
-                descending=descending,
-                post_filter_positive=post_filter,
-                alt=True,
-            )
+            if cursor is not None:
+                records, next_cursor = await ConnRecord.query_page(
+                    session,
+                    tag_filter,
+                    limit=limit,
+                    cursor=cursor,
+                    descending=descending,
+                    post_filter_positive=post_filter,
+                    alt=True,
+                )
+            else:
+                records = await ConnRecord.query(
+                    session,
+                    tag_filter,
+                    limit=limit,
+                    offset=offset,
+                    order_by=order_by,
+                    descending=descending,
+                    post_filter_positive=post_filter,
+                    alt=True,
+                )
+            if include_total:
+                total = await ConnRecord.count(
+                    session, tag_filter, post_filter_positive=post_filter, alt=True
+                )
         results = [record.serialize() for record in records]
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    return web.json_response({"results": results})
+    response = {"results": results}
+    if cursor is not None:
+        response["next_cursor"] = next_cursor
+    if include_total:
+        response["total"] = total
+    return web.json_response(response, dumps=json_codec.dumps)
 
 
 @docs(tags=["connection"], summary="Fetch a single connection record")
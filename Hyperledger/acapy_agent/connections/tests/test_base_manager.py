@@ -935,6 +935,47 @@ class TestBaseConnectionManager(IsolatedAsyncioTestCase):
                 )
                 assert mock_fetch_connection_targets.call_count == 1
 
+    async def test_get_connection_targets_refresh_ahead(self):
+        cache = InMemoryCache()
+        cache.enable_refresh_ahead(1, grace=60)
+        self.profile.context.injector.bind_instance(BaseCache, cache)
+        mock_conn = mock.MagicMock(
+            connection_id="dummy", state=ConnRecord.State.COMPLETED.rfc160
+        )
+
+        with (
+            mock.patch.object(
+                ConnectionTarget, "serialize", autospec=True
+            ) as mock_conn_target_ser,
+            mock.patch.object(
+                ConnRecord, "retrieve_by_id", mock.CoroutineMock()
+            ) as mock_conn_rec_retrieve_by_id,
+            mock.patch.object(
+                self.manager, "fetch_connection_targets", mock.CoroutineMock()
+            ) as mock_fetch_connection_targets,
+        ):
+            mock_fetch_connection_targets.return_value = [ConnectionTarget()]
+            mock_conn_rec_retrieve_by_id.return_value = mock_conn
+            mock_conn_target_ser.return_value = {"endpoint": "http://old"}
+            await self.manager.get_connection_targets(connection_id="dummy")
+
+            # stale targets are served while they are refreshed in the background
+            mock_conn_target_ser.return_value = {"endpoint": "http://new"}
+            targets = await self.manager.get_connection_targets(connection_id="dummy")
+            assert targets[0].endpoint == "http://old"
+            await cache._refresh_tasks["connection_target::dummy"]
+            assert await cache.get("connection_target::dummy") == [
+                {"endpoint": "http://new"}
+            ]
+
+            # targets are dropped once the connection is no longer completed
+            mock_conn.state = ConnRecord.State.ABANDONED.rfc160
+            await cache.refresh(
+                "connection_target::dummy",
+                lambda: self.manager._fetch_cacheable_connection_targets("dummy"),
+            )
+            assert await cache.get("connection_target::dummy") is None
+
     async def test_get_connection_targets_no_cache(self):
         async with self.profile.session() as session:
             wallet = session.inject(BaseWallet)
@@ -117,7 +117,8 @@ class TestConnectionRoutes(IsolatedAsyncioTestCase):
                             }
                             for c in conns
                         ]
-                    }  # sorted
+                    },  # sorted
+                    dumps=test_module.json_codec.dumps,
                 )
 
     async def test_connections_list_x(self):
@@ -142,6 +143,68 @@ class TestConnectionRoutes(IsolatedAsyncioTestCase):
             with self.assertRaises(test_module.web.HTTPBadRequest):
                 await test_module.connections_list(self.request)
 
+    async def test_connections_list_cursor(self):
+        self.request.query = {"limit": "2", "cursor": "", "descending": "true"}
+        mock_conn = mock.MagicMock(
+            serialize=mock.MagicMock(return_value={"connection_id": "dummy"})
+        )
+
+        with (
+            mock.patch.object(
+                test_module.ConnRecord,
+                "query_page",
+                mock.CoroutineMock(return_value=([mock_conn], "next")),
+            ) as mock_query_page,
+            mock.patch.object(test_module.ConnRecord, "query") as mock_query,
+            mock.patch.object(test_module.web, "json_response") as mock_response,
+        ):
+            await test_module.connections_list(self.request)
+            mock_query_page.assert_awaited_once_with(
+                mock.ANY,
+                {},
+                limit=2,
+                cursor="",
+                descending=True,
+                post_filter_positive={},
+                alt=True,
+            )
+            mock_query.assert_not_called()
+            mock_response.assert_called_once_with(
+                {"results": [{"connection_id": "dummy"}], "next_cursor": "next"},
+                dumps=test_module.json_codec.dumps,
+            )
+
+    async def test_connections_list_include_total(self):
+        self.request.query = {"state": "active", "include_total": "true"}
+        mock_conn = mock.MagicMock(
+            serialize=mock.MagicMock(return_value={"connection_id": "dummy"})
+        )
+
+        with (
+            mock.patch.object(
+                test_module.ConnRecord,
+                "query",
+                mock.CoroutineMock(return_value=[mock_conn]),
+            ),
+            mock.patch.object(
+                test_module.ConnRecord, "count", mock.CoroutineMock(return_value=7)
+            ) as mock_count,
+            mock.patch.object(test_module.web, "json_response") as mock_response,
+        ):
+            await test_module.connections_list(self.request)
+            mock_count.assert_awaited_once_with(
+                mock.ANY,
+                {},
+                post_filter_positive={
+                    "state": list(ConnRecord.State.get("active").value)
+                },
+                alt=True,
+            )
+            mock_response.assert_called_once_with(
+                {"results": [{"connection_id": "dummy"}], "total": 7},
+                dumps=test_module.json_codec.dumps,
+            )
+
     async def test_connections_retrieve(self):
         self.request.match_info = {"conn_id": "dummy"}
         mock_conn_rec = mock.MagicMock()
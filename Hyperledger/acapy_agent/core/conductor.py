@@ -18,6 +18,12 @@ from qrcode import QRCode
 
 from ..admin.base_server import BaseAdminServer
 from ..admin.server import AdminResponder, AdminServer
+from ..cache.warmup import (
+    DEFAULT_WARMUP_CONCURRENCY,
+    DEFAULT_WARMUP_CONNECTIONS,
+    DEFAULT_WARMUP_TIMEOUT,
+    warm_up_cache,
+)
 from ..commands.upgrade import add_version_record, get_upgrade_version_list, upgrade
 from ..config.default_context import ContextBuilder, DefaultContextBuilder
 from ..config.injection_context import InjectionContext
@@ -40,6 +46,7 @@ from ..ledger.multiple_ledger.base_manager import (
 )
 from ..ledger.multiple_ledger.ledger_requests_executor import IndyLedgerRequestsExecutor
 from ..ledger.multiple_ledger.manager_provider import MultiIndyLedgerManagerProvider
+from ..messaging.models.base_record import backfill_record_tags
 from ..messaging.responder import BaseResponder
 from ..multitenant.base import BaseMultitenantManager
 from ..multitenant.manager_provider import MultitenantManagerProvider
@@ -66,6 +73,7 @@ from ..transport.outbound.manager import OutboundTransportManager, QueuedOutboun
 from ..transport.outbound.message import OutboundMessage
 from ..transport.outbound.status import OutboundSendStatus
 from ..transport.wire_format import BaseWireFormat
+from ..utils import json_codec
 from ..utils.profiles import get_subwallet_profiles_from_storage
 from ..utils.stats import Collector
 from ..utils.task_queue import CompletedTask, TaskQueue
@@ -76,6 +84,7 @@ from ..wallet.did_info import DIDInfo
 from .dispatcher import Dispatcher
 from .error import StartupError
 from .oob_processor import OobMessageProcessor
+from .retention import RetentionSweeper
 from .util import SHUTDOWN_EVENT_TOPIC, STARTUP_EVENT_TOPIC
 
 LOGGER = logging.getLogger(__name__)
@@ -108,6 +117,9 @@ class Conductor:
         self.outbound_transport_manager: Optional[OutboundTransportManager] = None
         self.root_profile: Optional[Profile] = None
         self.setup_public_did: Optional[DIDInfo] = None
+        self.warmup_task: Optional[asyncio.Task] = None
+        self.tag_backfill_task: Optional[asyncio.Task] = None
+        self.retention_task: Optional[asyncio.Task] = None
 
     force_agent_anoncreds = False
 
@@ -122,6 +134,9 @@ class Conductor:
 
         context = await self.context_builder.build_context()
 
+        if context.settings.get("json_codec"):
+            json_codec.set_codec(context.settings["json_codec"])
+
         if self.force_agent_anoncreds:
             context.settings.set_value("wallet.type", "askar-anoncreds")
 
@@ -295,6 +310,10 @@ class Conductor:
             except Exception:
                 LOGGER.exception("Unable to start outbound transports")
                 raise
+            try:
+                await self.outbound_transport_manager.restore_queued()
+            except Exception:
+                LOGGER.exception("Unable to restore queued outbound messages")
 
         # Start up Admin server
         if self.admin_server:
@@ -497,6 +516,31 @@ class Conductor:
                 "An exception was caught while checking for wallet upgrades in progress"
             )
 
+        # Pre-load the cache in the background
+        if context.settings.get("cache.warmup"):
+            self.warmup_task = asyncio.ensure_future(
+                warm_up_cache(
+                    self.root_profile,
+                    connections=context.settings.get(
+                        "cache.warmup_connections", DEFAULT_WARMUP_CONNECTIONS
+                    ),
+                    concurrency=context.settings.get(
+                        "cache.warmup_concurrency", DEFAULT_WARMUP_CONCURRENCY
+                    ),
+                    timeout=context.settings.get(
+                        "cache.warmup_timeout", DEFAULT_WARMUP_TIMEOUT
+                    ),
+                )
+            )
+
+        # Tag existing records with newly declared filter tags in the background
+        self.tag_backfill_task = asyncio.ensure_future(self.backfill_wallet_tags())
+
+        # Delete finished records in the background
+        retention = RetentionSweeper.from_settings(self.root_profile)
+        if retention:
+            self.retention_task = asyncio.ensure_future(retention.run())
+
         # notify protocols of startup status
         await self.root_profile.notify(STARTUP_EVENT_TOPIC, {})
 
@@ -506,6 +550,13 @@ class Conductor:
         if self.root_profile:
             await self.root_profile.notify(SHUTDOWN_EVENT_TOPIC, {})
 
+        if self.warmup_task:
+            self.warmup_task.cancel()
+        if self.tag_backfill_task:
+            self.tag_backfill_task.cancel()
+        if self.retention_task:
+            self.retention_task.cancel()
+
         shutdown = TaskQueue()
         if self.dispatcher:
             shutdown.run(self.dispatcher.complete())
@@ -607,6 +658,10 @@ class Conductor:
                     stats["out_encode"] += 1
                 if m.state == QueuedOutboundMessage.STATE_DELIVER:
                     stats["out_deliver"] += 1
+            circuits = self.outbound_transport_manager.circuits
+            if circuits:
+                stats["out_circuit_open"] = circuits.open_count
+                stats["out_parked"] = circuits.parked_count
         return stats
 
     async def outbound_message_router(
@@ -815,6 +870,25 @@ class Conductor:
                         f"Wallet type config [{storage_type_from_config}] doesn't match with the wallet type in storage [{storage_type_record.value}]"  # noqa: E501
                     )
 
+    async def backfill_wallet_tags(self):
+        """Back-fill record tags in the base wallet and in each sub-wallet.
+
+        Until a wallet has been back-filled, and unless the
+        `wallet.filter_tag_queries` setting is enabled, queries on it keep
+        matching filter tag fields with post-filters.
+        """
+        await backfill_record_tags(self.root_profile)
+        if self.context.settings.get_value("multitenant.enabled"):
+            try:
+                subwallet_profiles = await get_subwallet_profiles_from_storage(
+                    self.root_profile
+                )
+            except Exception:
+                LOGGER.exception("Error opening sub-wallets to back-fill tags")
+                return
+            for profile in subwallet_profiles:
+                await backfill_record_tags(profile)
+
     async def check_for_wallet_upgrades_in_progress(self):
         """Check for upgrade and upgrade if needed."""
         if self.context.settings.get_value("multitenant.enabled"):
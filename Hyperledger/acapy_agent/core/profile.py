@@ -1,8 +1,10 @@
 """Classes for managing profile information within a request context."""
 
+import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Mapping, Optional, Type
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Mapping, Optional, Type
 from weakref import ref
 
 from ..config.base import InjectionError
@@ -16,6 +18,10 @@ from .event_bus import Event, EventBus
 
 LOGGER = logging.getLogger(__name__)
 
+_session_scope: ContextVar[Optional["SessionScope"]] = ContextVar(
+    "session_scope", default=None
+)
+
 
 class Profile(ABC):
     """Base abstraction for handling identity-related state."""
@@ -75,6 +81,32 @@ class Profile(ABC):
         and rollback operations of the session will not have any effect.
         """
 
+    def session_scope(self, context: Optional[InjectionContext] = None) -> "SessionScope":
+        """Create a scope sharing one session between the sessions opened within it.
+
+        Args:
+            context: The injection context of the shared session
+        """
+        return SessionScope(self, context)
+
+    def _scoped_session(
+        self,
+        context: Optional[InjectionContext],
+        open_session: Callable[[Optional[InjectionContext]], "ProfileSession"],
+    ) -> "ProfileSession":
+        """Join the session shared by the current session scope, if any.
+
+        Args:
+            context: The injection context requested for the session
+            open_session: Called to open a new session for an injection context
+        """
+        scope = _session_scope.get()
+        if scope and scope.profile is self and context in (None, scope.context):
+            session = scope.join(open_session)
+            if session:
+                return session
+        return open_session(context)
+
     def inject(
         self,
         base_cls: Type[InjectType],
@@ -179,9 +211,12 @@ class ProfileSession(ABC):
         self._active = False
         self._awaited = False
         self._entered = 0
+        # a shared session may be entered by several tasks before it is set up
+        self._setup_lock = asyncio.Lock()
         self._context = (context or profile.context).start_scope(settings)
         self._profile = profile
         self._events = []
+        self._commit_callbacks = []
 
         self._context.injector.bind_instance(ProfileSession, ref(self))
 
@@ -198,19 +233,24 @@ class ProfileSession(ABC):
         """
 
         async def _init():
-            if not self._active:
-                await self._setup()
-                self._active = True
+            await self._activate()
             self._awaited = True
             return self
 
         return _init().__await__()
 
+    async def _activate(self):
+        """Set up the session, unless it is already active."""
+        if self._active:
+            return
+        async with self._setup_lock:
+            if not self._active:
+                await self._setup()
+                self._active = True
+
     async def __aenter__(self):
         """Async context manager entry."""
-        if not self._active:
-            await self._setup()
-            self._active = True
+        await self._activate()
         self._entered += 1
         return self
 
@@ -260,6 +300,11 @@ class ProfileSession(ABC):
             await self.emit_event(event["topic"], event["payload"], force_emit=True)
         self._events = []
 
+        # run any callbacks waiting for the updates to be visible
+        for callback in self._commit_callbacks:
+            await callback()
+        self._commit_callbacks = []
+
         self._active = False
 
     async def rollback(self):
@@ -271,8 +316,9 @@ class ProfileSession(ABC):
             raise ProfileSessionInactiveError()
         await self._teardown(commit=False)
 
-        # clear any pending events
+        # clear any pending events and callbacks
         self._events = []
+        self._commit_callbacks = []
 
         self._active = False
 
@@ -300,6 +346,21 @@ class ProfileSession(ABC):
                 }
             )
 
+    async def after_commit(self, callback: Callable[[], Awaitable[Any]]):
+        """Run a callback once the updates performed so far are committed.
+
+        If we are in an active transaction, the callback is queued until the
+        transaction is committed and dropped on rollback, otherwise it runs now.
+
+        Args:
+            callback: The coroutine function to call
+        """
+
+        if self.is_transaction:
+            self._commit_callbacks.append(callback)
+        else:
+            await callback()
+
     def inject(
         self,
         base_cls: Type[InjectType],
@@ -351,6 +412,69 @@ class ProfileSession(ABC):
         )
 
 
+class SessionScope:
+    """A scope sharing one profile session between the sessions opened within it.
+
+    While the scope is active, `profile.session()` calls made in the same task,
+    or in tasks started from it, return the shared session rather than
+    acquiring a new store connection each time. The shared session only
+    acquires a connection once it is first used, and holds it until the scope
+    exits. Transactions are never shared. Calls passing an injection context
+    other than the one of the scope also open their own session.
+    """
+
+    def __init__(self, profile: Profile, context: Optional[InjectionContext] = None):
+        """Initialize a `SessionScope` instance.
+
+        Args:
+            profile: The profile whose sessions are shared
+            context: The injection context of the shared session
+        """
+        self.profile = profile
+        self.context = context
+        self.session: Optional[ProfileSession] = None
+        self._closed = False
+        self._token = None
+
+    def join(
+        self, open_session: Callable[[Optional[InjectionContext]], "ProfileSession"]
+    ) -> Optional["ProfileSession"]:
+        """Get the shared session, creating it on first use.
+
+        Args:
+            open_session: Called to create the shared session
+
+        Returns:
+            The shared session, or `None` once the scope has exited
+
+        """
+        if self._closed:
+            return None
+        if not self.session:
+            self.session = open_session(self.context)
+            # held open by the scope until it exits
+            self.session._entered += 1
+        return self.session
+
+    async def __aenter__(self) -> "SessionScope":
+        """Make the scope current."""
+        self._token = _session_scope.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close the shared session, unless a task is still using it."""
+        _session_scope.reset(self._token)
+        self._closed = True
+        session, self.session = self.session, None
+        if not session:
+            return
+        session._entered -= 1
+        # also close the session if a caller awaited it instead of entering it
+        if session.active and not session._entered:
+            await session._teardown()
+            session._active = False
+
+
 class ProfileManagerProvider(BaseProvider):
     """The standard profile manager provider which keys off the selected wallet type."""
 
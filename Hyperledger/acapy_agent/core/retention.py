@@ -0,0 +1,364 @@
+"""Background retention of finished connection and exchange records."""
+
+import asyncio
+import gzip
+import logging
+import os
+import time
+from collections import defaultdict
+from typing import AsyncIterator, Mapping, Optional, Sequence, Type
+
+from ..connections.models.conn_record import ConnRecord
+from ..messaging.models.base_record import BaseRecord
+from ..messaging.util import str_to_datetime
+from ..multitenant.base import BaseMultitenantManager
+from ..protocols.endorse_transaction.v1_0.models.transaction_record import (
+    TransactionRecord,
+)
+from ..protocols.issue_credential.v1_0.models.credential_exchange import (
+    V10CredentialExchange,
+)
+from ..protocols.issue_credential.v2_0.messages.cred_format import V20CredFormat
+from ..protocols.issue_credential.v2_0.models.cred_ex_record import V20CredExRecord
+from ..protocols.out_of_band.v1_0.models.oob_record import OobRecord
+from ..protocols.present_proof.v1_0.models.presentation_exchange import (
+    V10PresentationExchange,
+)
+from ..protocols.present_proof.v2_0.models.pres_exchange import V20PresExRecord
+from ..utils import json_codec
+from ..wallet.models.wallet_record import WalletRecord
+from .profile import Profile, ProfileSession
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_INTERVAL = 3600
+DEFAULT_RETENTION_BATCH_SIZE = 100
+DEFAULT_RETENTION_RATE = 100
+
+# record types supported by retention policies, with their terminal states and
+# the field grouping records for `keep_last`
+RETENTION_RECORD_TYPES = {
+    ConnRecord.RECORD_TYPE: (
+        ConnRecord,
+        (ConnRecord.State.ABANDONED.rfc160,),
+        None,
+    ),
+    V10CredentialExchange.RECORD_TYPE: (
+        V10CredentialExchange,
+        (
+            V10CredentialExchange.STATE_ACKED,
+            V10CredentialExchange.STATE_CREDENTIAL_REVOKED,
+            V10CredentialExchange.STATE_ABANDONED,
+        ),
+        "connection_id",
+    ),
+    V20CredExRecord.RECORD_TYPE: (
+        V20CredExRecord,
+        (
+            V20CredExRecord.STATE_DONE,
+            V20CredExRecord.STATE_CREDENTIAL_REVOKED,
+            V20CredExRecord.STATE_ABANDONED,
+        ),
+        "connection_id",
+    ),
+    V10PresentationExchange.RECORD_TYPE: (
+        V10PresentationExchange,
+        (
+            V10PresentationExchange.STATE_VERIFIED,
+            V10PresentationExchange.STATE_PRESENTATION_ACKED,
+            V10PresentationExchange.STATE_ABANDONED,
+        ),
+        "connection_id",
+    ),
+    V20PresExRecord.RECORD_TYPE: (
+        V20PresExRecord,
+        (V20PresExRecord.STATE_DONE, V20PresExRecord.STATE_ABANDONED),
+        "connection_id",
+    ),
+    OobRecord.RECORD_TYPE: (
+        OobRecord,
+        (OobRecord.STATE_DONE,),
+        "connection_id",
+    ),
+    TransactionRecord.RECORD_TYPE: (
+        TransactionRecord,
+        (
+            TransactionRecord.STATE_TRANSACTION_ACKED,
+            TransactionRecord.STATE_TRANSACTION_REFUSED,
+            TransactionRecord.STATE_TRANSACTION_CANCELLED,
+        ),
+        "connection_id",
+    ),
+}
+
+
+class RetentionPolicy:
+    """Rules selecting the finished records of one type to delete."""
+
+    def __init__(
+        self,
+        record_class: Type[BaseRecord],
+        states: Sequence[str],
+        *,
+        max_age: Optional[int] = None,
+        keep_last: Optional[int] = None,
+        group_by: Optional[str] = None,
+    ):
+        """Initialize a `RetentionPolicy` instance.
+
+        Args:
+            record_class: The record class the policy applies to
+            states: The terminal states of records which may be deleted
+            max_age: Only delete records last updated at least this many
+                seconds ago
+            keep_last: Keep this many of the most recently updated records in
+                a terminal state, per value of `group_by`
+            group_by: The record field grouping records for `keep_last`, or
+                `None` to keep the most recent records overall
+
+        """
+        if not states:
+            raise ValueError(
+                f"Retention policy for {record_class.RECORD_TYPE} has no states"
+            )
+        self.record_class = record_class
+        self.states = tuple(states)
+        self.max_age = max_age
+        self.keep_last = keep_last
+        self.group_by = group_by
+
+    @classmethod
+    def from_config(cls, record_type: str, config: Mapping) -> "RetentionPolicy":
+        """Create a policy from its configuration.
+
+        Args:
+            record_type: The record type the policy applies to
+            config: The policy settings: `max_age` in seconds, `keep_last`, and
+                optionally `states` to replace the default terminal states
+
+        """
+        if record_type not in RETENTION_RECORD_TYPES:
+            raise ValueError(f"Unsupported record type for retention: {record_type}")
+        record_class, states, group_by = RETENTION_RECORD_TYPES[record_type]
+        return cls(
+            record_class,
+            (config or {}).get("states") or states,
+            max_age=(config or {}).get("max_age"),
+            keep_last=(config or {}).get("keep_last"),
+            group_by=group_by,
+        )
+
+    @property
+    def record_type(self) -> str:
+        """Accessor for the record type the policy applies to."""
+        return self.record_class.RECORD_TYPE
+
+    async def select(self, session: ProfileSession, now: float) -> Sequence[str]:
+        """Select the IDs of the records to delete.
+
+        Args:
+            session: The profile session to use
+            now: The current time as an epoch timestamp
+
+        """
+        groups = defaultdict(list)
+        async for record in self.record_class.query_iter(
+            session, post_filter_positive={"state": list(self.states)}, alt=True
+        ):
+            updated = (
+                str_to_datetime(record.updated_at).timestamp() if record.updated_at else 0
+            )
+            group = getattr(record, self.group_by) if self.group_by else None
+            groups[group].append((updated, record._id))
+
+        selected = []
+        for records in groups.values():
+            records.sort(reverse=True)
+            for updated, record_id in records[self.keep_last or 0 :]:
+                if self.max_age is None or now - updated >= self.max_age:
+                    selected.append(record_id)
+        return selected
+
+    async def delete(self, session: ProfileSession, record: BaseRecord):
+        """Delete a record along with the records depending on it."""
+        if isinstance(record, V20CredExRecord):
+            for fmt in V20CredFormat.Format:
+                for detail in await fmt.detail.query_by_cred_ex_id(
+                    session, record.cred_ex_id
+                ):
+                    await detail.delete_record(session)
+        await record.delete_record(session)
+
+
+class RetentionSweeper:
+    """Periodically delete the records selected by retention policies.
+
+    Records are deleted in batches, each in its own transaction, and the
+    deletion rate is held under a budget so that sweeping does not starve
+    regular storage traffic. Deleted records may be archived to a gzip
+    compressed JSON lines file per record type, wallet and sweep.
+
+    With multitenancy, the policies apply to every sub-wallet as well as to
+    the base wallet.
+    """
+
+    def __init__(
+        self,
+        profile: Profile,
+        policies: Sequence[RetentionPolicy],
+        *,
+        interval: float = DEFAULT_RETENTION_INTERVAL,
+        batch_size: int = DEFAULT_RETENTION_BATCH_SIZE,
+        rate: float = DEFAULT_RETENTION_RATE,
+        archive_dir: Optional[str] = None,
+    ):
+        """Initialize a `RetentionSweeper` instance.
+
+        Args:
+            profile: The profile holding the records
+            policies: The retention policies to apply
+            interval: The number of seconds between sweeps
+            batch_size: The number of records deleted in each transaction
+            rate: The maximum number of records deleted per second
+            archive_dir: The directory to archive deleted records to, if any
+
+        """
+        self.profile = profile
+        self.policies = policies
+        self.interval = interval
+        self.batch_size = batch_size
+        self.rate = rate
+        self.archive_dir = archive_dir
+
+    @classmethod
+    def from_settings(cls, profile: Profile) -> Optional["RetentionSweeper"]:
+        """Create a sweeper from the profile settings, if policies are configured."""
+        settings = profile.settings
+        config = settings.get("retention.policies")
+        if not config:
+            return None
+        return cls(
+            profile,
+            [
+                RetentionPolicy.from_config(record_type, policy)
+                for record_type, policy in config.items()
+            ],
+            interval=settings.get("retention.interval", DEFAULT_RETENTION_INTERVAL),
+            batch_size=settings.get("retention.batch_size", DEFAULT_RETENTION_BATCH_SIZE),
+            rate=settings.get("retention.rate", DEFAULT_RETENTION_RATE),
+            archive_dir=settings.get("retention.archive_dir"),
+        )
+
+    def _archive_path(
+        self, profile: Profile, policy: RetentionPolicy, started: float
+    ) -> str:
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(started))
+        wallet_id = profile.settings.get("wallet.id")
+        name = "-".join(filter(None, (policy.record_type, wallet_id, stamp)))
+        return os.path.join(self.archive_dir, f"{name}.jsonl.gz")
+
+    def _archive(self, path: str, entries: Sequence[dict]):
+        """Append archive entries to a compressed archive file."""
+        with gzip.open(path, "ab") as archive:
+            for entry in entries:
+                archive.write(json_codec.dumpb(entry))
+                archive.write(b"\n")
+
+    async def sweep_policy(
+        self, policy: RetentionPolicy, profile: Optional[Profile] = None
+    ) -> int:
+        """Delete the records selected by one policy.
+
+        Args:
+            policy: The retention policy to apply
+            profile: The profile holding the records, by default the base profile
+
+        Returns:
+            The number of records deleted
+
+        """
+        profile = profile or self.profile
+        started = time.time()
+        async with profile.session() as session:
+            record_ids = await policy.select(session, started)
+        archive_path = self.archive_dir and self._archive_path(profile, policy, started)
+
+        deleted = 0
+        for index in range(0, len(record_ids), self.batch_size):
+            batch = record_ids[index : index + self.batch_size]
+            batch_started = time.perf_counter()
+            async with profile.transaction() as txn:
+                # skip records which changed state since they were selected
+                records = [
+                    record
+                    for record in await policy.record_class.retrieve_by_ids(txn, batch)
+                    if record.state in policy.states
+                ]
+                entries = [
+                    {"type": record.RECORD_TYPE, "id": record._id, "value": record.value}
+                    for record in records
+                ]
+                for record in records:
+                    await policy.delete(txn, record)
+                await txn.commit()
+            if archive_path and entries:
+                # archive only what was deleted, without blocking the event loop
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._archive, archive_path, entries
+                )
+            deleted += len(records)
+            pause = len(batch) / self.rate - (time.perf_counter() - batch_started)
+            if pause > 0:
+                await asyncio.sleep(pause)
+
+        if deleted:
+            LOGGER.info(
+                "Retention sweep deleted %d %s records", deleted, policy.record_type
+            )
+        return deleted
+
+    async def _profiles(self) -> AsyncIterator[Profile]:
+        """Iterate over the base profile and the profile of each sub-wallet."""
+        yield self.profile
+        manager = self.profile.inject_or(BaseMultitenantManager)
+        if not manager:
+            return
+        async with self.profile.session() as session:
+            wallet_records = await WalletRecord.query(session)
+        for wallet_record in wallet_records:
+            try:
+                profile = await manager.get_wallet_profile(
+                    self.profile.context, wallet_record
+                )
+            except Exception:
+                LOGGER.exception(
+                    "Error opening wallet %s for retention", wallet_record.wallet_id
+                )
+                continue
+            yield profile
+
+    async def sweep(self) -> int:
+        """Apply every retention policy once, in every wallet.
+
+        Returns:
+            The number of records deleted
+
+        """
+        deleted = 0
+        async for profile in self._profiles():
+            for policy in self.policies:
+                try:
+                    deleted += await self.sweep_policy(policy, profile)
+                except Exception:
+                    LOGGER.exception(
+                        "Retention sweep failed for %s records in %s",
+                        policy.record_type,
+                        profile.name,
+                    )
+        return deleted
+
+    async def run(self):
+        """Sweep records until cancelled."""
+        while True:
+            await self.sweep()
+            await asyncio.sleep(self.interval)
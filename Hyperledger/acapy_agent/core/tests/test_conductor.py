@@ -179,6 +179,106 @@ class TestConductor(IsolatedAsyncioTestCase, Config, TestDIDs):
                 mock_inbound_mgr.return_value.stop.assert_awaited_once_with()
                 mock_outbound_mgr.return_value.stop.assert_awaited_once_with()
 
+    async def test_startup_cache_warmup(self):
+        builder: ContextBuilder = StubContextBuilder(
+            {**self.test_settings, "cache.warmup": True, "cache.warmup_timeout": 5}
+        )
+        conductor = test_module.Conductor(builder)
+
+        test_profile = await create_test_profile(None, await builder.build_context())
+
+        with (
+            mock.patch.object(
+                test_module,
+                "wallet_config",
+                return_value=(
+                    test_profile,
+                    DIDInfo("did", "verkey", metadata={}, method=SOV, key_type=ED25519),
+                ),
+            ),
+            mock.patch.object(
+                test_module, "InboundTransportManager", autospec=True
+            ) as mock_inbound_mgr,
+            mock.patch.object(
+                test_module, "OutboundTransportManager", autospec=True
+            ) as mock_outbound_mgr,
+            mock.patch.object(test_module, "LoggingConfigurator", autospec=True),
+            mock.patch.object(
+                test_module, "warm_up_cache", mock.CoroutineMock(return_value=0)
+            ) as mock_warm_up,
+        ):
+            await conductor.setup()
+            mock_inbound_mgr.return_value.registered_transports = {}
+            mock_outbound_mgr.return_value.registered_transports = {}
+
+            await conductor.start()
+            await conductor.warmup_task
+            mock_warm_up.assert_awaited_once_with(
+                test_profile,
+                connections=test_module.DEFAULT_WARMUP_CONNECTIONS,
+                concurrency=test_module.DEFAULT_WARMUP_CONCURRENCY,
+                timeout=5,
+            )
+            await conductor.stop()
+
+    async def test_startup_tag_backfill(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        conductor = test_module.Conductor(builder)
+
+        test_profile = await create_test_profile(None, await builder.build_context())
+
+        with (
+            mock.patch.object(
+                test_module,
+                "wallet_config",
+                return_value=(
+                    test_profile,
+                    DIDInfo("did", "verkey", metadata={}, method=SOV, key_type=ED25519),
+                ),
+            ),
+            mock.patch.object(
+                test_module, "InboundTransportManager", autospec=True
+            ) as mock_inbound_mgr,
+            mock.patch.object(
+                test_module, "OutboundTransportManager", autospec=True
+            ) as mock_outbound_mgr,
+            mock.patch.object(test_module, "LoggingConfigurator", autospec=True),
+            mock.patch.object(
+                test_module, "backfill_record_tags", mock.CoroutineMock(return_value=0)
+            ) as mock_backfill,
+        ):
+            await conductor.setup()
+            mock_inbound_mgr.return_value.registered_transports = {}
+            mock_outbound_mgr.return_value.registered_transports = {}
+
+            await conductor.start()
+            await conductor.tag_backfill_task
+            mock_backfill.assert_awaited_once_with(test_profile)
+            await conductor.stop()
+
+    async def test_backfill_wallet_tags_subwallets(self):
+        conductor = test_module.Conductor(StubContextBuilder(self.test_settings))
+        conductor.root_profile = await create_test_profile(
+            settings={"multitenant.enabled": True}
+        )
+        sub_profile = await create_test_profile()
+
+        with (
+            mock.patch.object(
+                test_module,
+                "get_subwallet_profiles_from_storage",
+                mock.CoroutineMock(return_value=[sub_profile]),
+            ),
+            mock.patch.object(
+                test_module, "backfill_record_tags", mock.CoroutineMock(return_value=0)
+            ) as mock_backfill,
+        ):
+            await conductor.backfill_wallet_tags()
+            assert [call.args[0] for call in mock_backfill.await_args_list] == [
+                conductor.root_profile,
+                sub_profile,
+            ]
+
     async def test_startup_version_no_upgrade_add_record(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings)
         conductor = test_module.Conductor(builder)
@@ -499,6 +599,9 @@ class TestConductor(IsolatedAsyncioTestCase, Config, TestDIDs):
                 mock.MagicMock(state=QueuedOutboundMessage.STATE_ENCODE),
                 mock.MagicMock(state=QueuedOutboundMessage.STATE_DELIVER),
             ]
+            mock_outbound_mgr.return_value.circuits = mock.MagicMock(
+                open_count=1, parked_count=2
+            )
             mock_outbound_mgr.return_value.registered_transports = {
                 "test": mock.MagicMock(schemes=["http"])
             }
@@ -518,6 +621,8 @@ class TestConductor(IsolatedAsyncioTestCase, Config, TestDIDs):
                     "task_pending",
                 ]
             )
+            assert stats["out_circuit_open"] == 1
+            assert stats["out_parked"] == 2
 
     async def test_inbound_message_handler(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings)
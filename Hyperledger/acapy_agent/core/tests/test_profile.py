@@ -1,8 +1,10 @@
+import asyncio
 from typing import Optional
-from unittest import IsolatedAsyncioTestCase
+from unittest import IsolatedAsyncioTestCase, mock
 
 from ...config.base import InjectionError
 from ...config.injection_context import InjectionContext
+from ...utils.testing import create_test_profile
 from ..error import ProfileSessionInactiveError
 from ..profile import Profile, ProfileManagerProvider, ProfileSession
 
@@ -55,6 +57,172 @@ class TestProfileSession(IsolatedAsyncioTestCase):
         await session2.rollback()
 
 
+class TestProfileSessionAfterCommit(IsolatedAsyncioTestCase):
+    async def test_after_commit(self):
+        calls = []
+
+        async def callback():
+            calls.append(True)
+
+        session = ProfileSession(MockProfile())
+        await session.after_commit(callback)
+        assert calls == [True]
+
+        with mock.patch.object(
+            ProfileSession, "is_transaction", mock.PropertyMock(return_value=True)
+        ):
+            calls.clear()
+            txn = await ProfileSession(MockProfile())
+            await txn.after_commit(callback)
+            assert calls == []
+            await txn.commit()
+            assert calls == [True]
+
+            calls.clear()
+            txn = await ProfileSession(MockProfile())
+            await txn.after_commit(callback)
+            await txn.rollback()
+            assert calls == []
+
+
+class TestSessionScope(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.profile = await create_test_profile()
+
+    async def test_shared_session(self):
+        async with self.profile.session_scope() as scope:
+            async with self.profile.session() as session:
+                assert session is scope.session
+                async with self.profile.session() as nested:
+                    assert nested is session
+            assert session.active
+            assert await self.profile.session() is session
+
+            other = self.profile.session(InjectionContext())
+            assert other is not session
+            async with self.profile.transaction() as txn:
+                assert txn is not session
+                assert txn.is_transaction
+
+            other_profile = await create_test_profile()
+            assert other_profile.session() is not session
+
+        assert not session.active
+        assert scope.session is None
+        async with self.profile.session() as after:
+            assert after is not session
+
+    async def test_nested_scope(self):
+        async with self.profile.session_scope() as outer:
+            async with self.profile.session() as outer_session:
+                async with self.profile.session_scope() as inner:
+                    async with self.profile.session() as session:
+                        assert session is inner.session
+                        assert session is not outer_session
+                assert not session.active
+                async with self.profile.session() as nested:
+                    assert nested is outer_session is outer.session
+            assert outer_session.active
+        assert not outer_session.active
+
+    async def test_transaction_not_shared(self):
+        async with self.profile.session_scope() as scope:
+            async with self.profile.session() as session:
+                assert not session.is_transaction
+            async with self.profile.transaction() as txn:
+                # transactions open their own session rather than the shared one
+                assert txn is not scope.session
+                assert txn.is_transaction
+                await txn.commit()
+            assert not txn.active
+            assert session.active
+            async with self.profile.transaction() as other:
+                assert other is not txn
+                assert other is not session
+                await other.commit()
+            assert self.profile.session() is session
+
+    async def test_concurrent_tasks(self):
+        async def use(delay):
+            async with self.profile.session() as session:
+                await asyncio.sleep(delay)
+                assert session.active
+            return session
+
+        async with self.profile.session_scope() as scope:
+            sessions = await asyncio.gather(*(use(i * 0.001) for i in range(5)))
+            assert all(session is scope.session for session in sessions)
+            assert scope.session.active
+        assert not sessions[0].active
+
+        # tasks in separate scopes do not share sessions
+        async def scoped():
+            async with self.profile.session_scope():
+                return await use(0)
+
+        first, second = await asyncio.gather(scoped(), scoped())
+        assert first is not second
+
+    async def test_background_task(self):
+        started = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def background():
+            async with self.profile.session() as session:
+                started.set()
+                await finish.wait()
+            return session
+
+        async with self.profile.session_scope() as scope:
+            task = asyncio.ensure_future(background())
+            await started.wait()
+            shared = scope.session
+        assert shared.active
+        finish.set()
+        assert await task is shared
+        assert not shared.active
+
+        # tasks outliving the scope open their own session
+        scope_closed = asyncio.Event()
+
+        async def late():
+            await scope_closed.wait()
+            async with self.profile.session() as session:
+                assert session.active
+            return session
+
+        async with self.profile.session_scope() as scope:
+            shared = self.profile.session()
+            task = asyncio.ensure_future(late())
+        scope_closed.set()
+        assert await task is not shared
+
+    async def test_lazy_session(self):
+        async with self.profile.session_scope() as scope:
+            # no connection is held until a session is requested
+            assert scope.session is None
+            shared = self.profile.session()
+            assert not shared.active
+
+            with mock.patch.object(
+                type(shared), "_setup", autospec=True, side_effect=type(shared)._setup
+            ) as mock_setup:
+
+                async def use():
+                    async with self.profile.session() as session:
+                        await asyncio.sleep(0)
+                    return session
+
+                assert await asyncio.gather(use(), use()) == [shared, shared]
+                mock_setup.assert_called_once()
+            assert shared.active
+        assert not shared.active
+
+        async with self.profile.session_scope() as scope:
+            pass
+        assert scope.session is None
+
+
 class TestProfileManagerProvider(IsolatedAsyncioTestCase):
     async def test_invalid_wallet_type(self):
         context = InjectionContext()
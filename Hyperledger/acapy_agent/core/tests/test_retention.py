@@ -0,0 +1,200 @@
+import gzip
+import json
+import os
+import time
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase
+
+from ...multitenant.base import BaseMultitenantManager
+from ...protocols.issue_credential.v2_0.models.cred_ex_record import V20CredExRecord
+from ...protocols.issue_credential.v2_0.models.detail.indy import V20CredExRecordIndy
+from ...tests import mock
+from ...utils.testing import create_test_profile
+from ...wallet.models.wallet_record import WalletRecord
+from .. import retention as test_module
+from ..retention import RetentionPolicy, RetentionSweeper
+
+
+class TestRetention(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.profile = await create_test_profile()
+
+    async def add_records(self, *specs):
+        records = []
+        async with self.profile.session() as session:
+            for connection_id, state in specs:
+                record = V20CredExRecord(connection_id=connection_id, state=state)
+                await record.save(session)
+                records.append(record)
+        return records
+
+    async def test_policy_from_config(self):
+        policy = RetentionPolicy.from_config(
+            V20CredExRecord.RECORD_TYPE, {"max_age": 60, "keep_last": 2}
+        )
+        assert policy.record_class is V20CredExRecord
+        assert V20CredExRecord.STATE_DONE in policy.states
+        assert policy.max_age == 60
+        assert policy.keep_last == 2
+        assert policy.group_by == "connection_id"
+
+        policy = RetentionPolicy.from_config(
+            V20CredExRecord.RECORD_TYPE, {"states": [V20CredExRecord.STATE_ABANDONED]}
+        )
+        assert policy.states == (V20CredExRecord.STATE_ABANDONED,)
+
+        with self.assertRaises(ValueError):
+            RetentionPolicy.from_config("unknown", {})
+        with self.assertRaises(ValueError):
+            RetentionPolicy(V20CredExRecord, ())
+
+    async def test_select(self):
+        done = V20CredExRecord.STATE_DONE
+        records = await self.add_records(
+            ("conn-a", done),
+            ("conn-a", done),
+            ("conn-a", done),
+            ("conn-a", V20CredExRecord.STATE_OFFER_SENT),
+            ("conn-b", done),
+        )
+
+        policy = RetentionPolicy.from_config(
+            V20CredExRecord.RECORD_TYPE, {"keep_last": 1}
+        )
+        async with self.profile.session() as session:
+            selected = await policy.select(session, time.time())
+        assert sorted(selected) == sorted(r.cred_ex_id for r in records[:2])
+
+        policy = RetentionPolicy.from_config(
+            V20CredExRecord.RECORD_TYPE, {"max_age": 3600}
+        )
+        async with self.profile.session() as session:
+            assert await policy.select(session, time.time()) == []
+            selected = await policy.select(session, time.time() + 7200)
+        assert len(selected) == 4
+
+    async def test_sweep(self):
+        done = V20CredExRecord.STATE_DONE
+        records = await self.add_records(
+            ("conn-a", done),
+            ("conn-a", done),
+            ("conn-a", V20CredExRecord.STATE_OFFER_SENT),
+        )
+        async with self.profile.session() as session:
+            await V20CredExRecordIndy(cred_ex_id=records[0].cred_ex_id).save(session)
+
+        with TemporaryDirectory() as archive_dir:
+            sweeper = RetentionSweeper(
+                self.profile,
+                [RetentionPolicy.from_config(V20CredExRecord.RECORD_TYPE, {})],
+                batch_size=1,
+                rate=1,
+                archive_dir=archive_dir,
+            )
+            with mock.patch.object(
+                test_module.asyncio, "sleep", mock.CoroutineMock()
+            ) as mock_sleep:
+                assert await sweeper.sweep() == 2
+            assert mock_sleep.await_count == 2
+
+            (archive_name,) = os.listdir(archive_dir)
+            assert archive_name.startswith(V20CredExRecord.RECORD_TYPE)
+            with gzip.open(os.path.join(archive_dir, archive_name), "rt") as archive:
+                lines = [json.loads(line) for line in archive]
+
+        assert sorted(line["id"] for line in lines) == sorted(
+            r.cred_ex_id for r in records[:2]
+        )
+        assert all(line["value"]["state"] == done for line in lines)
+
+        async with self.profile.session() as session:
+            remaining = await V20CredExRecord.query(session)
+            details = await V20CredExRecordIndy.query(session)
+        assert [r.cred_ex_id for r in remaining] == [records[2].cred_ex_id]
+        assert details == []
+
+    async def test_sweep_archives_after_commit(self):
+        await self.add_records(("conn-a", V20CredExRecord.STATE_DONE))
+        policy = RetentionPolicy.from_config(V20CredExRecord.RECORD_TYPE, {})
+
+        with TemporaryDirectory() as archive_dir:
+            sweeper = RetentionSweeper(self.profile, [policy], archive_dir=archive_dir)
+            with mock.patch.object(
+                policy, "delete", mock.CoroutineMock(side_effect=Exception("failed"))
+            ):
+                assert await sweeper.sweep() == 0
+            assert os.listdir(archive_dir) == []
+
+    async def test_sweep_subwallets(self):
+        subwallet = await create_test_profile(settings={"wallet.id": "sub-wallet-id"})
+        async with subwallet.session() as session:
+            await V20CredExRecord(
+                connection_id="conn-a", state=V20CredExRecord.STATE_DONE
+            ).save(session)
+        async with self.profile.session() as session:
+            await WalletRecord(
+                wallet_id="sub-wallet-id",
+                new_with_id=True,
+                key_management_mode=WalletRecord.MODE_MANAGED,
+                settings={},
+            ).save(session)
+        manager = mock.MagicMock(
+            BaseMultitenantManager,
+            get_wallet_profile=mock.CoroutineMock(return_value=subwallet),
+        )
+        self.profile.context.injector.bind_instance(BaseMultitenantManager, manager)
+        await self.add_records(("conn-a", V20CredExRecord.STATE_DONE))
+
+        with TemporaryDirectory() as archive_dir:
+            sweeper = RetentionSweeper(
+                self.profile,
+                [RetentionPolicy.from_config(V20CredExRecord.RECORD_TYPE, {})],
+                archive_dir=archive_dir,
+            )
+            assert await sweeper.sweep() == 2
+            archive_names = os.listdir(archive_dir)
+        assert len(archive_names) == 2
+        assert any("-sub-wallet-id-" in name for name in archive_names)
+        manager.get_wallet_profile.assert_awaited_once()
+
+        async with subwallet.session() as session:
+            assert await V20CredExRecord.query(session) == []
+
+    async def test_sweep_skips_changed_records(self):
+        (record,) = await self.add_records(("conn-a", V20CredExRecord.STATE_DONE))
+        policy = RetentionPolicy.from_config(V20CredExRecord.RECORD_TYPE, {})
+        sweeper = RetentionSweeper(self.profile, [policy])
+
+        async def select(session, now):
+            async with self.profile.session() as other:
+                changed = await V20CredExRecord.retrieve_by_id(other, record.cred_ex_id)
+                changed.state = V20CredExRecord.STATE_OFFER_SENT
+                await changed.save(other)
+            return [record.cred_ex_id]
+
+        with mock.patch.object(policy, "select", select):
+            assert await sweeper.sweep() == 0
+
+        async with self.profile.session() as session:
+            assert await V20CredExRecord.retrieve_by_id(session, record.cred_ex_id)
+
+    async def test_sweep_error(self):
+        policy = RetentionPolicy.from_config(V20CredExRecord.RECORD_TYPE, {})
+        sweeper = RetentionSweeper(self.profile, [policy])
+        with mock.patch.object(
+            policy, "select", mock.CoroutineMock(side_effect=Exception("failed"))
+        ):
+            assert await sweeper.sweep() == 0
+
+    async def test_from_settings(self):
+        assert RetentionSweeper.from_settings(self.profile) is None
+
+        self.profile.settings["retention.policies"] = {
+            V20CredExRecord.RECORD_TYPE: {"max_age": 60}
+        }
+        self.profile.settings["retention.batch_size"] = 10
+        sweeper = RetentionSweeper.from_settings(self.profile)
+        assert [p.record_class for p in sweeper.policies] == [V20CredExRecord]
+        assert sweeper.batch_size == 10
+        assert sweeper.interval == test_module.DEFAULT_RETENTION_INTERVAL
+        assert sweeper.archive_dir is None
@@ -348,6 +348,7 @@ class BaseLedger(ABC, metaclass=ABCMeta):
                     raise LedgerError(
                         "Failed to parse schema sequence number from ledger response"
                     ) from err
+                await self.clear_cache(schema_id)
             except LedgerTransactionError as e:
                 # Identify possible duplicate schema errors on indy-node < 1.9 and > 1.9
                 if (
@@ -371,6 +372,15 @@ class BaseLedger(ABC, metaclass=ABCMeta):
 
         return schema_id, schema_def
 
+    async def clear_cache(self, object_id: str):
+        """Clear cached lookup results for a ledger object, including not-found results.
+
+        Args:
+            object_id: The schema, credential definition or revocation registry
+                definition identifier
+
+        """
+
     @abstractmethod
     async def _create_schema_request(
         self,
@@ -530,6 +540,7 @@ class BaseLedger(ABC, metaclass=ABCMeta):
             )
             if not write_ledger:
                 return (credential_definition_id, {"signed_txn": resp}, novel)
+            await self.clear_cache(credential_definition_id)
 
         return (credential_definition_id, json.loads(credential_definition_json), novel)
 
@@ -674,6 +685,7 @@ class BaseLedger(ABC, metaclass=ABCMeta):
             if not write_ledger:
                 return schema_id, {"signed_txn": resp}
 
+            await self.clear_cache(schema_id)
             try:
                 # parse sequence number out of response
                 seq_no = json.loads(resp)["result"]["txnMetadata"]["seqNo"]
@@ -780,6 +792,7 @@ class BaseLedger(ABC, metaclass=ABCMeta):
         if not write_ledger:
             return (cred_def_id, {"signed_txn": resp})
 
+        await self.clear_cache(cred_def_id)
         seq_no = json.loads(resp)["result"]["txnMetadata"]["seqNo"]
         return seq_no
 
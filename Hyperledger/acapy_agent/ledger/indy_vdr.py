@@ -15,9 +15,17 @@ from typing import List, Optional, Tuple, Union
 
 from indy_vdr import Pool, Request, VdrError, ledger, open_pool
 
-from ..cache.base import BaseCache
+from ..cache.base import (
+    DEFAULT_NEGATIVE_TTL,
+    BaseCache,
+    is_negative_result,
+    negative_result,
+)
+from ..cache.sqlite import SqliteCache
+from ..cache.tiered import TieredCache
 from ..core.profile import Profile
 from ..messaging.valid import IndyDID
+from ..resolver.did_resolver import DIDResolver
 from ..storage.base import BaseStorage, StorageRecord
 from ..utils import sentinel
 from ..utils.env import storage_path
@@ -38,6 +46,13 @@ from .util import TAA_ACCEPTED_RECORD_TYPE
 
 LOGGER = logging.getLogger(__name__)
 
+# ledger objects which never change once written, kept by the persistent cache
+IMMUTABLE_CACHE_NAMESPACES = (
+    "schema",
+    "credential_definition",
+    "revocation_registry_definition",
+)
+
 
 def _normalize_txns(txns: str) -> str:
     """Normalize a set of genesis transactions."""
@@ -74,6 +89,7 @@ class IndyVdrLedgerPool:
         keepalive: int = 0,
         cache: Optional[BaseCache] = None,
         cache_duration: int = 600,
+        persistent_cache: bool = False,
         genesis_transactions: Optional[str] = None,
         read_only: bool = False,
         socks_proxy: Optional[str] = None,
@@ -85,6 +101,7 @@ class IndyVdrLedgerPool:
             keepalive: How many seconds to keep the ledger open
             cache: The cache instance to use
             cache_duration: The TTL for ledger cache entries
+            persistent_cache: Keep immutable ledger objects in an on-disk cache
             genesis_transactions: The ledger genesis transaction as a string
             read_only: Prevent any ledger write operations
             socks_proxy: Specifies socks proxy for ZMQ to connect to ledger pool
@@ -95,6 +112,7 @@ class IndyVdrLedgerPool:
         self.close_task: asyncio.Future = None
         self.cache = cache
         self.cache_duration: int = cache_duration
+        self.persistent_cache = persistent_cache
         self.handle: Optional[Pool] = None
         self.name = name
         self.cfg_path_cache: Optional[Path] = None
@@ -147,6 +165,7 @@ class IndyVdrLedgerPool:
                     "Pool ledger config '%s' is consistent, skipping write",
                     self.name,
                 )
+                self.genesis_txns_cache = genesis
                 return
             elif not recreate:
                 raise LedgerConfigError(
@@ -175,6 +194,18 @@ class IndyVdrLedgerPool:
         cfg_pool = self.cfg_path.joinpath(self.name)
         cfg_pool.mkdir(exist_ok=True)
 
+        if (
+            self.persistent_cache
+            and self.cache
+            and not isinstance(self.cache, TieredCache)
+        ):
+            objects_path = cfg_pool.joinpath(f"objects-{genesis_hash}.db")
+            self.cache = TieredCache(
+                self.cache,
+                SqliteCache(objects_path.as_posix()),
+                IMMUTABLE_CACHE_NAMESPACES,
+            )
+
         cache_path = cfg_pool.joinpath(f"cache-{genesis_hash}")
         try:
             txns = open(cache_path).read()
@@ -289,6 +320,34 @@ class IndyVdrLedger(BaseLedger):
                 return True
         return self.read_only
 
+    @property
+    def negative_cache_duration(self) -> int:
+        """Accessor for the TTL of cached not-found lookup results."""
+        return self.profile.settings.get("cache.negative_ttl", DEFAULT_NEGATIVE_TTL)
+
+    async def clear_cache(self, object_id: str):
+        """Clear cached lookup results for a ledger object, including not-found results.
+
+        Args:
+            object_id: The schema, credential definition or revocation registry
+                definition identifier
+
+        """
+        if self.pool.cache:
+            for namespace in IMMUTABLE_CACHE_NAMESPACES:
+                await self.pool.cache.clear(f"{namespace}::{object_id}")
+
+    async def _clear_did_cache(self, did: str):
+        """Clear cached resolution results for a DID written to the ledger.
+
+        Args:
+            did: The ledger DID, with or without the did:sov prefix
+
+        """
+        resolver = self.profile.inject_or(DIDResolver)
+        if resolver:
+            await resolver.clear_cache(self.profile, self.nym_to_did(did))
+
     async def __aenter__(self) -> "IndyVdrLedger":
         """Context manager entry.
 
@@ -443,12 +502,20 @@ class IndyVdrLedger(BaseLedger):
         if self.pool.cache:
             result = await self.pool.cache.get(f"schema::{schema_id}")
             if result:
-                return result
+                return None if is_negative_result(result) else result
 
         if schema_id.isdigit():
-            return await self.fetch_schema_by_seq_no(int(schema_id))
+            result = await self.fetch_schema_by_seq_no(int(schema_id))
         else:
-            return await self.fetch_schema_by_id(schema_id)
+            result = await self.fetch_schema_by_id(schema_id)
+
+        if not result and self.pool.cache and self.negative_cache_duration:
+            await self.pool.cache.set(
+                f"schema::{schema_id}",
+                negative_result(f"Schema {schema_id} not found"),
+                self.negative_cache_duration,
+            )
+        return result
 
     async def fetch_schema_by_id(self, schema_id: str) -> dict:
         """Get schema from ledger.
@@ -563,12 +630,22 @@ class IndyVdrLedger(BaseLedger):
             async with self.pool.cache.acquire(cache_key) as entry:
                 if entry.result:
                     result = entry.result
+                    if is_negative_result(result):
+                        result = None
                 else:
                     result = await self.fetch_credential_definition(
                         credential_definition_id
                     )
                     if result:
                         await entry.set_result(result, self.pool.cache_duration)
+                    elif self.negative_cache_duration:
+                        await entry.set_result(
+                            negative_result(
+                                f"Credential definition {credential_definition_id} "
+                                "not found"
+                            ),
+                            self.negative_cache_duration,
+                        )
                 return result
 
         return await self.fetch_credential_definition(credential_definition_id)
@@ -780,6 +857,7 @@ class IndyVdrLedger(BaseLedger):
                 raise LedgerError("Exception when building attribute request") from err
 
             await self._submit(attrib_req, True, True)
+            await self._clear_did_cache(did)
             return True
         return False
 
@@ -824,6 +902,7 @@ class IndyVdrLedger(BaseLedger):
         )
         if not write_ledger:
             return True, {"signed_txn": resp}
+        await self._clear_did_cache(did)
         async with self.profile.session() as session:
             wallet = session.inject(BaseWallet)
             try:
@@ -1000,27 +1079,50 @@ class IndyVdrLedger(BaseLedger):
     async def get_latest_txn_author_acceptance(self) -> dict:
         """Look up the latest TAA acceptance."""
         cache_key = TAA_ACCEPTED_RECORD_TYPE + "::" + self.profile.name
-        acceptance = self.pool.cache and await self.pool.cache.get(cache_key)
-        if not acceptance:
-            tag_filter = {"pool_name": self.pool_name}
-            async with self.profile.session() as session:
-                storage = session.inject(BaseStorage)
-                cache = self.profile.inject_or(BaseCache)
-                found = await storage.find_all_records(
-                    TAA_ACCEPTED_RECORD_TYPE, tag_filter
-                )
-            if found:
-                records = [json.loads(record.value) for record in found]
-                records.sort(key=lambda v: v["time"], reverse=True)
-                acceptance = records[0]
-            else:
-                acceptance = {}
-            if cache:
-                await cache.set(cache_key, acceptance, self.pool.cache_duration)
+        if not self.pool.cache:
+            return await self.fetch_latest_txn_author_acceptance()
+        async with self.pool.cache.acquire(cache_key) as entry:
+            if entry.result:
+                if entry.refresh_due:
+                    entry.refresh(
+                        self.fetch_latest_txn_author_acceptance,
+                        self.pool.cache_duration,
+                    )
+                return entry.result
+            acceptance = await self.fetch_latest_txn_author_acceptance()
+            await entry.set_result(
+                acceptance, self.pool.cache_duration, refresh_ahead=True
+            )
         return acceptance
 
+    async def fetch_latest_txn_author_acceptance(self) -> dict:
+        """Fetch the latest TAA acceptance from storage."""
+        tag_filter = {"pool_name": self.pool_name}
+        async with self.profile.session() as session:
+            storage = session.inject(BaseStorage)
+            found = await storage.find_all_records(TAA_ACCEPTED_RECORD_TYPE, tag_filter)
+        if not found:
+            return {}
+        records = [json.loads(record.value) for record in found]
+        records.sort(key=lambda v: v["time"], reverse=True)
+        return records[0]
+
     async def get_revoc_reg_def(self, revoc_reg_id: str) -> dict:
-        """Get revocation registry definition by ID."""
+        """Get revocation registry definition by ID, from the cache if available."""
+        if self.pool.cache:
+            cache_key = f"revocation_registry_definition::{revoc_reg_id}"
+            async with self.pool.cache.acquire(cache_key) as entry:
+                if entry.result:
+                    result = entry.result
+                else:
+                    result = await self.fetch_revoc_reg_def(revoc_reg_id)
+                    await entry.set_result(result, self.pool.cache_duration)
+                return result
+
+        return await self.fetch_revoc_reg_def(revoc_reg_id)
+
+    async def fetch_revoc_reg_def(self, revoc_reg_id: str) -> dict:
+        """Get revocation registry definition by ID from the ledger."""
         public_info = await self.get_wallet_public_did()
         try:
             fetch_req = ledger.build_get_revoc_reg_def_request(
@@ -58,6 +58,7 @@ class MultiIndyLedgerManagerProvider(BaseProvider):
                 ledger_config_list = settings.get_value("ledger.ledger_config_list")
                 ledger_endorser_map = {}
                 write_ledgers = set()
+                persistent_cache = bool(settings.get_value("ledger.persistent_cache"))
                 for config in ledger_config_list:
                     keepalive = config.get("keepalive")
                     read_only = config.get("read_only")
@@ -74,6 +75,7 @@ class MultiIndyLedgerManagerProvider(BaseProvider):
                         pool_name,
                         keepalive=keepalive,
                         cache=cache,
+                        persistent_cache=persistent_cache,
                         genesis_transactions=genesis_transactions,
                         read_only=read_only,
                         socks_proxy=socks_proxy,
@@ -4,9 +4,12 @@ import indy_vdr
 import pytest
 
 from ...anoncreds.default.legacy_indy.registry import LegacyIndyRegistry
-from ...cache.base import BaseCache
+from ...cache.base import BaseCache, negative_result
 from ...cache.in_memory import InMemoryCache
+from ...cache.tiered import TieredCache
 from ...indy.issuer import IndyIssuer
+from ...resolver.base import did_cache_tag
+from ...resolver.did_resolver import DIDResolver
 from ...tests import mock
 from ...utils.testing import create_test_profile
 from ...wallet.base import BaseWallet
@@ -14,6 +17,7 @@ from ...wallet.did_info import DIDInfo
 from ...wallet.did_method import SOV, DIDMethod, DIDMethods, HolderDefinedDid
 from ...wallet.did_posture import DIDPosture
 from ...wallet.key_type import ED25519, KeyTypes
+from .. import indy_vdr as test_module
 from ..endpoint_type import EndpointType
 from ..indy_vdr import (
     BadLedgerRequestError,
@@ -169,6 +173,37 @@ class TestIndyVdrLedger:
                 mechanism="manual",
             )
 
+    @pytest.mark.asyncio
+    async def test_get_latest_txn_author_acceptance_refresh_ahead(
+        self,
+        ledger: IndyVdrLedger,
+    ):
+        ledger.pool.cache = InMemoryCache()
+        ledger.pool.cache.enable_refresh_ahead(1, grace=60)
+        taa_record = {
+            "text": "txt",
+            "version": "ver",
+            "digest": ledger.taa_digest("ver", "txt"),
+        }
+        await ledger.accept_txn_author_agreement(
+            taa_record, mechanism="manual", accept_time=1000
+        )
+        cache_key = "taa_accepted::" + ledger.profile.name
+        await ledger.pool.cache.clear(cache_key)
+
+        acceptance = await ledger.get_latest_txn_author_acceptance()
+        assert acceptance["time"] == 1000
+
+        await ledger.accept_txn_author_agreement(
+            taa_record, mechanism="manual", accept_time=2000
+        )
+        await ledger.pool.cache.clear(cache_key)
+        await ledger.pool.cache.set_refreshable(cache_key, acceptance, 600)
+        # the cached acceptance is served while it is refreshed in the background
+        assert (await ledger.get_latest_txn_author_acceptance())["time"] == 1000
+        await ledger.pool.cache._refresh_tasks[cache_key]
+        assert (await ledger.pool.cache.get(cache_key))["time"] == 2000
+
     @pytest.mark.asyncio
     async def test_submit_unsigned(
         self,
@@ -448,6 +483,23 @@ class TestIndyVdrLedger:
             result = await ledger.get_schema("55GkHamhTU1ZbTbV2ab9DE:2:schema_name:9.1")
             assert result is None
 
+    @pytest.mark.asyncio
+    async def test_get_schema_not_found_cached(
+        self,
+        ledger: IndyVdrLedger,
+    ):
+        ledger.pool.cache = InMemoryCache()
+        schema_id = "55GkHamhTU1ZbTbV2ab9DE:2:schema_name:9.1"
+        async with ledger:
+            ledger.pool_handle.submit_request.return_value = {}
+            assert await ledger.get_schema(schema_id) is None
+            assert await ledger.get_schema(schema_id) is None
+            ledger.pool_handle.submit_request.assert_called_once()
+
+            await ledger.clear_cache(schema_id)
+            assert await ledger.get_schema(schema_id) is None
+            assert ledger.pool_handle.submit_request.call_count == 2
+
     @pytest.mark.asyncio
     async def test_send_credential_definition(
         self,
@@ -584,6 +636,34 @@ class TestIndyVdrLedger:
             )
             assert result is None
 
+    @pytest.mark.asyncio
+    async def test_get_credential_definition_not_found_cached(
+        self,
+        ledger: IndyVdrLedger,
+    ):
+        ledger.pool.cache = InMemoryCache()
+        ledger.profile.settings["cache.negative_ttl"] = 5
+        cred_def_id = "55GkHamhTU1ZbTbV2ab9DE:3:CL:99:tag"
+        async with ledger:
+            ledger.pool_handle.submit_request.return_value = {
+                "seqNo": 99,
+                "ref": "schema-id",
+                "signature_type": "CL",
+                "tag": "tag",
+                "origin": "origin-did",
+                "data": None,
+            }
+
+            assert await ledger.get_credential_definition(cred_def_id) is None
+            assert await ledger.get_credential_definition(cred_def_id) is None
+            ledger.pool_handle.submit_request.assert_called_once()
+
+            ledger.profile.settings["cache.negative_ttl"] = 0
+            await ledger.clear_cache(cred_def_id)
+            assert await ledger.get_credential_definition(cred_def_id) is None
+            assert await ledger.get_credential_definition(cred_def_id) is None
+            assert ledger.pool_handle.submit_request.call_count == 3
+
     @pytest.mark.asyncio
     async def test_get_key_for_did(
         self,
@@ -859,6 +939,23 @@ class TestIndyVdrLedger:
         async with ledger:
             await ledger.register_nym("55GkHamhTU1ZbTbV2ab9DE", "verkey")
 
+    @pytest.mark.asyncio
+    async def test_register_nym_clears_did_cache(
+        self,
+        ledger: IndyVdrLedger,
+    ):
+        ledger.profile.context.injector.bind_instance(DIDResolver, DIDResolver())
+        cache = ledger.profile.inject(BaseCache)
+        cache_key = "resolver::test::did:sov:55GkHamhTU1ZbTbV2ab9DE"
+        await cache.set(cache_key, negative_result("not found"))
+        await cache.tag(cache_key, [did_cache_tag("did:sov:55GkHamhTU1ZbTbV2ab9DE")])
+        async with ledger.profile.session() as session:
+            wallet = session.inject(BaseWallet)
+            await wallet.create_public_did(SOV, ED25519)
+        async with ledger:
+            await ledger.register_nym("55GkHamhTU1ZbTbV2ab9DE", "verkey")
+        assert await cache.get(cache_key) is None
+
     @pytest.mark.asyncio
     async def test_register_nym_no_public(
         self,
@@ -941,6 +1038,26 @@ class TestIndyVdrLedger:
             assert result["id"] == reg_id
             assert result["txnTime"] == 1234567890
 
+    @pytest.mark.asyncio
+    async def test_get_revoc_reg_def_cached(
+        self,
+        ledger: IndyVdrLedger,
+    ):
+        ledger.pool.cache = InMemoryCache()
+        async with ledger:
+            reg_id = (
+                "55GkHamhTU1ZbTbV2ab9DE:4:55GkHamhTU1ZbTbV2ab9DE:3:CL:99:tag:CL_ACCUM:0"
+            )
+            ledger.pool_handle.submit_request.return_value = {
+                "data": {"id": reg_id},
+                "txnTime": 1234567890,
+            }
+            result = await ledger.get_revoc_reg_def(reg_id)
+            assert result["id"] == reg_id
+            result = await ledger.get_revoc_reg_def(reg_id)
+            assert result["id"] == reg_id
+            ledger.pool_handle.submit_request.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_get_revoc_reg_entry(
         self,
@@ -1265,3 +1382,46 @@ class TestIndyVdrLedger:
             ):
                 ledger.profile.context.injector.bind_instance(DIDMethods, DIDMethods())
                 await ledger.rotate_public_did_keypair()
+
+
+@pytest.mark.indy_vdr
+class TestIndyVdrLedgerPool:
+    @pytest.mark.asyncio
+    async def test_open_persistent_cache(self, tmp_path):
+        cache = InMemoryCache()
+        pool = IndyVdrLedgerPool(
+            "test-ledger",
+            cache=cache,
+            persistent_cache=True,
+            genesis_transactions="{}",
+        )
+        pool.cfg_path_cache = tmp_path
+        handle = mock.MagicMock(indy_vdr.Pool)
+        handle.get_transactions = mock.CoroutineMock(return_value="{}")
+
+        with mock.patch.object(
+            test_module, "open_pool", mock.CoroutineMock(return_value=handle)
+        ):
+            await pool.open()
+            assert isinstance(pool.cache, TieredCache)
+            assert pool.cache.primary is cache
+            await pool.open()
+            assert pool.cache.primary is cache
+
+        await pool.cache.set("schema::1", {"id": "1"}, 600)
+        await pool.cache.set("taa_accepted::test", {"text": "taa"}, 600)
+        await cache.flush()
+
+        reopened = IndyVdrLedgerPool(
+            "test-ledger",
+            cache=cache,
+            persistent_cache=True,
+            genesis_transactions="{}",
+        )
+        reopened.cfg_path_cache = tmp_path
+        with mock.patch.object(
+            test_module, "open_pool", mock.CoroutineMock(return_value=handle)
+        ):
+            await reopened.open()
+        assert await reopened.cache.get("schema::1") == {"id": "1"}
+        assert await reopened.cache.get("taa_accepted::test") is None
@@ -1,20 +1,70 @@
 """Base classes for Models and Schemas."""
 
-import json
 import logging
 from abc import ABC
-from collections import namedtuple
-from typing import Mapping, Optional, Type, TypeVar, Union, cast, overload
+from typing import Any, Callable, Mapping, Optional, Type, TypeVar, Union, cast, overload
 
 from marshmallow import EXCLUDE, Schema, ValidationError, post_dump, post_load, pre_load
 from typing_extensions import Literal
 
 from ...core.error import BaseError
+from ...utils import json_codec
 from ...utils.classloader import ClassLoader
 
 LOGGER = logging.getLogger(__name__)
 
-SerDe = namedtuple("SerDe", "ser de")
+
+class SerDe:
+    """Serialized and deserialized views of a model.
+
+    When created from the serialized view, the model is only deserialized once
+    the `de` view is first accessed.
+    """
+
+    __slots__ = ("ser", "_de", "_deserialize")
+
+    def __init__(
+        self,
+        ser: Mapping,
+        de: Optional["BaseModel"] = None,
+        *,
+        deserialize: Optional[Callable[[Mapping], "BaseModel"]] = None,
+    ):
+        """Initialize a `SerDe` instance.
+
+        Args:
+            ser: The serialized view
+            de: The deserialized view, if available
+            deserialize: Called to deserialize the serialized view on first access
+        """
+        self.ser = ser
+        self._de = de
+        self._deserialize = deserialize
+
+    @property
+    def de(self) -> "BaseModel":
+        """Accessor for the deserialized view."""
+        if self._deserialize:
+            self._de = self._deserialize(self.ser)
+            self._deserialize = None
+        return self._de
+
+    @property
+    def deserialized(self) -> bool:
+        """Whether the deserialized view was created or accessed."""
+        return self._deserialize is None
+
+    def __iter__(self):
+        """Unpack as a `(ser, de)` pair."""
+        return iter((self.ser, self.de))
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare the serialized views."""
+        return isinstance(other, SerDe) and self.ser == other.ser
+
+    def __repr__(self) -> str:
+        """Human readable representation of this instance."""
+        return f"SerDe(ser={self.ser!r})"
 
 
 def resolve_class(the_cls, relative_cls: Optional[type] = None) -> type:
@@ -248,14 +298,17 @@ class BaseModel(ABC):
 
     @classmethod
     def serde(cls, obj: Union["BaseModel", Mapping, None]) -> Optional[SerDe]:
-        """Return serialized, deserialized representations of input object."""
+        """Return serialized, deserialized representations of input object.
+
+        The deserialized representation of a mapping is only built when accessed.
+        """
         if obj is None:
             return None
 
         if isinstance(obj, BaseModel):
             return SerDe(obj.serialize(), obj)
 
-        return SerDe(obj, cls.deserialize(obj))
+        return SerDe(obj, deserialize=cls.deserialize)
 
     def validate(self, unknown: Optional[str] = None):
         """Validate a constructed model."""
@@ -282,7 +335,7 @@ class BaseModel(ABC):
 
         """
         try:
-            parsed = json.loads(json_repr)
+            parsed = json_codec.loads(json_repr)
         except ValueError as e:
             LOGGER.exception(f"{cls.__name__} message parse error:")
             raise BaseModelError(f"{cls.__name__} JSON parsing failed") from e
@@ -295,7 +348,7 @@ class BaseModel(ABC):
             A JSON representation of this message
 
         """
-        return json.dumps(self.serialize(unknown=unknown))
+        return json_codec.dumps(self.serialize(unknown=unknown))
 
     def __repr__(self) -> str:
         """Return a human readable representation of this class.
@@ -1,33 +1,64 @@
 """Classes for BaseStorage-based record management."""
 
+import binascii
 import json
 import logging
 import sys
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from datetime import datetime
-from typing import Any, Mapping, Optional, Sequence, Type, TypeVar, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
-from marshmallow import fields
+from marshmallow import fields, missing, post_dump
 from uuid_utils import uuid4
 
 from ...cache.base import BaseCache
 from ...config.settings import BaseSettings
-from ...core.profile import ProfileSession
+from ...core.profile import Profile, ProfileSession
 from ...storage.base import (
     DEFAULT_PAGE_SIZE,
+    SORT_KEY_TAG,
     BaseStorage,
+    BaseStorageSearch,
     StorageDuplicateError,
     StorageNotFoundError,
 )
 from ...storage.record import StorageRecord
-from ..util import datetime_to_str, time_now
+from ...utils import json_codec
+from ..util import datetime_to_str, str_to_datetime, time_now
 from ..valid import ISO8601_DATETIME_EXAMPLE, ISO8601_DATETIME_VALIDATE
-from .base import BaseModel, BaseModelError, BaseModelSchema
+from .base import BaseModel, BaseModelError, BaseModelSchema, SerDe
 
 LOGGER = logging.getLogger(__name__)
 
 
 RecordType = TypeVar("RecordType", bound="BaseRecord")
 
+# marks the record types whose filter tags and sort keys have been back-filled
+RECORD_TYPE_TAG_BACKFILL = "acapy_tag_backfill"
+
+
+def encode_cursor(sort_key: str) -> str:
+    """Encode a record sort key as an opaque pagination cursor."""
+    return urlsafe_b64encode(sort_key.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Decode a pagination cursor into the record sort key it encodes."""
+    try:
+        return urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as err:
+        raise BaseModelError("Invalid pagination cursor") from err
+
 
 def match_post_filter(
     record: dict,
@@ -75,12 +106,19 @@ class BaseRecord(BaseModel):
         """BaseRecord metadata."""
 
     DEFAULT_CACHE_TTL = 60
+    # opt in to caching the records read by `retrieve_by_id` for this many seconds,
+    # when the `cache.records` setting is enabled; cache backends may write to
+    # disk, so not for records holding secrets
+    RETRIEVE_CACHE_TTL: Optional[int] = None
     RECORD_ID_NAME = "id"
     RECORD_TYPE = None
     RECORD_TOPIC: Optional[str] = None
     EVENT_NAMESPACE: str = "acapy::record"
     LOG_STATE_FLAG = None
     TAG_NAMES = {"state"}
+    # value fields also stored as tags, so that post-filters on them can run as
+    # tag queries once existing records have been back-filled
+    FILTER_TAG_NAMES = set()
     STATE_DELETED = "deleted"
 
     def __init__(
@@ -102,6 +140,7 @@ class BaseRecord(BaseModel):
         self._id = id
         self._last_state = state
         self._new_with_id = new_with_id
+        self._snapshot: Optional[int] = None
         self.state = state
         self.created_at = datetime_to_str(created_at)
         self.updated_at = datetime_to_str(updated_at)
@@ -121,20 +160,67 @@ class BaseRecord(BaseModel):
         params[record_id_name] = record_id
         return cls(**params)
 
+    @classmethod
+    def from_storage_record(
+        cls: Type[RecordType], record: StorageRecord, vals: Mapping[str, Any]
+    ) -> RecordType:
+        """Initialize a record loaded from storage, tracking later changes.
+
+        Args:
+            record: The stored record
+            vals: The decoded value of the stored record
+        """
+        result = cls.from_storage(record.id, vals)
+        result._snapshot = cls._fingerprint(record)
+        return result
+
+    @staticmethod
+    def _fingerprint(record: StorageRecord) -> int:
+        """Hash the stored value and tags of a record."""
+        return hash((record.value, frozenset(record.tags.items())))
+
+    @property
+    def is_dirty(self) -> bool:
+        """Whether the record differs from its stored value and tags.
+
+        Records which were not loaded from or saved to storage are always dirty.
+        """
+        return self._snapshot is None or (
+            self._fingerprint(self.storage_record) != self._snapshot
+        )
+
     @classmethod
     def get_tag_map(cls) -> Mapping[str, str]:
         """Accessor for the set of defined tags."""
 
-        return {tag.lstrip("~"): tag for tag in cls.TAG_NAMES or ()}
+        return {
+            tag.lstrip("~"): tag
+            for tag in (*(cls.TAG_NAMES or ()), *cls.FILTER_TAG_NAMES)
+        }
 
     @property
     def storage_record(self) -> StorageRecord:
         """Accessor for a `StorageRecord` representing this record."""
 
+        tags = self.tags
+        sort_key = self.sort_key
+        if sort_key:
+            tags = {**tags, SORT_KEY_TAG: sort_key}
         return StorageRecord(
-            self.RECORD_TYPE, json.dumps(self.value), self.tags, self._id
+            self.RECORD_TYPE, json_codec.dumps(self.value), tags, self._id
         )
 
+    @property
+    def sort_key(self) -> Optional[str]:
+        """Accessor for the key ordering this record for keyset pagination.
+
+        Records are ordered by creation time, then by record identifier.
+        """
+        if not (self._id and self.created_at):
+            return None
+        created_at = str_to_datetime(self.created_at)
+        return f"{created_at:%Y%m%d%H%M%S%f}:{self._id}"
+
     @property
     def record_value(self) -> dict:
         """Accessor to define custom properties for the JSON record value."""
@@ -215,6 +301,42 @@ class BaseRecord(BaseModel):
         if cache:
             await cache.clear(cache_key)
 
+    @classmethod
+    async def clear_cached_tag(cls, session: ProfileSession, cache_tag: str):
+        """Shortcut method to clear all cached values associated with a tag.
+
+        Args:
+            session: The profile session to use
+            cache_tag: The cache tag to invalidate
+        """
+
+        if not cache_tag:
+            return
+        cache = session.inject_or(BaseCache)
+        if cache:
+            await cache.clear_tag(cache_tag)
+
+    @classmethod
+    def _retrieve_cache(cls, session: ProfileSession) -> Optional[BaseCache]:
+        """Get the cache holding records read by `retrieve_by_id`, if enabled."""
+        if not (cls.RETRIEVE_CACHE_TTL and session.settings.get_value("cache.records")):
+            return None
+        return session.inject_or(BaseCache)
+
+    @classmethod
+    def _version_cache_key(cls, session: ProfileSession, record_id: str) -> str:
+        """Get the cache key holding the current version of a record."""
+        return f"record_version::{session.profile.name}::{cls.RECORD_TYPE}::{record_id}"
+
+    async def _bump_cached_version(self, session: ProfileSession):
+        """Invalidate cached copies of this record once the update is committed."""
+        cache = self._retrieve_cache(session)
+        if cache and self._id:
+            key = self._version_cache_key(session, self._id)
+            await session.after_commit(
+                lambda: cache.set(key, uuid4().hex, self.RETRIEVE_CACHE_TTL)
+            )
+
     @classmethod
     async def retrieve_by_id(
         cls: Type[RecordType],
@@ -225,18 +347,69 @@ class BaseRecord(BaseModel):
     ) -> RecordType:
         """Retrieve a stored record by ID.
 
+        For record types setting `RETRIEVE_CACHE_TTL`, and if the `cache.records`
+        setting is enabled, records read outside of a transaction and without
+        `for_update` are cached. Cached copies are
+        stored under a version which `save` and `delete_record` replace, so a
+        copy read before an update is never returned after it.
+
         Args:
             session: The profile session to use
             record_id: The ID of the record to find
             for_update: Whether to lock the record for update
         """
 
+        cache = None
+        if not (for_update or session.is_transaction):
+            cache = cls._retrieve_cache(session)
+        if cache:
+            version_key = cls._version_cache_key(session, record_id)
+            version = await cache.get(version_key)
+            if not version:
+                # set the version before reading, so that an update committed
+                # after the read replaces it
+                version = uuid4().hex
+                await cache.set(version_key, version, cls.RETRIEVE_CACHE_TTL)
+            cache_key = f"{version_key}::{version}"
+            cached = await cache.get(cache_key)
+            if cached:
+                result = StorageRecord(
+                    cls.RECORD_TYPE, cached["value"], cached["tags"], record_id
+                )
+                return cls.from_storage_record(result, json_codec.loads(result.value))
+
         storage = session.inject(BaseStorage)
         result = await storage.get_record(
             cls.RECORD_TYPE, record_id, options={"forUpdate": for_update}
         )
-        vals = json.loads(result.value)
-        return cls.from_storage(record_id, vals)
+        vals = json_codec.loads(result.value)
+        if cache:
+            await cache.set(
+                cache_key,
+                {"value": result.value, "tags": result.tags},
+                cls.RETRIEVE_CACHE_TTL,
+            )
+        return cls.from_storage_record(result, vals)
+
+    @classmethod
+    async def retrieve_by_ids(
+        cls: Type[RecordType],
+        session: ProfileSession,
+        record_ids: Sequence[str],
+    ) -> Sequence[RecordType]:
+        """Retrieve several stored records by ID.
+
+        Records are returned in the order of `record_ids`. IDs without a stored
+        record are skipped.
+
+        Args:
+            session: The profile session to use
+            record_ids: The IDs of the records to find
+        """
+
+        storage = session.inject(BaseStorage)
+        rows = await storage.get_records(cls.RECORD_TYPE, record_ids)
+        return [cls.from_storage_record(row, json_codec.loads(row.value)) for row in rows]
 
     @classmethod
     async def retrieve_by_tag_filter(
@@ -266,7 +439,7 @@ class BaseRecord(BaseModel):
         )
         found = None
         for record in rows:
-            vals = json.loads(record.value)
+            vals = json_codec.loads(record.value)
             if match_post_filter(vals, post_filter, alt=False):
                 if found:
                     raise StorageDuplicateError(
@@ -276,7 +449,7 @@ class BaseRecord(BaseModel):
                             f", {post_filter}" if post_filter else "",
                         )
                     )
-                found = cls.from_storage(record.id, vals)
+                found = cls.from_storage_record(record, vals)
         if not found:
             raise StorageNotFoundError(
                 "{} record not found for {}{}".format(
@@ -285,6 +458,158 @@ class BaseRecord(BaseModel):
             )
         return found
 
+    @classmethod
+    async def _backfilled_tag_names(cls, storage: BaseStorage) -> set:
+        """Get the names of the tags back-filled on existing records."""
+        try:
+            record = await storage.get_record(RECORD_TYPE_TAG_BACKFILL, cls.RECORD_TYPE)
+        except StorageNotFoundError:
+            return set()
+        return set(json_codec.loads(record.value))
+
+    @classmethod
+    async def filter_tags_backfilled(cls, storage: BaseStorage) -> bool:
+        """Check whether existing records carry all of the declared filter tags."""
+        if not cls.FILTER_TAG_NAMES:
+            return True
+        return await cls._backfilled_tag_names(storage) >= set(cls.FILTER_TAG_NAMES)
+
+    @classmethod
+    async def _push_down_post_filter(
+        cls,
+        session: ProfileSession,
+        tag_query: Optional[dict],
+        post_filter: Optional[dict],
+        alt: bool,
+    ) -> Tuple[Optional[dict], Optional[dict]]:
+        """Move positive post-filter clauses on tagged fields into the tag query.
+
+        Clauses on declared filter tags are only moved once existing records have
+        been back-filled, and only if the `wallet.filter_tag_queries` setting is
+        enabled: agent processes running an earlier version save records without
+        these tags, and such records would not match the tag query.
+
+        Returns:
+            The combined tag query, and the post-filter clauses left to apply
+
+        """
+        if not post_filter:
+            return tag_query, post_filter
+
+        tag_map = cls.get_tag_map()
+        backfilled = None
+        clauses = {}
+        remaining = {}
+        for key, value in post_filter.items():
+            tag = tag_map.get(key)
+            if alt:
+                # with alt, a string value is matched as a substring
+                values = list(value) if isinstance(value, (list, tuple, set)) else []
+            else:
+                values = [value]
+            pushable = (
+                tag and values and all(val and isinstance(val, str) for val in values)
+            )
+            if pushable and tag in cls.FILTER_TAG_NAMES:
+                if backfilled is None:
+                    backfilled = False
+                    if session.settings.get_value("wallet.filter_tag_queries"):
+                        storage = session.inject(BaseStorage)
+                        backfilled = await cls.filter_tags_backfilled(storage)
+                pushable = backfilled
+            if pushable:
+                clauses[tag] = {"$in": values} if alt else value
+            else:
+                remaining[key] = value
+
+        if clauses:
+            tag_query = {"$and": [tag_query, clauses]} if tag_query else clauses
+        return tag_query, remaining
+
+    @classmethod
+    async def _backfill_tags_page(cls, profile: Profile, record_ids: Sequence[str]):
+        """Rewrite the tags of a page of records in a single transaction."""
+        updated = 0
+        async with profile.transaction() as txn:
+            storage = txn.inject(BaseStorage)
+            for record_id in record_ids:
+                try:
+                    row = await storage.get_record(
+                        cls.RECORD_TYPE, record_id, {"forUpdate": True}
+                    )
+                except StorageNotFoundError:
+                    continue
+                try:
+                    record = cls.from_storage(row.id, json_codec.loads(row.value))
+                    tags = record.storage_record.tags
+                except (BaseModelError, json.JSONDecodeError, TypeError, ValueError):
+                    LOGGER.warning(
+                        "Cannot back-fill tags for %s record %s",
+                        cls.RECORD_TYPE,
+                        record_id,
+                    )
+                    continue
+                if tags != row.tags:
+                    await storage.update_record(row, row.value, tags)
+                    await record._bump_cached_version(txn)
+                    updated += 1
+            await txn.commit()
+        return updated
+
+    @classmethod
+    async def backfill_tags(
+        cls, profile: Profile, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> int:
+        """Add the sort key and declared filter tags to records stored without them.
+
+        Records are updated a page at a time, each page in its own transaction so
+        that concurrent updates to a record are not overwritten. Once every record
+        has been checked, and if the `wallet.filter_tag_queries` setting is
+        enabled, queries start matching post-filters on the filter tag fields
+        using tags. Records stored without a sort key are not returned by
+        `query_page` until they have been back-filled.
+
+        Args:
+            profile: The profile holding the records
+            page_size: The number of records to update in each transaction
+
+        Returns:
+            The number of records updated
+
+        """
+        tag_names = {*cls.FILTER_TAG_NAMES, SORT_KEY_TAG}
+        async with profile.session() as session:
+            storage = session.inject(BaseStorage)
+            if await cls._backfilled_tag_names(storage) >= tag_names:
+                return 0
+
+        updated = 0
+        search = profile.inject(BaseStorageSearch).search_records(
+            cls.RECORD_TYPE, page_size=page_size
+        )
+        try:
+            while True:
+                record_ids = [row.id for row in await search.fetch(page_size)]
+                if not record_ids:
+                    break
+                updated += await cls._backfill_tags_page(profile, record_ids)
+        finally:
+            await search.close()
+
+        async with profile.session() as session:
+            storage = session.inject(BaseStorage)
+            marker = json_codec.dumps(sorted(tag_names))
+            try:
+                record = await storage.get_record(
+                    RECORD_TYPE_TAG_BACKFILL, cls.RECORD_TYPE
+                )
+                await storage.update_record(record, marker, {})
+            except StorageNotFoundError:
+                await storage.add_record(
+                    StorageRecord(RECORD_TYPE_TAG_BACKFILL, marker, id=cls.RECORD_TYPE)
+                )
+        return updated
+
     @classmethod
     async def query(
         cls: Type[RecordType],
@@ -316,7 +641,9 @@ class BaseRecord(BaseModel):
 
         storage = session.inject(BaseStorage)
 
-        tag_query = cls.prefix_tag_filter(tag_filter)
+        tag_query, post_filter_positive = await cls._push_down_post_filter(
+            session, cls.prefix_tag_filter(tag_filter), post_filter_positive, alt
+        )
         post_filter = post_filter_positive or post_filter_negative
 
         # set flag to indicate if pagination is requested or not, then set defaults
@@ -348,9 +675,9 @@ class BaseRecord(BaseModel):
         result = []
         for record in rows:
             try:
-                vals = json.loads(record.value)
+                vals = json_codec.loads(record.value)
                 if not post_filter:  # pagination would already be applied if requested
-                    result.append(cls.from_storage(record.id, vals))
+                    result.append(cls.from_storage_record(record, vals))
                 else:
                     continue_processing = (
                         not paginated or num_results_post_filter < num_records_to_match
@@ -368,13 +695,188 @@ class BaseRecord(BaseModel):
                         continue
 
                     if num_results_post_filter >= offset:  # append only after offset
-                        result.append(cls.from_storage(record.id, vals))
+                        result.append(cls.from_storage_record(record, vals))
 
                     num_results_post_filter += 1
             except (BaseModelError, json.JSONDecodeError, TypeError) as err:
                 raise BaseModelError(f"{err}, for record id {record.id}")
         return result
 
+    @classmethod
+    async def count(
+        cls,
+        session: ProfileSession,
+        tag_filter: Optional[dict] = None,
+        *,
+        post_filter_positive: Optional[dict] = None,
+        post_filter_negative: Optional[dict] = None,
+        alt: bool = False,
+    ) -> int:
+        """Count stored records.
+
+        Uses a storage count query unless post-filters remain which cannot be
+        matched by tags, in which case the matching records are streamed.
+
+        Args:
+            session: The profile session to use
+            tag_filter: An optional dictionary of tag filter clauses
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+            alt: set to match any (positive=True) value or miss all (positive=False)
+                values in post_filter
+        """
+
+        storage = session.inject(BaseStorage)
+        tag_query, remaining = await cls._push_down_post_filter(
+            session, cls.prefix_tag_filter(tag_filter), post_filter_positive, alt
+        )
+        if not (remaining or post_filter_negative):
+            return await storage.count_records(cls.RECORD_TYPE, tag_query)
+
+        count = 0
+        async for _ in cls.query_iter(
+            session,
+            tag_filter,
+            post_filter_positive=post_filter_positive,
+            post_filter_negative=post_filter_negative,
+            alt=alt,
+        ):
+            count += 1
+        return count
+
+    @classmethod
+    async def query_iter(
+        cls: Type[RecordType],
+        session: ProfileSession,
+        tag_filter: Optional[dict] = None,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        post_filter_positive: Optional[dict] = None,
+        post_filter_negative: Optional[dict] = None,
+        alt: bool = False,
+    ) -> AsyncIterator[RecordType]:
+        """Iterate over stored records, reading them from storage a page at a time.
+
+        Records are decoded and post-filtered as they are iterated, so memory use
+        is bounded by the page size rather than the number of matching records.
+        The search reads committed records outside of the session.
+
+        Args:
+            session: The profile session to use
+            tag_filter: An optional dictionary of tag filter clauses
+            page_size: The number of records to read from storage at a time
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+            alt: set to match any (positive=True) value or miss all (positive=False)
+                values in post_filter
+
+        Yields:
+            The matching records
+
+        """
+
+        tag_query, post_filter_positive = await cls._push_down_post_filter(
+            session,
+            cls.prefix_tag_filter(tag_filter),
+            post_filter_positive,
+            alt,
+        )
+        search = session.inject(BaseStorageSearch).search_records(
+            cls.RECORD_TYPE, tag_query, page_size=page_size
+        )
+        try:
+            while True:
+                rows = await search.fetch(page_size)
+                for record in rows:
+                    try:
+                        vals = json_codec.loads(record.value)
+                        if not (
+                            match_post_filter(
+                                vals, post_filter_positive, positive=True, alt=alt
+                            )
+                            and match_post_filter(
+                                vals, post_filter_negative, positive=False, alt=alt
+                            )
+                        ):
+                            continue
+                        result = cls.from_storage_record(record, vals)
+                    except (BaseModelError, json.JSONDecodeError, TypeError) as err:
+                        raise BaseModelError(f"{err}, for record id {record.id}")
+                    yield result
+                if len(rows) < page_size:
+                    break
+        finally:
+            await search.close()
+
+    @classmethod
+    async def query_page(
+        cls: Type[RecordType],
+        session: ProfileSession,
+        tag_filter: Optional[dict] = None,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        descending: bool = False,
+        post_filter_positive: Optional[dict] = None,
+        post_filter_negative: Optional[dict] = None,
+        alt: bool = False,
+    ) -> Tuple[Sequence[RecordType], Optional[str]]:
+        """Query a page of stored records using keyset pagination.
+
+        Records are ordered by creation time. The returned cursor encodes the
+        last record read, so pages stay consistent while records are added or
+        removed, and deep pages cost no more to read than the first one.
+
+        Args:
+            session: The profile session to use
+            tag_filter: An optional dictionary of tag filter clauses
+            limit: The maximum number of records to retrieve
+            cursor: The cursor returned with the previous page, if any
+            descending: Whether to order the records in descending order.
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+            alt: set to match any (positive=True) value or miss all (positive=False)
+                values in post_filter
+
+        Returns:
+            The matching records, and the cursor for the next page or `None` when
+            there are no more records
+
+        """
+
+        storage = session.inject(BaseStorage)
+
+        tag_query, post_filter_positive = await cls._push_down_post_filter(
+            session, cls.prefix_tag_filter(tag_filter), post_filter_positive, alt
+        )
+        after = decode_cursor(cursor) if cursor else None
+
+        result = []
+        while True:
+            rows = await storage.find_keyset_records(
+                cls.RECORD_TYPE,
+                tag_query,
+                after=after,
+                limit=limit,
+                descending=descending,
+            )
+            for record in rows:
+                after = record.tags[SORT_KEY_TAG]
+                try:
+                    vals = json_codec.loads(record.value)
+                    if match_post_filter(
+                        vals, post_filter_positive, positive=True, alt=alt
+                    ) and match_post_filter(
+                        vals, post_filter_negative, positive=False, alt=alt
+                    ):
+                        result.append(cls.from_storage_record(record, vals))
+                except (BaseModelError, json.JSONDecodeError, TypeError) as err:
+                    raise BaseModelError(f"{err}, for record id {record.id}")
+                if len(result) == limit:
+                    return result, encode_cursor(after)
+            if len(rows) < limit:
+                return result, None
+
     async def save(
         self,
         session: ProfileSession,
@@ -386,6 +888,9 @@ class BaseRecord(BaseModel):
     ) -> str:
         """Persist the record to storage.
 
+        Saving a record loaded from storage whose value and tags are unchanged
+        does not write to storage, and only emits an event if `event` is set.
+
         Args:
             session: The profile session to use
             reason: A reason to add to the log
@@ -394,6 +899,11 @@ class BaseRecord(BaseModel):
             event: Flag to override whether the event is sent
         """
 
+        if self._id and not self._new_with_id and not self.is_dirty:
+            if event:
+                await self.emit_event(session, self.serialize())
+            return self._id
+
         new_record = None
         log_reason = reason or ("Updated record" if self._id else "Created record")
         try:
@@ -402,14 +912,17 @@ class BaseRecord(BaseModel):
             if self._id and not self._new_with_id:
                 record = self.storage_record
                 await storage.update_record(record, record.value, record.tags)
+                await self._bump_cached_version(session)
                 new_record = False
             else:
                 if not self._id:
                     self._id = str(uuid4())
                 self.created_at = self.updated_at
-                await storage.add_record(self.storage_record)
+                record = self.storage_record
+                await storage.add_record(record)
                 new_record = True
                 self._new_with_id = False
+            self._snapshot = self._fingerprint(record)
         finally:
             params = {self.RECORD_TYPE: self.serialize()}
             if log_params:
@@ -425,6 +938,81 @@ class BaseRecord(BaseModel):
 
         return self._id
 
+    @classmethod
+    async def save_all(
+        cls,
+        session: ProfileSession,
+        records: Sequence["BaseRecord"],
+        *,
+        reason: Optional[str] = None,
+        event: Optional[bool] = None,
+    ) -> Sequence[str]:
+        """Persist several records to storage in a batch.
+
+        New records are added with a single `add_records` call and existing ones
+        updated with a single `update_records` call. Pass a transaction to store
+        the records atomically. Post-save actions run for each record once all of
+        them are stored.
+
+        As with `save`, records loaded from storage whose value and tags are
+        unchanged are not written.
+
+        Args:
+            session: The profile session to use
+            records: The records to persist
+            reason: A reason to add to the log
+            event: Flag to override whether the events are sent
+
+        Returns:
+            The identifiers of the records
+
+        """
+
+        storage = session.inject(BaseStorage)
+        new_records = []
+        existing_records = []
+        for record in records:
+            if record._id and not record._new_with_id:
+                if not record.is_dirty:
+                    continue
+                record.updated_at = time_now()
+                existing_records.append(record)
+            else:
+                record.updated_at = time_now()
+                if not record._id:
+                    record._id = str(uuid4())
+                record.created_at = record.updated_at
+                new_records.append(record)
+
+        if new_records:
+            await storage.add_records([record.storage_record for record in new_records])
+        if existing_records:
+            await storage.update_records(
+                [record.storage_record for record in existing_records]
+            )
+            for record in existing_records:
+                await record._bump_cached_version(session)
+
+        added = {id(record) for record in new_records}
+        written = {id(record) for record in existing_records} | added
+        for record in records:
+            if id(record) not in written:
+                if event:
+                    await record.emit_event(session, record.serialize())
+                continue
+            record._snapshot = record._fingerprint(record.storage_record)
+            new_record = id(record) in added
+            record._new_with_id = False
+            record.log_state(
+                reason or ("Created record" if new_record else "Updated record"),
+                {record.RECORD_TYPE: record.serialize()},
+                settings=session.settings,
+            )
+            await record.post_save(session, new_record, record._last_state, event)
+            record._last_state = record.state
+
+        return [record._id for record in records]
+
     async def post_save(
         self,
         session: ProfileSession,
@@ -460,6 +1048,7 @@ class BaseRecord(BaseModel):
                 self.state = BaseRecord.STATE_DELETED
                 await self.emit_event(session, self.serialize())
             await storage.delete_record(self.storage_record)
+            await self._bump_cached_version(session)
 
     async def emit_event(self, session: ProfileSession, payload: Optional[Any] = None):
         """Emit an event.
@@ -577,6 +1166,40 @@ class BaseExchangeRecord(BaseRecord):
         return False
 
 
+def _record_classes(cls: Type[BaseRecord] = BaseRecord):
+    """Yield the loaded subclasses of a record class."""
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _record_classes(subclass)
+
+
+async def backfill_record_tags(profile: Profile) -> int:
+    """Back-fill the sort keys and declared filter tags for every loaded record type.
+
+    Failures are logged, and the record type is retried on the next start.
+
+    Args:
+        profile: The profile holding the records
+
+    Returns:
+        The number of records updated
+
+    """
+    updated = 0
+    record_types = set()
+    for record_cls in _record_classes():
+        if not record_cls.RECORD_TYPE or record_cls.RECORD_TYPE in record_types:
+            continue
+        record_types.add(record_cls.RECORD_TYPE)
+        try:
+            updated += await record_cls.backfill_tags(profile)
+        except Exception:
+            LOGGER.exception("Error back-filling tags for %s", record_cls.RECORD_TYPE)
+    if updated:
+        LOGGER.info("Back-filled tags on %d records", updated)
+    return updated
+
+
 class BaseRecordSchema(BaseModelSchema):
     """Schema to allow serialization/deserialization of base records."""
 
@@ -606,6 +1229,35 @@ class BaseRecordSchema(BaseModelSchema):
         },
     )
 
+    @staticmethod
+    def _stored_view(obj: Any, attr: str) -> Optional[SerDe]:
+        """Get the views of a nested model which was not deserialized yet."""
+        serde = getattr(obj, f"_{attr}", None)
+        if isinstance(serde, SerDe) and not serde.deserialized:
+            return serde
+        return None
+
+    def get_attribute(self, obj: Any, attr: str, default: Any):
+        """Skip nested models which were not deserialized, see `dump_stored_views`."""
+        if self._stored_view(obj, attr):
+            return missing
+        return super().get_attribute(obj, attr, default)
+
+    @post_dump(pass_original=True)
+    def dump_stored_views(self, data: dict, original: Any, **kwargs):
+        """Copy the stored form of nested models which were not deserialized.
+
+        A nested model loaded from storage and never accessed cannot have been
+        modified, so its stored form is output instead of loading and dumping it.
+        """
+        for name, field in self.dump_fields.items():
+            serde = self._stored_view(original, field.attribute or name)
+            if serde:
+                data[field.data_key or name] = json_codec.loads(
+                    json_codec.dumps(serde.ser)
+                )
+        return data
+
 
 class BaseExchangeSchema(BaseRecordSchema):
     """Base schema for exchange records."""
@@ -1,6 +1,6 @@
 """Class for paginated query parameters."""
 
-from typing import Tuple
+from typing import Optional, Tuple
 
 from aiohttp.web import BaseRequest
 from marshmallow import fields
@@ -44,6 +44,54 @@ class PaginatedQuerySchema(OpenAPISchema):
         metadata={"description": "Order results in descending order if true"},
         error_messages={"invalid": "Not a valid boolean."},
     )
+    cursor = fields.Str(
+        required=False,
+        metadata={
+            "description": (
+                "Page by cursor instead of offset: pass the `next_cursor` of the"
+                " previous response, or an empty value for the first page. Results"
+                " are ordered by creation time, and `offset` and `order_by` are"
+                " ignored."
+            ),
+            "example": "",
+        },
+    )
+    include_total = fields.Bool(
+        required=False,
+        load_default=False,
+        truthy={"true", "1", "yes"},
+        falsy={"false", "0", "no"},
+        metadata={
+            "description": (
+                "Include the total number of records matching the query if true"
+            )
+        },
+        error_messages={"invalid": "Not a valid boolean."},
+    )
+
+
+class PaginatedResultSchema(OpenAPISchema):
+    """Result schema fields for paginated queries."""
+
+    next_cursor = fields.Str(
+        required=False,
+        allow_none=True,
+        metadata={
+            "description": (
+                "Cursor for the next page when paging by cursor, or null when there"
+                " are no more results"
+            )
+        },
+    )
+    total = fields.Int(
+        required=False,
+        metadata={
+            "description": (
+                "Total number of records matching the query, if `include_total` was set"
+            ),
+            "example": 250,
+        },
+    )
 
 
 def get_paginated_query_params(request: BaseRequest) -> Tuple[int, int, str, bool]:
@@ -69,3 +117,30 @@ def get_paginated_query_params(request: BaseRequest) -> Tuple[int, int, str, boo
     descending = descending_str in {"true", "1", "yes"}
 
     return limit, offset, order_by, descending
+
+
+def get_cursor_query_param(request: BaseRequest) -> Optional[str]:
+    """Read the cursor query parameter from a request.
+
+    Args:
+        request: aiohttp request object.
+
+    Returns:
+        The cursor, an empty string for the first page, or `None` when the request
+        pages by offset.
+    """
+
+    return request.query.get("cursor")
+
+
+def get_include_total_query_param(request: BaseRequest) -> bool:
+    """Read the include_total query parameter from a request.
+
+    Args:
+        request: aiohttp request object.
+
+    Returns:
+        Whether the total number of matching records should be returned.
+    """
+
+    return request.query.get("include_total", "false").lower() in {"true", "1", "yes"}
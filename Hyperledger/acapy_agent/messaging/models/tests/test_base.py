@@ -115,3 +115,29 @@ class TestBase(IsolatedAsyncioTestCase):
         assert ModelImplWithoutUnknown.deserialize(
             {"attr": "succeeds", "another": "value"}
         )
+
+    def test_serde_lazy(self):
+        assert ModelImpl.serde(None) is None
+
+        model = ModelImpl(attr="succeeds")
+        serde = ModelImpl.serde(model)
+        assert serde.deserialized
+        assert serde.de is model
+        assert serde.ser == {"attr": "succeeds"}
+
+        with mock.patch.object(
+            ModelImpl, "deserialize", wraps=ModelImpl.deserialize
+        ) as mock_deserialize:
+            serde = ModelImpl.serde({"attr": "succeeds"})
+            assert not serde.deserialized
+            mock_deserialize.assert_not_called()
+            ser, de = serde
+            assert ser == {"attr": "succeeds"}
+            assert de.attr == "succeeds"
+            assert serde.de is de
+            assert serde.deserialized
+            mock_deserialize.assert_called_once()
+
+        serde = ModelImpl.serde({"attr": "fails"})
+        with self.assertRaises(BaseModelError):
+            serde.de
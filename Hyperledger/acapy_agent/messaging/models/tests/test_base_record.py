@@ -4,17 +4,21 @@ from unittest import IsolatedAsyncioTestCase
 from marshmallow import EXCLUDE, fields
 
 from ....cache.base import BaseCache
+from ....cache.in_memory import InMemoryCache
 from ....core.event_bus import Event, EventBus, MockEventBus
 from ....messaging.models.base import BaseModelError
 from ....storage.base import (
     DEFAULT_PAGE_SIZE,
+    SORT_KEY_TAG,
     BaseStorage,
     StorageDuplicateError,
+    StorageNotFoundError,
     StorageRecord,
 )
 from ....tests import mock
 from ....utils.testing import create_test_profile
 from ...util import time_now
+from ..base import BaseModel, BaseModelSchema
 from ..base_record import BaseRecord, BaseRecordSchema
 
 
@@ -61,6 +65,61 @@ class ARecordImplSchema(BaseRecordSchema):
     code = fields.Str()
 
 
+class CachedImpl(ARecordImpl):
+    RECORD_TYPE = "cached-record"
+    RETRIEVE_CACHE_TTL = 60
+
+
+class InnerModel(BaseModel):
+    class Meta:
+        schema_class = "InnerModelSchema"
+
+    def __init__(self, *, value=None):
+        self.value = value
+
+
+class InnerModelSchema(BaseModelSchema):
+    class Meta:
+        model_class = InnerModel
+        unknown = EXCLUDE
+
+    value = fields.Str(data_key="~value")
+
+
+class NestedRecordImpl(BaseRecord):
+    class Meta:
+        schema_class = "NestedRecordImplSchema"
+
+    RECORD_TYPE = "nested-record"
+    RECORD_ID_NAME = "ident"
+
+    def __init__(self, *, ident=None, inner=None, **kwargs):
+        super().__init__(ident, **kwargs)
+        self._inner = InnerModel.serde(inner)
+
+    @property
+    def inner(self) -> InnerModel:
+        return None if self._inner is None else self._inner.de
+
+    @property
+    def record_value(self) -> dict:
+        return {"inner": self._inner.ser} if self._inner is not None else {}
+
+
+class NestedRecordImplSchema(BaseRecordSchema):
+    class Meta:
+        model_class = NestedRecordImpl
+        unknown = EXCLUDE
+
+    ident = fields.Str(attribute="_id")
+    inner = fields.Nested(InnerModelSchema(), required=False)
+
+
+class FilterTagImpl(ARecordImpl):
+    RECORD_TYPE = "filter-record"
+    FILTER_TAG_NAMES = {"b"}
+
+
 class UnencTestImpl(BaseRecord):
     TAG_NAMES = {"~a", "~b", "c"}
 
@@ -453,3 +512,384 @@ class TestBaseRecord(IsolatedAsyncioTestCase):
             assert result[0]._id == record_id
             assert result[0].value == record_value
             assert result[0].a == "one"
+
+    async def test_query_page(self):
+        async with self.profile.session() as session:
+            for i in range(5):
+                await ARecordImpl(
+                    ident=f"id{i}",
+                    a=str(i),
+                    b="two",
+                    code="red" if i % 2 else "blue",
+                    new_with_id=True,
+                ).save(session)
+
+            pages, cursor = [], None
+            while True:
+                records, cursor = await ARecordImpl.query_page(
+                    session, limit=2, cursor=cursor
+                )
+                pages.append([record.a for record in records])
+                if not cursor:
+                    break
+            assert pages == [["0", "1"], ["2", "3"], ["4"]]
+
+            records, cursor = await ARecordImpl.query_page(
+                session, limit=2, descending=True
+            )
+            assert [record.a for record in records] == ["4", "3"]
+            records, cursor = await ARecordImpl.query_page(
+                session, limit=2, cursor=cursor, descending=True
+            )
+            assert [record.a for record in records] == ["2", "1"]
+
+            records, cursor = await ARecordImpl.query_page(
+                session, {"code": "blue"}, limit=1, post_filter_positive={"a": "4"}
+            )
+            assert [record.a for record in records] == ["4"]
+            assert cursor
+
+            with self.assertRaises(BaseModelError):
+                await ARecordImpl.query_page(session, cursor="not a cursor")
+
+    def test_storage_record_sort_key(self):
+        record = ARecordImpl(
+            ident="record_id",
+            a="one",
+            b="two",
+            created_at="2024-01-02T03:04:05Z",
+        )
+        assert record.sort_key == "20240102030405000000:record_id"
+        assert record.storage_record.tags[SORT_KEY_TAG] == record.sort_key
+        assert SORT_KEY_TAG not in record.tags
+        assert "sort_key" not in record.value
+        assert ARecordImpl(a="one", b="two").sort_key is None
+
+    async def test_query_post_filter_tags(self):
+        async with self.profile.session() as session:
+            storage = session.inject(BaseStorage)
+            # stored before "b" was declared as a filter tag
+            await storage.add_record(
+                StorageRecord(
+                    FilterTagImpl.RECORD_TYPE,
+                    json.dumps({"a": "legacy", "b": "x", "created_at": time_now()}),
+                    {},
+                    "legacy",
+                )
+            )
+            for a, b in (("one", "x"), ("two", "y")):
+                await FilterTagImpl(a=a, b=b).save(session)
+
+            with mock.patch.object(
+                type(storage),
+                "find_paginated_records",
+                autospec=True,
+                side_effect=type(storage).find_paginated_records,
+            ) as mock_paginated:
+                result = await FilterTagImpl.query(
+                    session, limit=10, post_filter_positive={"b": "x"}
+                )
+                assert sorted(record.a for record in result) == ["legacy", "one"]
+                mock_paginated.assert_not_called()
+
+        assert await FilterTagImpl.backfill_tags(self.profile) == 1
+        assert await FilterTagImpl.backfill_tags(self.profile) == 0
+
+        # push-down waits for the setting, as older processes may still save
+        # records without the tags
+        async with self.profile.session() as session:
+            storage = session.inject(BaseStorage)
+            with mock.patch.object(
+                type(storage),
+                "find_paginated_records",
+                autospec=True,
+                side_effect=type(storage).find_paginated_records,
+            ) as mock_paginated:
+                await FilterTagImpl.query(
+                    session, limit=10, post_filter_positive={"b": "x"}
+                )
+                mock_paginated.assert_not_called()
+
+        self.profile.settings["wallet.filter_tag_queries"] = True
+        async with self.profile.session() as session:
+            storage = session.inject(BaseStorage)
+            with mock.patch.object(
+                type(storage),
+                "find_paginated_records",
+                autospec=True,
+                side_effect=type(storage).find_paginated_records,
+            ) as mock_paginated:
+                result = await FilterTagImpl.query(
+                    session, limit=10, post_filter_positive={"b": "x"}
+                )
+                assert sorted(record.a for record in result) == ["legacy", "one"]
+                mock_paginated.assert_awaited_once_with(
+                    mock.ANY,
+                    type_filter=FilterTagImpl.RECORD_TYPE,
+                    tag_query={"b": "x"},
+                    limit=10,
+                    offset=0,
+                    order_by=None,
+                    descending=False,
+                )
+
+            result = await FilterTagImpl.query(
+                session, post_filter_positive={"b": ["y", "z"]}, alt=True
+            )
+            assert [record.a for record in result] == ["two"]
+
+            # with alt, string values keep their substring match
+            result = await FilterTagImpl.query(
+                session, post_filter_positive={"b": "xyz"}, alt=True
+            )
+            assert sorted(record.a for record in result) == ["legacy", "one", "two"]
+
+    async def test_backfill_sort_key(self):
+        async with self.profile.session() as session:
+            # stored before records carried a sort key
+            await session.inject(BaseStorage).add_record(
+                StorageRecord(
+                    ARecordImpl.RECORD_TYPE,
+                    json.dumps({"a": "legacy", "b": "x", "created_at": time_now()}),
+                    {},
+                    "legacy",
+                )
+            )
+            await ARecordImpl(a="one", b="y").save(session)
+            records, _ = await ARecordImpl.query_page(session)
+            assert [record.a for record in records] == ["one"]
+
+        assert await ARecordImpl.backfill_tags(self.profile) == 1
+        assert await ARecordImpl.backfill_tags(self.profile) == 0
+
+        async with self.profile.session() as session:
+            records, _ = await ARecordImpl.query_page(session)
+            assert sorted(record.a for record in records) == ["legacy", "one"]
+
+    async def test_query_iter(self):
+        async with self.profile.session() as session:
+            for i in range(5):
+                await ARecordImpl(
+                    a=str(i), b="even" if i % 2 == 0 else "odd", code="red"
+                ).save(session)
+
+            records = [
+                record async for record in ARecordImpl.query_iter(session, page_size=2)
+            ]
+            assert sorted(record.a for record in records) == ["0", "1", "2", "3", "4"]
+
+            records = [
+                record
+                async for record in ARecordImpl.query_iter(
+                    session,
+                    {"code": "red"},
+                    page_size=2,
+                    post_filter_positive={"b": "even"},
+                )
+            ]
+            assert sorted(record.a for record in records) == ["0", "2", "4"]
+
+            await session.inject(BaseStorage).add_record(
+                StorageRecord(ARecordImpl.RECORD_TYPE, "not json", {}, "bad")
+            )
+            with self.assertRaises(BaseModelError):
+                async for _ in ARecordImpl.query_iter(session):
+                    pass
+
+    async def test_save_all(self):
+        async with self.profile.session() as session:
+            existing = ARecordImpl(a="one", b="two")
+            await existing.save(session)
+            existing.b = "three"
+            records = [existing, ARecordImpl(a="four", b="five")]
+
+            with mock.patch.object(
+                ARecordImpl, "post_save", autospec=True
+            ) as mock_post_save:
+                ids = await ARecordImpl.save_all(session, records, reason="batch")
+            assert ids == [record._id for record in records]
+            assert [
+                (call.args[0], call.args[2]) for call in mock_post_save.await_args_list
+            ] == [(records[0], False), (records[1], True)]
+
+            found = await ARecordImpl.query(session)
+            assert sorted((record.a, record.b) for record in found) == [
+                ("four", "five"),
+                ("one", "three"),
+            ]
+
+    async def test_save_unchanged(self):
+        async with self.profile.session() as session:
+            record = ARecordImpl(a="one", b="two", code="three")
+            assert record.is_dirty
+            await record.save(session)
+            assert not record.is_dirty
+
+            loaded = await ARecordImpl.retrieve_by_id(session, record._id)
+            assert not loaded.is_dirty
+            storage = session.inject(BaseStorage)
+            with (
+                mock.patch.object(
+                    type(storage), "update_record", autospec=True
+                ) as mock_update,
+                mock.patch.object(ARecordImpl, "emit_event", autospec=True) as mock_emit,
+            ):
+                assert await loaded.save(session) == record._id
+                mock_update.assert_not_called()
+                mock_emit.assert_not_called()
+
+                await loaded.save(session, event=True)
+                mock_update.assert_not_called()
+                mock_emit.assert_awaited_once()
+
+                assert await ARecordImpl.save_all(session, [loaded]) == [record._id]
+                mock_update.assert_not_called()
+
+            loaded.code = "four"
+            assert loaded.is_dirty
+            await loaded.save(session)
+            assert not loaded.is_dirty
+            (found,) = await ARecordImpl.query(session, {"code": "four"})
+            assert found.updated_at == loaded.updated_at != record.updated_at
+
+    async def test_retrieve_by_id_cached(self):
+        cache = InMemoryCache()
+        self.profile.context.injector.bind_instance(BaseCache, cache)
+        async with self.profile.session() as session:
+            record = CachedImpl(a="one", b="two")
+            await record.save(session)
+            storage_cls = type(session.inject(BaseStorage))
+            with mock.patch.object(
+                storage_cls,
+                "get_record",
+                autospec=True,
+                side_effect=storage_cls.get_record,
+            ) as mock_get:
+                # records are only cached with the setting enabled
+                await CachedImpl.retrieve_by_id(session, record._id)
+                await CachedImpl.retrieve_by_id(session, record._id)
+                assert mock_get.await_count == 2
+
+        self.profile.settings["cache.records"] = True
+        async with self.profile.session() as session:
+            with mock.patch.object(
+                storage_cls,
+                "get_record",
+                autospec=True,
+                side_effect=storage_cls.get_record,
+            ) as mock_get:
+                first = await CachedImpl.retrieve_by_id(session, record._id)
+                second = await CachedImpl.retrieve_by_id(session, record._id)
+                assert mock_get.await_count == 1
+                assert first == second == record
+                assert first is not second
+                assert not second.is_dirty
+
+                await CachedImpl.retrieve_by_id(session, record._id, for_update=True)
+                assert mock_get.await_count == 2
+
+                second.b = "three"
+                await second.save(session)
+                assert (await CachedImpl.retrieve_by_id(session, record._id)).b == "three"
+                assert mock_get.await_count == 3
+
+        async with self.profile.transaction() as txn:
+            version_key = CachedImpl._version_cache_key(txn, record._id)
+            version = await cache.get(version_key)
+            record = await CachedImpl.retrieve_by_id(txn, record._id, for_update=True)
+            record.b = "four"
+            await record.save(txn)
+            assert await cache.get(version_key) == version
+            await txn.commit()
+            assert await cache.get(version_key) != version
+
+        async with self.profile.session() as session:
+            found = await CachedImpl.retrieve_by_id(session, record._id)
+            assert found.b == "four"
+            await found.delete_record(session)
+            with self.assertRaises(StorageNotFoundError):
+                await CachedImpl.retrieve_by_id(session, record._id)
+
+    async def test_backfill_invalidates_cached(self):
+        cache = InMemoryCache()
+        self.profile.context.injector.bind_instance(BaseCache, cache)
+        self.profile.settings["cache.records"] = True
+        async with self.profile.session() as session:
+            await session.inject(BaseStorage).add_record(
+                StorageRecord(
+                    CachedImpl.RECORD_TYPE,
+                    json.dumps({"a": "one", "b": "two", "created_at": time_now()}),
+                    {},
+                    "legacy",
+                )
+            )
+            await CachedImpl.retrieve_by_id(session, "legacy")
+            version_key = CachedImpl._version_cache_key(session, "legacy")
+            version = await cache.get(version_key)
+            assert version
+
+        assert await CachedImpl.backfill_tags(self.profile) == 1
+        assert await cache.get(version_key) != version
+
+    async def test_serialize_stored_views(self):
+        async with self.profile.session() as session:
+            record = NestedRecordImpl(inner=InnerModel(value="one"))
+            await record.save(session)
+            await NestedRecordImpl().save(session)
+
+            with mock.patch.object(
+                InnerModel, "deserialize", wraps=InnerModel.deserialize
+            ) as mock_deserialize:
+                found = await NestedRecordImpl.retrieve_by_id(session, record._id)
+                assert not found.is_dirty
+                serialized = found.serialize()
+                mock_deserialize.assert_not_called()
+            assert serialized == record.serialize()
+            assert serialized["inner"] == {"~value": "one"}
+
+            serialized["inner"]["~value"] = "changed"
+            assert found._inner.ser == {"~value": "one"}
+
+            found.inner.value = "two"
+            assert found.serialize()["inner"] == {"~value": "two"}
+
+            records = await NestedRecordImpl.query(session)
+            assert sorted(str(rec.serialize().get("inner")) for rec in records) == [
+                "None",
+                str({"~value": "one"}),
+            ]
+
+    async def test_retrieve_by_ids(self):
+        async with self.profile.session() as session:
+            records = [ARecordImpl(a="one", b=str(i)) for i in range(3)]
+            for record in records:
+                await record.save(session)
+
+            found = await ARecordImpl.retrieve_by_ids(
+                session,
+                [records[2]._id, "missing", records[0]._id, records[2]._id],
+            )
+            assert [record._id for record in found] == [records[2]._id, records[0]._id]
+            assert [record.b for record in found] == ["2", "0"]
+            assert await ARecordImpl.retrieve_by_ids(session, []) == []
+
+    async def test_count(self):
+        async with self.profile.session() as session:
+            for i in range(5):
+                await ARecordImpl(a=str(i % 2), b=str(i), code=str(i % 3)).save(session)
+            storage = session.inject(BaseStorage)
+            with mock.patch.object(
+                type(storage), "count_records", autospec=True, return_value=2
+            ) as mock_count:
+                assert await ARecordImpl.count(session, {"code": "0"}) == 2
+                mock_count.assert_awaited_once()
+
+            assert await ARecordImpl.count(session) == 5
+            assert await ARecordImpl.count(session, {"code": "0"}) == 2
+            assert await ARecordImpl.count(session, post_filter_positive={"a": "1"}) == 2
+            assert (
+                await ARecordImpl.count(
+                    session, {"code": "0"}, post_filter_negative={"b": "0"}
+                )
+                == 1
+            )
@@ -65,3 +65,18 @@ def test_paginated_query_schema_offset_validation():
     with pytest.raises(ValidationError) as exc_info:
         schema.load({"offset": -1})
     assert "Must be greater than or equal to 0." in str(exc_info.value)
+
+
+def test_paginated_query_schema_cursor():
+    schema = PaginatedQuerySchema()
+    assert "cursor" not in schema.load({})
+    assert schema.load({"cursor": ""})["cursor"] == ""
+    assert schema.load({"cursor": "MjAyNDox"})["cursor"] == "MjAyNDox"
+
+
+def test_paginated_query_schema_include_total():
+    schema = PaginatedQuerySchema()
+    assert schema.load({})["include_total"] is False
+    assert schema.load({"include_total": "true"})["include_total"] is True
+    with pytest.raises(ValidationError):
+        schema.load({"include_total": "maybe"})
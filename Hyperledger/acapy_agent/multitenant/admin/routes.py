@@ -18,6 +18,9 @@ from ...messaging.models.base import BaseModelError
 from ...messaging.models.openapi import OpenAPISchema
 from ...messaging.models.paginated_query import (
     PaginatedQuerySchema,
+    PaginatedResultSchema,
+    get_cursor_query_param,
+    get_include_total_query_param,
     get_paginated_query_params,
 )
 from ...messaging.valid import UUID4_EXAMPLE, JSONWebToken
@@ -347,7 +350,7 @@ class CreateWalletTokenResponseSchema(OpenAPISchema):
     )
 
 
-class WalletListSchema(OpenAPISchema):
+class WalletListSchema(PaginatedResultSchema):
     """Result schema for wallet list."""
 
     results = fields.List(
@@ -384,22 +387,40 @@ async def wallets_list(request: web.BaseRequest):
         query["wallet_name"] = wallet_name
 
     limit, offset, order_by, descending = get_paginated_query_params(request)
+    cursor = get_cursor_query_param(request)
+    include_total = get_include_total_query_param(request)
 
     try:
         async with profile.session() as session:
-            records = await WalletRecord.query(
-                session,
-                tag_filter=query,
-                limit=limit,
-                offset=offset,
-                order_by=order_by,
-                descending=descending,
-            )
+            if cursor is not None:
+                records, next_cursor = await WalletRecord.query_page(
+                    session,
+                    tag_filter=query,
+                    limit=limit,
+                    cursor=cursor,
+                    descending=descending,
+                )
+            else:
+                records = await WalletRecord.query(
+                    session,
+                    tag_filter=query,
+                    limit=limit,
+                    offset=offset,
+                    order_by=order_by,
+                    descending=descending,
+                )
+            if include_total:
+                total = await WalletRecord.count(session, tag_filter=query)
         results = [format_wallet_record(record) for record in records]
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    return web.json_response({"results": results})
+    response = {"results": results}
+    if cursor is not None:
+        response["next_cursor"] = next_cursor
+    if include_total:
+        response["total"] = total
+    return web.json_response(response)
 
 
 @docs(tags=["multitenancy"], summary="Get a single subwallet")
@@ -144,6 +144,29 @@ class TestMultitenantRoutes(IsolatedAsyncioTestCase):
                 }
             )
 
+    async def test_wallets_list_cursor(self):
+        async with self.profile.session() as session:
+            for name in ("one", "two", "three"):
+                await WalletRecord(
+                    key_management_mode=WalletRecord.MODE_MANAGED,
+                    settings={"wallet.name": name},
+                ).save(session)
+
+        names = []
+        self.request.query = {"cursor": "", "limit": "2"}
+        with mock.patch.object(test_module.web, "json_response") as mock_response:
+            await test_module.wallets_list(self.request)
+            response = mock_response.call_args.args[0]
+            names += [result["settings"]["wallet.name"] for result in response["results"]]
+            assert response["next_cursor"]
+
+            self.request.query = {"cursor": response["next_cursor"], "limit": "2"}
+            await test_module.wallets_list(self.request)
+            response = mock_response.call_args.args[0]
+            names += [result["settings"]["wallet.name"] for result in response["results"]]
+            assert response["next_cursor"] is None
+        assert names == ["one", "two", "three"]
+
     async def test_wallet_create_tenant_settings(self):
         body = {
             "wallet_name": "test",
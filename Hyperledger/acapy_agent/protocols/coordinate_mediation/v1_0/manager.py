@@ -551,7 +551,8 @@ class MediationManager:
         to_save: Sequence[RouteRecord] = []
         to_remove: Sequence[RouteRecord] = []
 
-        async with self._profile.session() as session:
+        # a transaction stores the whole keylist update in one commit
+        async with self._profile.transaction() as session:
             for updated in results:
                 if updated.result != KeylistUpdated.RESULT_SUCCESS:
                     # TODO better handle different results?
@@ -602,10 +603,12 @@ class MediationManager:
                         record = records[0]
                         to_remove.append(record)
 
-            for record_for_saving in to_save:
-                await record_for_saving.save(session, reason="Route successfully added.")
+            await RouteRecord.save_all(
+                session, to_save, reason="Route successfully added."
+            )
             for record_for_removal in to_remove:
                 await record_for_removal.delete_record(session)
+            await session.commit()
 
     async def get_my_keylist(
         self, connection_id: Optional[str] = None
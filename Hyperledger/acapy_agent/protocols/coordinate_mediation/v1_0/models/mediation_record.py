@@ -21,6 +21,7 @@ class MediationRecord(BaseRecord):
     RECORD_TYPE = "mediation_requests"
     RECORD_TOPIC = "mediation"
     RECORD_ID_NAME = "mediation_id"
+    RETRIEVE_CACHE_TTL = BaseRecord.DEFAULT_CACHE_TTL
     TAG_NAMES = {"state", "role", "connection_id"}
 
     STATE_REQUEST = "request"
@@ -383,7 +383,17 @@ class TestMediationManager:  # pylint: disable=R0904,W0621
                 result=KeylistUpdated.RESULT_SUCCESS,
             ),
         ]
-        await manager.store_update_results(TEST_CONN_ID, results)
+        save_all = RouteRecord.save_all
+        in_transaction = []
+
+        async def _save_all(session, *args, **kwargs):
+            in_transaction.append(session.is_transaction)
+            return await save_all(session, *args, **kwargs)
+
+        with mock.patch.object(RouteRecord, "save_all", _save_all):
+            await manager.store_update_results(TEST_CONN_ID, results)
+        # the batch is written in a transaction
+        assert in_transaction == [True]
         routes = await RouteRecord.query(session)
 
         assert len(routes) == 1
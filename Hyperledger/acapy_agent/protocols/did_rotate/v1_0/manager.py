@@ -3,6 +3,7 @@
 Manages and tracks the state of the DID Rotate protocol.
 """
 
+from ....cache.base import BaseCache
 from ....connections.base_manager import (
     BaseConnectionManager,
     BaseConnectionManagerError,
@@ -10,7 +11,7 @@ from ....connections.base_manager import (
 from ....connections.models.conn_record import ConnRecord
 from ....core.profile import Profile
 from ....messaging.responder import BaseResponder
-from ....resolver.base import DIDMethodNotSupported, DIDNotFound
+from ....resolver.base import DIDMethodNotSupported, DIDNotFound, did_cache_tag
 from ....resolver.did_resolver import DIDResolver
 from .messages import Hangup, Rotate, RotateAck, RotateProblemReport
 from .models import RotateRecord
@@ -127,6 +128,10 @@ class DIDRotateManager:
             thread_id=rotate._message_id,
         )
 
+        # the DID may only just have been published, so drop any cached
+        # not-found result before checking it
+        resolver = self.profile.inject(DIDResolver)
+        await resolver.clear_cache(self.profile, rotate.to_did)
         try:
             await self.ensure_supported_did(rotate.to_did)
         except ReportableDIDRotateError as err:
@@ -158,6 +163,7 @@ class DIDRotateManager:
                 RotateProblemReport.unrecordable_keys(record.new_did)
             )
 
+        old_did = conn.their_did
         conn.their_did = record.new_did
 
         ack = RotateAck()
@@ -172,10 +178,11 @@ class DIDRotateManager:
             await conn.save(session, reason="Their DID rotated", event=False)
             await record.save(session, reason="Sent rotate ack")
 
-        # TODO it would be better if the cache key included DIDs so we don't
-        # have to manually clear it. This is a bigger change than a first pass
-        # warrants though.
         await conn_mgr.clear_connection_targets_cache(conn.connection_id)
+        if old_did:
+            cache = self.profile.inject_or(BaseCache)
+            if cache:
+                await cache.clear_tag(did_cache_tag(old_did))
 
     async def receive_ack(self, conn: ConnRecord, ack: RotateAck):
         """Receive rotate ack message.
@@ -199,9 +206,6 @@ class DIDRotateManager:
             # At this point the rotate is complete, so we can delete the record
             await record.delete_record(session)
 
-        # TODO it would be better if the cache key included DIDs so we don't
-        # have to manually clear it. This is a bigger change than a first pass
-        # warrants though.
         conn_mgr = BaseConnectionManager(self.profile)
         await conn_mgr.clear_connection_targets_cache(conn.connection_id)
 
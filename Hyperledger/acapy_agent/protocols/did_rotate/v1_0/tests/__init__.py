@@ -7,3 +7,5 @@ class MockConnRecord:
     def __init__(self, connection_id, is_ready) -> None:
         self.connection_id = connection_id
         self.is_ready = is_ready
+        self.my_did = None
+        self.their_did = None
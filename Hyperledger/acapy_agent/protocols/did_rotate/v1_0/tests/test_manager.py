@@ -1,5 +1,7 @@
 from unittest import IsolatedAsyncioTestCase
 
+from .....cache.base import BaseCache, negative_result
+from .....cache.in_memory import InMemoryCache
 from .....connections.base_manager import BaseConnectionManager
 from .....messaging.responder import BaseResponder, MockResponder
 from .....protocols.coordinate_mediation.v1_0.route_manager import RouteManager
@@ -13,6 +15,7 @@ from .....protocols.did_rotate.v1_0.messages.problem_report import RotateProblem
 from .....protocols.did_rotate.v1_0.messages.rotate import Rotate
 from .....protocols.did_rotate.v1_0.models.rotate_record import RotateRecord
 from .....protocols.didcomm_prefix import DIDCommPrefix
+from .....resolver.base import did_cache_tag
 from .....resolver.did_resolver import DIDResolver
 from .....tests import mock
 from .....utils.testing import create_test_profile
@@ -84,6 +87,24 @@ class TestDIDRotateManager(IsolatedAsyncioTestCase):
         assert record.state == record.STATE_ROTATE_RECEIVED
         assert record.connection_id == mock_conn_record.connection_id
 
+    async def test_receive_rotate_clears_not_found(self):
+        mock_conn_record = MockConnRecord(test_conn_id, True)
+        cache = InMemoryCache()
+        self.profile.context.injector.bind_instance(BaseCache, cache)
+        test_to_did = "did:peer:2:testdid"
+        await cache.set("resolver::test::did:peer:2:testdid", negative_result("gone"))
+        await cache.tag(
+            "resolver::test::did:peer:2:testdid", [did_cache_tag(test_to_did)]
+        )
+
+        with mock.patch.object(
+            self.manager, "ensure_supported_did", mock.CoroutineMock()
+        ):
+            await self.manager.receive_rotate(
+                mock_conn_record, Rotate(to_did=test_to_did)
+            )
+        assert await cache.get("resolver::test::did:peer:2:testdid") is None
+
     async def test_receive_rotate_x(self):
         mock_conn_record = MockConnRecord(test_conn_id, True)
 
@@ -113,7 +134,14 @@ class TestDIDRotateManager(IsolatedAsyncioTestCase):
     )
     async def test_commit_rotate(self, *_):
         mock_conn_record = MockConnRecord(test_conn_id, True)
+        mock_conn_record.their_did = "did:peer:2:olddid"
         mock_conn_record.save = mock.CoroutineMock()
+        cache = InMemoryCache()
+        self.profile.context.injector.bind_instance(BaseCache, cache)
+        await cache.set("resolver::test::did:peer:2:olddid", {"id": "old"})
+        await cache.tag(
+            "resolver::test::did:peer:2:olddid", [did_cache_tag("did:peer:2:olddid")]
+        )
 
         test_to_did = "did:peer:2:testdid"
 
@@ -123,6 +151,8 @@ class TestDIDRotateManager(IsolatedAsyncioTestCase):
         await self.manager.commit_rotate(mock_conn_record, record)
 
         assert record.state == RotateRecord.STATE_ACK_SENT
+        assert mock_conn_record.their_did == test_to_did
+        assert await cache.get("resolver::test::did:peer:2:olddid") is None
 
     @mock.patch.object(
         BaseConnectionManager,
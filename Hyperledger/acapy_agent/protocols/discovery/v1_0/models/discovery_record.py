@@ -132,7 +132,7 @@ class V10DiscoveryExchangeRecord(BaseExchangeRecord):
                     "query_msg",
                     "disclose",
                 )
-                if getattr(self, prop) is not None
+                if getattr(self, f"_{prop}") is not None
             },
         }
 
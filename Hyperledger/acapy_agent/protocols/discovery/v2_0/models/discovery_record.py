@@ -113,7 +113,7 @@ class V20DiscoveryExchangeRecord(BaseExchangeRecord):
                     "queries_msg",
                     "disclosures",
                 )
-                if getattr(self, prop) is not None
+                if getattr(self, f"_{prop}") is not None
             },
         }
 
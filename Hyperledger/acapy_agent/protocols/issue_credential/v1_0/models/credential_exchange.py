@@ -39,6 +39,11 @@ class V10CredentialExchange(BaseExchangeRecord):
     RECORD_ID_NAME = "credential_exchange_id"
     RECORD_TOPIC = "issue_credential"
     TAG_NAMES = {"~thread_id"} if UNENCRYPTED_TAGS else {"thread_id"}
+    FILTER_TAG_NAMES = (
+        {"~connection_id", "~role", "~state"}
+        if UNENCRYPTED_TAGS
+        else {"connection_id", "role", "state"}
+    )
 
     INITIATOR_SELF = "self"
     INITIATOR_EXTERNAL = "external"
@@ -286,7 +291,7 @@ class V10CredentialExchange(BaseExchangeRecord):
                     "raw_credential",
                     "credential",
                 )
-                if getattr(self, prop) is not None
+                if getattr(self, f"_{prop}") is not None
             },
         }
 
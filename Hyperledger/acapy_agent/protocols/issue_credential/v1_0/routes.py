@@ -25,6 +25,9 @@ from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
 from ....messaging.models.paginated_query import (
     PaginatedQuerySchema,
+    PaginatedResultSchema,
+    get_cursor_query_param,
+    get_include_total_query_param,
     get_paginated_query_params,
 )
 from ....messaging.valid import (
@@ -40,6 +43,7 @@ from ....messaging.valid import (
     UUID4_VALIDATE,
 )
 from ....storage.error import StorageError, StorageNotFoundError
+from ....utils import json_codec
 from ....utils.tracing import AdminAPIMessageTracingSchema, get_timer, trace_event
 from ....wallet.util import default_did_from_verkey
 from ...out_of_band.v1_0.models.oob_record import OobRecord
@@ -97,7 +101,7 @@ class V10CredentialExchangeListQueryStringSchema(PaginatedQuerySchema):
     )
 
 
-class V10CredentialExchangeListResultSchema(OpenAPISchema):
+class V10CredentialExchangeListResultSchema(PaginatedResultSchema):
     """Result schema for Aries#0036 v1.0 credential exchange query."""
 
     results = fields.List(
@@ -415,23 +419,44 @@ async def credential_exchange_list(request: web.BaseRequest):
     }
 
     limit, offset, order_by, descending = get_paginated_query_params(request)
+    cursor = get_cursor_query_param(request)
+    include_total = get_include_total_query_param(request)
 
     try:
         async with context.profile.session() as session:
-            records = await V10CredentialExchange.query(
-                session=session,
-                tag_filter=tag_filter,
-                limit=limit,
-                offset=offset,
-                order_by=order_by,
-                descending=descending,
-                post_filter_positive=post_filter,
-            )
+            if cursor is not None:
+                records, next_cursor = await V10CredentialExchange.query_page(
+                    session=session,
+                    tag_filter=tag_filter,
+                    limit=limit,
+                    cursor=cursor,
+                    descending=descending,
+                    post_filter_positive=post_filter,
+                )
+            else:
+                records = await V10CredentialExchange.query(
+                    session=session,
+                    tag_filter=tag_filter,
+                    limit=limit,
+                    offset=offset,
+                    order_by=order_by,
+                    descending=descending,
+                    post_filter_positive=post_filter,
+                )
+            if include_total:
+                total = await V10CredentialExchange.count(
+                    session, tag_filter, post_filter_positive=post_filter
+                )
         results = [record.serialize() for record in records]
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    return web.json_response({"results": results})
+    response = {"results": results}
+    if cursor is not None:
+        response["next_cursor"] = next_cursor
+    if include_total:
+        response["total"] = total
+    return web.json_response(response, dumps=json_codec.dumps)
 
 
 @docs(
@@ -48,7 +48,8 @@ class TestCredentialRoutes(IsolatedAsyncioTestCase):
             with mock.patch.object(test_module.web, "json_response") as mock_response:
                 await test_module.credential_exchange_list(self.request)
                 mock_response.assert_called_once_with(
-                    {"results": [mock_cred_ex.serialize.return_value]}
+                    {"results": [mock_cred_ex.serialize.return_value]},
+                    dumps=test_module.json_codec.dumps,
                 )
 
     async def test_credential_exchange_list_x(self):
@@ -33,6 +33,11 @@ class V20CredExRecord(BaseExchangeRecord):
     RECORD_ID_NAME = "cred_ex_id"
     RECORD_TOPIC = "issue_credential_v2_0"
     TAG_NAMES = {"~thread_id"} if UNENCRYPTED_TAGS else {"thread_id"}
+    FILTER_TAG_NAMES = (
+        {"~connection_id", "~role", "~state"}
+        if UNENCRYPTED_TAGS
+        else {"connection_id", "role", "state"}
+    )
 
     INITIATOR_SELF = "self"
     INITIATOR_EXTERNAL = "external"
@@ -237,7 +242,7 @@ class V20CredExRecord(BaseExchangeRecord):
                     "cred_request",
                     "cred_issue",
                 )
-                if getattr(self, prop) is not None
+                if getattr(self, f"_{prop}") is not None
             },
         }
 
@@ -2,7 +2,7 @@
 
 import logging
 from json.decoder import JSONDecodeError
-from typing import Mapping, Optional
+from typing import Mapping, Optional, Sequence
 
 from aiohttp import web
 from aiohttp_apispec import (
@@ -15,11 +15,12 @@ from aiohttp_apispec import (
 from marshmallow import ValidationError, fields, validate, validates_schema
 
 from ....admin.decorators.auth import tenant_authentication
+from ....admin.decorators.session import shared_session
 from ....admin.request_context import AdminRequestContext
 from ....anoncreds.holder import AnonCredsHolderError
 from ....anoncreds.issuer import AnonCredsIssuerError
 from ....connections.models.conn_record import ConnRecord
-from ....core.profile import Profile
+from ....core.profile import Profile, ProfileSession
 from ....indy.holder import IndyHolderError
 from ....indy.issuer import IndyIssuerError
 from ....ledger.error import LedgerError
@@ -28,6 +29,9 @@ from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
 from ....messaging.models.paginated_query import (
     PaginatedQuerySchema,
+    PaginatedResultSchema,
+    get_cursor_query_param,
+    get_include_total_query_param,
     get_paginated_query_params,
 )
 from ....messaging.valid import (
@@ -46,6 +50,7 @@ from ....messaging.valid import (
     UUID4_VALIDATE,
 )
 from ....storage.error import StorageError, StorageNotFoundError
+from ....utils import json_codec
 from ....utils.tracing import AdminAPIMessageTracingSchema, get_timer, trace_event
 from ....vc.ld_proofs.error import LinkedDataProofException
 from ....wallet.util import default_did_from_verkey
@@ -119,7 +124,7 @@ class V20CredExRecordDetailSchema(OpenAPISchema):
     vc_di = fields.Nested(V20CredExRecordSchema, required=False)
 
 
-class V20CredExRecordListResultSchema(OpenAPISchema):
+class V20CredExRecordListResultSchema(PaginatedResultSchema):
     """Result schema for credential exchange record list query."""
 
     results = fields.List(
@@ -589,6 +594,32 @@ async def _get_attached_credentials(
     return result
 
 
+async def _get_attached_credentials_by_id(
+    session: ProfileSession, cred_ex_records: Sequence[V20CredExRecord]
+) -> Mapping[str, Mapping]:
+    """Fetch the detail records attached to several credential exchanges.
+
+    Runs one query per detail record type instead of one per exchange and format.
+    """
+    cred_ex_ids = [cxr.cred_ex_id for cxr in cred_ex_records]
+    result = {cred_ex_id: {} for cred_ex_id in cred_ex_ids}
+    if not cred_ex_ids:
+        return result
+
+    found = {}
+    for fmt in V20CredFormat.Format:
+        if fmt.detail not in found:
+            found[fmt.detail] = await fmt.detail.query(
+                session, {"cred_ex_id": {"$in": cred_ex_ids}}
+            )
+        for detail_record in found[fmt.detail]:
+            details = result.get(detail_record.cred_ex_id)
+            if details is not None:
+                details.setdefault(fmt.api, detail_record)
+
+    return result
+
+
 def _format_result_with_details(
     cred_ex_record: V20CredExRecord, details: Mapping
 ) -> Mapping:
@@ -630,29 +661,50 @@ async def credential_exchange_list(request: web.BaseRequest):
     }
 
     limit, offset, order_by, descending = get_paginated_query_params(request)
+    cursor = get_cursor_query_param(request)
+    include_total = get_include_total_query_param(request)
 
     try:
         async with profile.session() as session:
-            cred_ex_records = await V20CredExRecord.query(
-                session=session,
-                tag_filter=tag_filter,
-                limit=limit,
-                offset=offset,
-                order_by=order_by,
-                descending=descending,
-                post_filter_positive=post_filter,
-            )
+            if cursor is not None:
+                cred_ex_records, next_cursor = await V20CredExRecord.query_page(
+                    session=session,
+                    tag_filter=tag_filter,
+                    limit=limit,
+                    cursor=cursor,
+                    descending=descending,
+                    post_filter_positive=post_filter,
+                )
+            else:
+                cred_ex_records = await V20CredExRecord.query(
+                    session=session,
+                    tag_filter=tag_filter,
+                    limit=limit,
+                    offset=offset,
+                    order_by=order_by,
+                    descending=descending,
+                    post_filter_positive=post_filter,
+                )
+            if include_total:
+                total = await V20CredExRecord.count(
+                    session, tag_filter, post_filter_positive=post_filter
+                )
+            details = await _get_attached_credentials_by_id(session, cred_ex_records)
 
-        results = []
-        for cxr in cred_ex_records:
-            details = await _get_attached_credentials(profile, cxr)
-            result = _format_result_with_details(cxr, details)
-            results.append(result)
+        results = [
+            _format_result_with_details(cxr, details[cxr.cred_ex_id])
+            for cxr in cred_ex_records
+        ]
 
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    return web.json_response({"results": results})
+    response = {"results": results}
+    if cursor is not None:
+        response["next_cursor"] = next_cursor
+    if include_total:
+        response["total"] = total
+    return web.json_response(response, dumps=json_codec.dumps)
 
 
 @docs(
@@ -662,6 +714,7 @@ async def credential_exchange_list(request: web.BaseRequest):
 @match_info_schema(V20CredExIdMatchInfoSchema())
 @response_schema(V20CredExRecordDetailSchema(), 200, description="")
 @tenant_authentication
+@shared_session
 async def credential_exchange_retrieve(request: web.BaseRequest):
     """Request handler for fetching single credential exchange record.
 
@@ -12,6 +12,8 @@ from .. import routes as test_module
 from ..formats.indy.handler import IndyCredFormatHandler
 from ..formats.ld_proof.handler import LDProofCredFormatHandler
 from ..messages.cred_format import V20CredFormat
+from ..models.detail.indy import V20CredExRecordIndy
+from ..models.detail.ld_proof import V20CredExRecordLDProof
 from . import LD_PROOF_VC_DETAIL, TEST_DID
 
 
@@ -138,6 +140,45 @@ class TestV20CredRoutes(IsolatedAsyncioTestCase):
                 await test_module.credential_exchange_list(self.request)
                 mock_response.assert_called()
 
+    async def test_credential_exchange_list_details(self):
+        async with self.profile.session() as session:
+            cred_ex_records = []
+            for _ in range(3):
+                cxr = V20CredExRecord(
+                    connection_id="conn-123",
+                    role=V20CredExRecord.ROLE_ISSUER,
+                    state=V20CredExRecord.STATE_OFFER_SENT,
+                )
+                await cxr.save(session)
+                cred_ex_records.append(cxr)
+            await V20CredExRecordIndy(
+                cred_ex_id=cred_ex_records[0].cred_ex_id, cred_id_stored="indy-0"
+            ).save(session)
+            await V20CredExRecordLDProof(
+                cred_ex_id=cred_ex_records[1].cred_ex_id, cred_id_stored="ld-1"
+            ).save(session)
+
+        with (
+            mock.patch.object(V20CredFormat.Format, "handler") as mock_handler,
+            mock.patch.object(test_module.web, "json_response") as mock_response,
+        ):
+            await test_module.credential_exchange_list(self.request)
+            mock_handler.return_value.get_detail_record.assert_not_called()
+
+        results = {
+            result["cred_ex_record"]["cred_ex_id"]: result
+            for result in mock_response.call_args[0][0]["results"]
+        }
+        first, second, third = (results[cxr.cred_ex_id] for cxr in cred_ex_records)
+        assert first["indy"]["cred_id_stored"] == "indy-0"
+        assert first["vc_di"]["cred_id_stored"] == "indy-0"
+        assert first["ld_proof"] is None
+        assert second["ld_proof"]["cred_id_stored"] == "ld-1"
+        assert second["indy"] is None
+        assert third["anoncreds"] is None
+        assert third["indy"] is None
+        assert third["ld_proof"] is None
+
     async def test_credential_exchange_list_x(self):
         self.request.query = {
             "thread_id": "dummy",
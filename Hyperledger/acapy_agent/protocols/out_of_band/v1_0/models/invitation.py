@@ -75,7 +75,7 @@ class InvitationRecord(BaseExchangeRecord):
             **{
                 prop: getattr(self, f"_{prop}").ser
                 for prop in ("invitation",)
-                if getattr(self, prop) is not None
+                if getattr(self, f"_{prop}") is not None
             },
         }
 
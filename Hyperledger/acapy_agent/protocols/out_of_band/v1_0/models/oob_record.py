@@ -136,7 +136,7 @@ class OobRecord(BaseExchangeRecord):
             **{
                 prop: getattr(self, f"_{prop}").ser
                 for prop in ("invitation", "our_service", "their_service")
-                if getattr(self, prop) is not None
+                if getattr(self, f"_{prop}") is not None
             },
         }
 
@@ -37,6 +37,11 @@ class V10PresentationExchange(BaseExchangeRecord):
     RECORD_ID_NAME = "presentation_exchange_id"
     RECORD_TOPIC = "present_proof"
     TAG_NAMES = {"~thread_id"} if UNENCRYPTED_TAGS else {"thread_id"}
+    FILTER_TAG_NAMES = (
+        {"~connection_id", "~role", "~state"}
+        if UNENCRYPTED_TAGS
+        else {"connection_id", "role", "state"}
+    )
 
     INITIATOR_SELF = "self"
     INITIATOR_EXTERNAL = "external"
@@ -247,7 +252,7 @@ class V10PresentationExchange(BaseExchangeRecord):
                     "presentation_request_dict",
                     "presentation",
                 )
-                if getattr(self, prop) is not None
+                if getattr(self, f"_{prop}") is not None
             },
         }
         return retval
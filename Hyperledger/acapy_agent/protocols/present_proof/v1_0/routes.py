@@ -28,6 +28,9 @@ from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
 from ....messaging.models.paginated_query import (
     PaginatedQuerySchema,
+    PaginatedResultSchema,
+    get_cursor_query_param,
+    get_include_total_query_param,
     get_paginated_query_params,
 )
 from ....messaging.valid import (
@@ -42,6 +45,7 @@ from ....messaging.valid import (
 )
 from ....storage.base import DEFAULT_PAGE_SIZE, MAXIMUM_PAGE_SIZE
 from ....storage.error import StorageError, StorageNotFoundError
+from ....utils import json_codec
 from ....utils.tracing import AdminAPIMessageTracingSchema, get_timer, trace_event
 from ....wallet.error import WalletNotFoundError
 from . import problem_report_for_record, report_problem
@@ -95,7 +99,7 @@ class V10PresentationExchangeListQueryStringSchema(PaginatedQuerySchema):
     )
 
 
-class V10PresentationExchangeListSchema(OpenAPISchema):
+class V10PresentationExchangeListSchema(PaginatedResultSchema):
     """Result schema for an Aries RFC 37 v1.0 presentation exchange query."""
 
     results = fields.List(
@@ -329,23 +333,44 @@ async def presentation_exchange_list(request: web.BaseRequest):
     }
 
     limit, offset, order_by, descending = get_paginated_query_params(request)
+    cursor = get_cursor_query_param(request)
+    include_total = get_include_total_query_param(request)
 
     try:
         async with context.profile.session() as session:
-            records = await V10PresentationExchange.query(
-                session=session,
-                tag_filter=tag_filter,
-                limit=limit,
-                offset=offset,
-                order_by=order_by,
-                descending=descending,
-                post_filter_positive=post_filter,
-            )
+            if cursor is not None:
+                records, next_cursor = await V10PresentationExchange.query_page(
+                    session=session,
+                    tag_filter=tag_filter,
+                    limit=limit,
+                    cursor=cursor,
+                    descending=descending,
+                    post_filter_positive=post_filter,
+                )
+            else:
+                records = await V10PresentationExchange.query(
+                    session=session,
+                    tag_filter=tag_filter,
+                    limit=limit,
+                    offset=offset,
+                    order_by=order_by,
+                    descending=descending,
+                    post_filter_positive=post_filter,
+                )
+            if include_total:
+                total = await V10PresentationExchange.count(
+                    session, tag_filter, post_filter_positive=post_filter
+                )
         results = [record.serialize() for record in records]
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    return web.json_response({"results": results})
+    response = {"results": results}
+    if cursor is not None:
+        response["next_cursor"] = next_cursor
+    if include_total:
+        response["total"] = total
+    return web.json_response(response, dumps=json_codec.dumps)
 
 
 @docs(
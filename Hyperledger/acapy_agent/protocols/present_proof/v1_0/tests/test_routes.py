@@ -87,7 +87,8 @@ class TestProofRoutes(IsolatedAsyncioTestCase):
             with mock.patch.object(test_module.web, "json_response") as mock_response:
                 await test_module.presentation_exchange_list(self.request)
                 mock_response.assert_called_once_with(
-                    {"results": [mock_presentation_exchange.serialize.return_value]}
+                    {"results": [mock_presentation_exchange.serialize.return_value]},
+                    dumps=test_module.json_codec.dumps,
                 )
 
     async def test_presentation_exchange_list_x(self):
@@ -31,6 +31,11 @@ class V20PresExRecord(BaseExchangeRecord):
     RECORD_ID_NAME = "pres_ex_id"
     RECORD_TOPIC = "present_proof_v2_0"
     TAG_NAMES = {"~thread_id"} if UNENCRYPTED_TAGS else {"thread_id"}
+    FILTER_TAG_NAMES = (
+        {"~connection_id", "~role", "~state"}
+        if UNENCRYPTED_TAGS
+        else {"connection_id", "role", "state"}
+    )
 
     INITIATOR_SELF = "self"
     INITIATOR_EXTERNAL = "external"
@@ -234,7 +239,7 @@ class V20PresExRecord(BaseExchangeRecord):
                     "pres_request",
                     "pres",
                 )
-                if getattr(self, prop) is not None
+                if getattr(self, f"_{prop}") is not None
             },
         }
 
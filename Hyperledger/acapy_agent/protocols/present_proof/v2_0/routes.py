@@ -30,6 +30,9 @@ from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
 from ....messaging.models.paginated_query import (
     PaginatedQuerySchema,
+    PaginatedResultSchema,
+    get_cursor_query_param,
+    get_include_total_query_param,
     get_paginated_query_params,
 )
 from ....messaging.valid import (
@@ -46,6 +49,7 @@ from ....storage.base import DEFAULT_PAGE_SIZE, MAXIMUM_PAGE_SIZE, BaseStorage
 from ....storage.error import StorageError, StorageNotFoundError
 from ....storage.vc_holder.base import VCHolder
 from ....storage.vc_holder.vc_record import VCRecord
+from ....utils import json_codec
 from ....utils.tracing import AdminAPIMessageTracingSchema, get_timer, trace_event
 from ....vc.ld_proofs import (
     BbsBlsSignature2020,
@@ -112,7 +116,7 @@ class V20PresExRecordListQueryStringSchema(PaginatedQuerySchema):
     )
 
 
-class V20PresExRecordListSchema(OpenAPISchema):
+class V20PresExRecordListSchema(PaginatedResultSchema):
     """Result schema for a presentation exchange query."""
 
     results = fields.List(
@@ -487,23 +491,44 @@ async def present_proof_list(request: web.BaseRequest):
     }
 
     limit, offset, order_by, descending = get_paginated_query_params(request)
+    cursor = get_cursor_query_param(request)
+    include_total = get_include_total_query_param(request)
 
     try:
         async with profile.session() as session:
-            records = await V20PresExRecord.query(
-                session=session,
-                tag_filter=tag_filter,
-                limit=limit,
-                offset=offset,
-                order_by=order_by,
-                descending=descending,
-                post_filter_positive=post_filter,
-            )
+            if cursor is not None:
+                records, next_cursor = await V20PresExRecord.query_page(
+                    session=session,
+                    tag_filter=tag_filter,
+                    limit=limit,
+                    cursor=cursor,
+                    descending=descending,
+                    post_filter_positive=post_filter,
+                )
+            else:
+                records = await V20PresExRecord.query(
+                    session=session,
+                    tag_filter=tag_filter,
+                    limit=limit,
+                    offset=offset,
+                    order_by=order_by,
+                    descending=descending,
+                    post_filter_positive=post_filter,
+                )
+            if include_total:
+                total = await V20PresExRecord.count(
+                    session, tag_filter, post_filter_positive=post_filter
+                )
         results = [record.serialize() for record in records]
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    return web.json_response({"results": results})
+    response = {"results": results}
+    if cursor is not None:
+        response["next_cursor"] = next_cursor
+    if include_total:
+        response["total"] = total
+    return web.json_response(response, dumps=json_codec.dumps)
 
 
 @docs(
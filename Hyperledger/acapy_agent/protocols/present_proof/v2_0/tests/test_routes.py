@@ -270,7 +270,8 @@ class TestPresentProofRoutes(IsolatedAsyncioTestCase):
 
             await test_module.present_proof_list(self.request)
             mock_response.assert_called_once_with(
-                {"results": [mock_pres_ex_rec_inst.serialize.return_value]}
+                {"results": [mock_pres_ex_rec_inst.serialize.return_value]},
+                dumps=test_module.json_codec.dumps,
             )
 
     async def test_present_proof_list_x(self):
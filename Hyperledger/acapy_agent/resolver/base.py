@@ -8,7 +8,13 @@ from typing import NamedTuple, Optional, Pattern, Sequence, Text, Union
 
 from pydid import DID
 
-from ..cache.base import BaseCache
+from ..cache.base import (
+    DEFAULT_NEGATIVE_TTL,
+    NEGATIVE_RESULT_KEY,
+    BaseCache,
+    is_negative_result,
+    negative_result,
+)
 from ..config.injection_context import InjectionContext
 from ..core.error import BaseError
 from ..core.profile import Profile
@@ -67,10 +73,18 @@ class ResolutionResult:
         }
 
 
+def did_cache_tag(did: Union[str, DID]) -> str:
+    """Get the cache tag for entries derived from the document of a DID."""
+    return f"did::{did}"
+
+
 class BaseDIDResolver(ABC):
     """Base Class for DID Resolvers."""
 
     DEFAULT_TTL = 3600
+    # resolvers answering from the local wallet must not cache a missing DID,
+    # since it resolves as soon as the wallet stores it
+    CACHE_NOT_FOUND = True
 
     def __init__(self, type_: Optional[ResolverType] = None):
         """Initialize BaseDIDResolver.
@@ -151,19 +165,57 @@ class BaseDIDResolver(ABC):
                 f"{self.__class__.__name__} does not support DID method for: {did}"
             )
 
-        cache_key = f"resolver::{type(self).__name__}::{did}"
         cache = profile.inject_or(BaseCache)
         if cache:
-            async with cache.acquire(cache_key) as entry:
+            async with cache.acquire(self._cache_key(did)) as entry:
                 if entry.result:
+                    if is_negative_result(entry.result):
+                        raise DIDNotFound(entry.result[NEGATIVE_RESULT_KEY])
+                    if entry.refresh_due:
+                        entry.refresh(
+                            lambda: self._resolve(profile, did, service_accept),
+                            self.DEFAULT_TTL,
+                        )
                     return entry.result
                 else:
-                    result = await self._resolve(profile, did, service_accept)
-                    await entry.set_result(result, ttl=self.DEFAULT_TTL)
+                    try:
+                        result = await self._resolve(profile, did, service_accept)
+                    except DIDNotFound as err:
+                        negative_ttl = profile.settings.get(
+                            "cache.negative_ttl", DEFAULT_NEGATIVE_TTL
+                        )
+                        if negative_ttl and self.CACHE_NOT_FOUND:
+                            await entry.set_result(
+                                negative_result(str(err)),
+                                ttl=negative_ttl,
+                                tags=[did_cache_tag(did)],
+                            )
+                        raise
+                    await entry.set_result(
+                        result,
+                        ttl=self.DEFAULT_TTL,
+                        refresh_ahead=True,
+                        tags=[did_cache_tag(did)],
+                    )
                     return result
 
         return await self._resolve(profile, did, service_accept)
 
+    def _cache_key(self, did: str) -> str:
+        """Get the cache key for the resolution result of a DID."""
+        return f"resolver::{type(self).__name__}::{did}"
+
+    async def clear_cache(self, profile: Profile, did: Union[str, DID]):
+        """Clear the cached resolution result for a DID, including a not-found result.
+
+        Args:
+            profile: The profile holding the cache
+            did: The DID to clear
+        """
+        cache = profile.inject_or(BaseCache)
+        if cache:
+            await cache.clear(self._cache_key(str(did)))
+
     @abstractmethod
     async def _resolve(
         self,
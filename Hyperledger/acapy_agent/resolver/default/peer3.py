@@ -25,6 +25,7 @@ LOGGER = logging.getLogger(__name__)
 class PeerDID3Resolver(BaseDIDResolver):
     """Peer DID Resolver."""
 
+    CACHE_NOT_FOUND = False
     RECORD_TYPE_3_TO_2 = "peer3_to_peer2"
 
     def __init__(self):
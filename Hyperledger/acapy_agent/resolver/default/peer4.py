@@ -25,6 +25,7 @@ from ..base import BaseDIDResolver, DIDNotFound, ResolverType
 class PeerDID4Resolver(BaseDIDResolver):
     """Peer DID 4 Resolver."""
 
+    CACHE_NOT_FOUND = False
     RECORD_TYPE = "long_peer_did_4_doc"
 
     def __init__(self):
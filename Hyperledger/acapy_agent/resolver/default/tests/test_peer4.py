@@ -2,6 +2,8 @@
 
 import pytest
 
+from ....cache.base import BaseCache
+from ....cache.in_memory import InMemoryCache
 from ....core.event_bus import EventBus
 from ....core.profile import Profile
 from ....utils.testing import create_test_profile
@@ -54,3 +56,17 @@ async def test_resolve_x_no_long(profile: Profile, resolver: PeerDID4Resolver):
     """Test resolver setup."""
     with pytest.raises(test_module.DIDNotFound):
         await resolver.resolve(profile, TEST_SHORT_DP4)
+
+
+@pytest.mark.asyncio
+async def test_resolve_short_after_not_found(
+    profile: Profile, resolver: PeerDID4Resolver
+):
+    profile.context.injector.bind_instance(BaseCache, InMemoryCache())
+    with pytest.raises(test_module.DIDNotFound):
+        await resolver.resolve(profile, TEST_SHORT_DP4)
+
+    # the miss is not cached once the long form has been stored
+    await resolver.resolve(profile, TEST_LONG_DP4)
+    short_doc = await resolver.resolve(profile, TEST_SHORT_DP4)
+    assert short_doc["id"] == TEST_SHORT_DP4
@@ -14,6 +14,7 @@ import pydid
 from pydid import DID, DIDError, DIDUrl, Resource, VerificationMethod
 from pydid.doc.doc import BaseDIDDocument, IDNotFoundError
 
+from ..cache.base import BaseCache
 from ..core.profile import Profile
 from .base import (
     BaseDIDResolver,
@@ -22,6 +23,7 @@ from .base import (
     ResolutionMetadata,
     ResolutionResult,
     ResolverError,
+    did_cache_tag,
 )
 
 LOGGER = logging.getLogger(__name__)
@@ -87,6 +89,20 @@ class DIDResolver:
         _, doc = await self._resolve(profile, did, service_accept, timeout=timeout)
         return doc
 
+    async def clear_cache(self, profile: Profile, did: Union[str, DID]):
+        """Clear cached resolution results for a DID from all resolvers.
+
+        Use this when a DID is known to have been created or updated, so that
+        neither a stale document nor a cached not-found result is returned.
+        Cached values derived from the DID document, such as connection targets,
+        are cleared as well.
+        """
+        cache = profile.inject_or(BaseCache)
+        if cache:
+            await cache.clear_tag(did_cache_tag(did))
+        for resolver in self.resolvers:
+            await resolver.clear_cache(profile, did)
+
     async def resolve_with_metadata(
         self, profile: Profile, did: Union[str, DID], *, timeout: Optional[int] = None
     ) -> ResolutionResult:
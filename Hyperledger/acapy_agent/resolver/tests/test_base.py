@@ -6,7 +6,10 @@ from unittest import mock
 import pytest
 from pydid import DIDDocument
 
-from ..base import BaseDIDResolver, DIDMethodNotSupported, ResolverType
+from ...cache.base import BaseCache
+from ...cache.in_memory import InMemoryCache
+from ...utils.testing import create_test_profile
+from ..base import BaseDIDResolver, DIDMethodNotSupported, DIDNotFound, ResolverType
 
 
 class ExampleDIDResolver(BaseDIDResolver):
@@ -81,3 +84,57 @@ async def test_supported_methods():
         assert await TestDIDResolver().supports(
             profile, "did:example:WgWxqztrNooG92RXvxSTWv"
         )
+
+
+@pytest.mark.asyncio
+async def test_resolve_caches_not_found(native_resolver):
+    profile = await create_test_profile()
+    profile.context.injector.bind_instance(BaseCache, InMemoryCache())
+    native_resolver._resolve = mock.AsyncMock(side_effect=DIDNotFound("not found"))
+
+    for _ in range(2):
+        with pytest.raises(DIDNotFound) as x_did:
+            await native_resolver.resolve(profile, "did:example:123")
+        assert "not found" in str(x_did.value)
+    native_resolver._resolve.assert_awaited_once()
+
+    await native_resolver.clear_cache(profile, "did:example:123")
+    native_resolver._resolve = mock.AsyncMock(return_value={"id": "did:example:123"})
+    assert await native_resolver.resolve(profile, "did:example:123") == {
+        "id": "did:example:123"
+    }
+
+
+@pytest.mark.asyncio
+async def test_resolve_not_found_negative_caching_disabled(native_resolver):
+    profile = await create_test_profile(settings={"cache.negative_ttl": 0})
+    profile.context.injector.bind_instance(BaseCache, InMemoryCache())
+    native_resolver._resolve = mock.AsyncMock(side_effect=DIDNotFound("not found"))
+
+    for _ in range(2):
+        with pytest.raises(DIDNotFound):
+            await native_resolver.resolve(profile, "did:example:123")
+    assert native_resolver._resolve.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_resolve_refresh_ahead(native_resolver):
+    profile = await create_test_profile()
+    cache = InMemoryCache()
+    cache.enable_refresh_ahead(1, grace=60)
+    profile.context.injector.bind_instance(BaseCache, cache)
+    native_resolver._resolve = mock.AsyncMock(
+        side_effect=[{"id": "did:example:123"}, {"id": "did:example:123", "v": 2}]
+    )
+
+    assert await native_resolver.resolve(profile, "did:example:123") == {
+        "id": "did:example:123"
+    }
+    # the stale result is returned while the refresh runs in the background
+    assert await native_resolver.resolve(profile, "did:example:123") == {
+        "id": "did:example:123"
+    }
+    cache_key = native_resolver._cache_key("did:example:123")
+    await cache._refresh_tasks[cache_key]
+    assert await cache.get(cache_key) == {"id": "did:example:123", "v": 2}
+    assert native_resolver._resolve.await_count == 2
@@ -6,6 +6,7 @@ from typing import Pattern
 import pytest
 from pydid import DID, BasicDIDDocument, DIDDocument, VerificationMethod
 
+from ...tests import mock
 from ...utils.testing import create_test_profile
 from ..base import (
     BaseDIDResolver,
@@ -207,3 +208,13 @@ async def test_resolve_did_x_not_found(profile):
     resolver = DIDResolver([cowsay_resolver_not_found])
     with pytest.raises(DIDNotFound):
         await resolver.resolve(profile, py_did)
+
+
+@pytest.mark.asyncio
+async def test_clear_cache(resolver, profile):
+    with mock.patch.object(
+        MockResolver, "clear_cache", mock.CoroutineMock()
+    ) as mock_clear_cache:
+        await resolver.clear_cache(profile, TEST_DID0)
+        assert mock_clear_cache.await_count == len(resolver.resolvers)
+        mock_clear_cache.assert_awaited_with(profile, TEST_DID0)
@@ -179,7 +179,7 @@ class IssuerRevRegRecord(BaseRecord):
                     "revoc_reg_def",
                     "revoc_reg_entry",
                 )
-                if getattr(self, prop) is not None
+                if getattr(self, f"_{prop}") is not None
             },
         }
 
@@ -2,14 +2,17 @@
 
 from typing import Mapping, Optional, Sequence
 
-from aries_askar import AskarError, AskarErrorCode, Session
+from aries_askar import AskarError, AskarErrorCode, Entry, Session
 
 from ..askar.profile import AskarProfile, AskarProfileSession
 from .base import (
     DEFAULT_PAGE_SIZE,
+    SORT_KEY_TAG,
     BaseStorage,
     BaseStorageSearch,
     BaseStorageSearchSession,
+    keyset_query,
+    sort_keyset_page,
     validate_record,
 )
 from .error import (
@@ -21,6 +24,42 @@ from .error import (
 from .record import StorageRecord
 
 
+def _entry_value(entry: Entry) -> str:
+    """Decode an entry value straight from the Askar buffer."""
+    return str(entry.raw_value, "utf-8")
+
+
+async def _insert(handle: Session, record: StorageRecord):
+    try:
+        await handle.insert(record.type, record.id, record.value, record.tags)
+    except AskarError as err:
+        if err.code == AskarErrorCode.DUPLICATE:
+            raise StorageDuplicateError(
+                f"Duplicate record: {record.type}/{record.id}"
+            ) from None
+        raise StorageError("Error when adding storage record") from err
+
+
+async def _replace(handle: Session, record: StorageRecord, value: str, tags: Mapping):
+    try:
+        await handle.replace(record.type, record.id, value, tags)
+    except AskarError as err:
+        if err.code == AskarErrorCode.NOT_FOUND:
+            raise StorageNotFoundError("Record not found") from None
+        raise StorageError("Error when updating storage record value") from err
+
+
+async def _remove(handle: Session, record: StorageRecord):
+    try:
+        await handle.remove(record.type, record.id)
+    except AskarError as err:
+        if err.code == AskarErrorCode.NOT_FOUND:
+            raise StorageNotFoundError(
+                f"Record not found: {record.type}/{record.id}"
+            ) from None
+        raise StorageError("Error when removing storage record") from err
+
+
 class AskarStorage(BaseStorage):
     """Aries-Askar Non-Secrets interface."""
 
@@ -45,16 +84,7 @@ class AskarStorage(BaseStorage):
 
         """
         validate_record(record)
-        try:
-            await self._session.handle.insert(
-                record.type, record.id, record.value, record.tags
-            )
-        except AskarError as err:
-            if err.code == AskarErrorCode.DUPLICATE:
-                raise StorageDuplicateError(
-                    f"Duplicate record: {record.type}/{record.id}"
-                ) from None
-            raise StorageError("Error when adding storage record") from err
+        await _insert(self._session.handle, record)
 
     async def get_record(
         self, record_type: str, record_id: str, options: Optional[Mapping] = None
@@ -92,7 +122,7 @@ class AskarStorage(BaseStorage):
         return StorageRecord(
             type=item.category,
             id=item.name,
-            value=None if item.value is None else item.value.decode("utf-8"),
+            value=_entry_value(item),
             tags=item.tags or {},
         )
 
@@ -110,12 +140,7 @@ class AskarStorage(BaseStorage):
 
         """
         validate_record(record)
-        try:
-            await self._session.handle.replace(record.type, record.id, value, tags)
-        except AskarError as err:
-            if err.code == AskarErrorCode.NOT_FOUND:
-                raise StorageNotFoundError("Record not found") from None
-            raise StorageError("Error when updating storage record value") from err
+        await _replace(self._session.handle, record, value, tags)
 
     async def delete_record(self, record: StorageRecord):
         """Delete a record.
@@ -129,15 +154,59 @@ class AskarStorage(BaseStorage):
 
         """
         validate_record(record, delete=True)
-        try:
-            await self._session.handle.remove(record.type, record.id)
-        except AskarError as err:
-            if err.code == AskarErrorCode.NOT_FOUND:
-                raise StorageNotFoundError(
-                    f"Record not found: {record.type}/{record.id}"
-                ) from None
-            else:
-                raise StorageError("Error when removing storage record") from err
+        await _remove(self._session.handle, record)
+
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """Add several new records to the store.
+
+        Within a transaction the batch is committed or rolled back as a whole.
+
+        Args:
+            records: the `StorageRecord`s to be stored
+
+        Raises:
+            StorageDuplicateError: If any record already exists
+
+        """
+        for record in records:
+            validate_record(record)
+        # the batch shares the session connection rather than opening another
+        for record in records:
+            await _insert(self._session.handle, record)
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """Replace the values and tags of several stored records.
+
+        Within a transaction the batch is committed or rolled back as a whole.
+
+        Args:
+            records: the `StorageRecord`s holding the new values and tags
+
+        Raises:
+            StorageNotFoundError: If any record is not found
+
+        """
+        for record in records:
+            validate_record(record)
+        for record in records:
+            await _replace(self._session.handle, record, record.value, record.tags)
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """Delete several records.
+
+        Within a transaction the batch is committed or rolled back as a whole.
+
+        Args:
+            records: the `StorageRecord`s to delete
+
+        Raises:
+            StorageNotFoundError: If any record is not found
+
+        """
+        for record in records:
+            validate_record(record, delete=True)
+        for record in records:
+            await _remove(self._session.handle, record)
 
     async def find_record(
         self, type_filter: str, tag_query: Mapping, options: Optional[Mapping] = None
@@ -164,7 +233,7 @@ class AskarStorage(BaseStorage):
         return StorageRecord(
             type=row.category,
             id=row.name,
-            value=None if row.value is None else row.value.decode("utf-8"),
+            value=_entry_value(row),
             tags=row.tags,
         )
 
@@ -205,12 +274,58 @@ class AskarStorage(BaseStorage):
                 StorageRecord(
                     type=row.category,
                     id=row.name,
-                    value=None if row.value is None else row.value.decode("utf-8"),
+                    value=_entry_value(row),
                     tags=row.tags,
                 ),
             )
         return results
 
+    async def find_keyset_records(
+        self,
+        type_filter: str,
+        tag_query: Optional[Mapping] = None,
+        after: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        descending: bool = False,
+    ) -> Sequence[StorageRecord]:
+        """Retrieve a page of records ordered by their sort key.
+
+        The store can only order rows by insertion, which matches the sort key
+        order unless records were imported or created out of order. A page is
+        read in insertion order and checked with a count of the rows in its key
+        range; only when the count disagrees is the whole range fetched.
+
+        Args:
+            type_filter: The type of records to filter by
+            tag_query: An optional dictionary of tag filter clauses
+            after: The sort key of the last record on the previous page
+            limit: The maximum number of records to retrieve
+            descending: Whether to order the records in descending order
+
+        Returns:
+            A sequence of StorageRecord following the given sort key.
+        """
+        query = keyset_query(tag_query, after, descending)
+        rows = await self.find_paginated_records(
+            type_filter, query, limit=limit, order_by="id", descending=descending
+        )
+        if len(rows) == limit:
+            keys = [row.tags[SORT_KEY_TAG] for row in rows]
+            boundary = min(keys) if descending else max(keys)
+            bounded = {
+                "$and": [
+                    query,
+                    {SORT_KEY_TAG: {"$gte" if descending else "$lte": boundary}},
+                ]
+            }
+            try:
+                count = await self._session.handle.count(type_filter, bounded)
+            except AskarError as err:
+                raise StorageError("Failed to count records") from err
+            if count != limit:
+                rows = await self.find_all_records(type_filter, bounded)
+        return sort_keyset_page(rows, limit, descending)
+
     async def find_all_records(
         self,
         type_filter: str,
@@ -233,12 +348,21 @@ class AskarStorage(BaseStorage):
                 StorageRecord(
                     type=row.category,
                     id=row.name,
-                    value=None if row.value is None else row.value.decode("utf-8"),
+                    value=_entry_value(row),
                     tags=row.tags,
                 )
             )
         return results
 
+    async def count_records(
+        self, type_filter: str, tag_query: Optional[Mapping] = None
+    ) -> int:
+        """Count the records matching a particular type filter and tag query."""
+        try:
+            return await self._session.handle.count(type_filter, tag_query)
+        except AskarError as err:
+            raise StorageError("Failed to count records") from err
+
     async def delete_all_records(
         self,
         type_filter: str,
@@ -352,7 +476,7 @@ class AskarStorageSearchSession(BaseStorageSearchSession):
         return StorageRecord(
             type=row.category,
             id=row.name,
-            value=None if row.value is None else row.value.decode("utf-8"),
+            value=_entry_value(row),
             tags=row.tags,
         )
 
@@ -376,7 +500,8 @@ class AskarStorageSearchSession(BaseStorageSearchSession):
             raise StorageSearchError("Search query is complete")
 
         limit = max_count or self.page_size
-        await self._open(limit=limit, offset=offset)
+        # the scan spans every page, so it is not limited to this one
+        await self._open(offset=offset)
 
         count = 0
         ret = []
@@ -393,7 +518,7 @@ class AskarStorageSearchSession(BaseStorageSearchSession):
                 StorageRecord(
                     type=row.category,
                     id=row.name,
-                    value=None if row.value is None else row.value.decode("utf-8"),
+                    value=_entry_value(row),
                     tags=row.tags,
                 )
             )
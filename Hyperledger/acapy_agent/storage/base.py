@@ -9,6 +9,9 @@ from .record import StorageRecord
 DEFAULT_PAGE_SIZE = 100
 MAXIMUM_PAGE_SIZE = 10000
 
+# plaintext tag holding the key used to order records for keyset pagination
+SORT_KEY_TAG = "~sort_key"
+
 
 def validate_record(record: StorageRecord, *, delete=False):
     """Ensure that a record is ready to be saved/updated/deleted."""
@@ -22,6 +25,30 @@ def validate_record(record: StorageRecord, *, delete=False):
         raise StorageError("Record must have a non-empty value")
 
 
+def keyset_query(
+    tag_query: Optional[Mapping], after: Optional[str], descending: bool = False
+) -> Mapping:
+    """Restrict a tag query to the records following a sort key.
+
+    Records without a sort key tag never match the returned query.
+    """
+    if after is None:
+        clause = {SORT_KEY_TAG: {"$gt": ""}}
+    else:
+        clause = {SORT_KEY_TAG: {"$lt" if descending else "$gt": after}}
+    return {"$and": [tag_query, clause]} if tag_query else clause
+
+
+def sort_keyset_page(
+    records: Sequence[StorageRecord], limit: int, descending: bool = False
+) -> Sequence[StorageRecord]:
+    """Order records by their sort key tag and return the first `limit` of them."""
+    ordered = sorted(
+        records, key=lambda record: record.tags[SORT_KEY_TAG], reverse=descending
+    )
+    return ordered[:limit]
+
+
 class BaseStorage(ABC):
     """Abstract stored records interface."""
 
@@ -50,6 +77,34 @@ class BaseStorage(ABC):
 
         """
 
+    async def get_records(
+        self,
+        record_type: str,
+        record_ids: Sequence[str],
+        options: Optional[Mapping] = None,
+    ) -> Sequence[StorageRecord]:
+        """Fetch several records from the store by type and ID.
+
+        The records are fetched using this storage session, in the order of
+        `record_ids`. IDs without a matching record are skipped.
+
+        Args:
+            record_type: The record type
+            record_ids: The record ids
+            options: A dictionary of backend-specific options
+
+        Returns:
+            A sequence of `StorageRecord` instances
+
+        """
+        results = []
+        for record_id in dict.fromkeys(record_ids):
+            try:
+                results.append(await self.get_record(record_type, record_id, options))
+            except StorageNotFoundError:
+                pass
+        return results
+
     @abstractmethod
     async def update_record(self, record: StorageRecord, value: str, tags: Mapping):
         """Update an existing stored record's value and tags.
@@ -70,6 +125,45 @@ class BaseStorage(ABC):
 
         """
 
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """Add several new records to the store.
+
+        When the session is a transaction, backends supporting transactions
+        commit or roll back the batch as a whole.
+
+        Args:
+            records: the `StorageRecord`s to be stored
+
+        """
+        for record in records:
+            await self.add_record(record)
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """Replace the values and tags of several stored records.
+
+        When the session is a transaction, backends supporting transactions
+        commit or roll back the batch as a whole.
+
+        Args:
+            records: the `StorageRecord`s holding the new values and tags
+
+        """
+        for record in records:
+            await self.update_record(record, record.value, record.tags)
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """Delete several records.
+
+        When the session is a transaction, backends supporting transactions
+        commit or roll back the batch as a whole.
+
+        Args:
+            records: the `StorageRecord`s to delete
+
+        """
+        for record in records:
+            await self.delete_record(record)
+
     async def find_record(
         self,
         type_filter: str,
@@ -116,6 +210,35 @@ class BaseStorage(ABC):
             A sequence of StorageRecord matching the filter and query parameters.
         """
 
+    async def find_keyset_records(
+        self,
+        type_filter: str,
+        tag_query: Optional[Mapping] = None,
+        after: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        descending: bool = False,
+    ) -> Sequence[StorageRecord]:
+        """Retrieve a page of records ordered by their sort key.
+
+        Records are ordered by the `SORT_KEY_TAG` tag, and records without this
+        tag are skipped. Unlike an offset, the sort key of the last record on a
+        page stays valid when records are added or removed between requests.
+
+        Args:
+            type_filter: The type of records to filter by
+            tag_query: An optional dictionary of tag filter clauses
+            after: The sort key of the last record on the previous page
+            limit: The maximum number of records to retrieve
+            descending: Whether to order the records in descending order
+
+        Returns:
+            A sequence of StorageRecord following the given sort key.
+        """
+        rows = await self.find_all_records(
+            type_filter, keyset_query(tag_query, after, descending)
+        )
+        return sort_keyset_page(rows, limit, descending)
+
     @abstractmethod
     async def find_all_records(
         self,
@@ -135,6 +258,24 @@ class BaseStorage(ABC):
             options: Additional options for the query.
         """
 
+    async def count_records(
+        self, type_filter: str, tag_query: Optional[Mapping] = None
+    ) -> int:
+        """Count the records matching a particular type filter and tag query.
+
+        Backends supporting a native count query override this to avoid fetching
+        the records.
+
+        Args:
+            type_filter: The type of records to filter by.
+            tag_query: An optional dictionary of tag filter clauses.
+
+        Returns:
+            The number of matching records
+
+        """
+        return len(await self.find_all_records(type_filter, tag_query))
+
     @abstractmethod
     async def delete_all_records(
         self,
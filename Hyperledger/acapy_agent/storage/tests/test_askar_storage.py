@@ -7,11 +7,17 @@ import pytest
 from ...askar.profile import AskarProfileManager
 from ...config.injection_context import InjectionContext
 from ...tests import mock
+from ...utils.testing import create_test_profile
 from ...wallet.askar import AskarWallet
 from .. import askar as test_module
 from ..askar import AskarStorage
-from ..base import BaseStorage
-from ..error import StorageError, StorageSearchError
+from ..base import SORT_KEY_TAG, BaseStorage, BaseStorageSearch
+from ..error import (
+    StorageDuplicateError,
+    StorageError,
+    StorageNotFoundError,
+    StorageSearchError,
+)
 from ..record import StorageRecord
 
 
@@ -310,6 +316,117 @@ class TestAskarStorage:
                 with pytest.raises(StorageSearchError):
                     await search.close()
 
+    @pytest.mark.asyncio
+    async def test_find_keyset_records(self):
+        profile = await create_test_profile()
+        async with profile.session() as session:
+            await self._check_keyset_pages(session.inject(BaseStorage))
+
+    async def _check_keyset_pages(self, store):
+        # inserted out of key order, so some pages need the full range fetched
+        for key in ("3", "1", "5", "2", "6", "4"):
+            await store.add_record(
+                StorageRecord("TYPE", "TEST", {SORT_KEY_TAG: key}, id=f"id{key}")
+            )
+        await store.add_record(StorageRecord("TYPE", "TEST", {}, id="untagged"))
+
+        async def pages(find, descending):
+            ids, after = [], None
+            while True:
+                rows = await find("TYPE", after=after, limit=2, descending=descending)
+                ids.extend(row.id for row in rows)
+                if len(rows) < 2:
+                    return ids
+                after = rows[-1].tags[SORT_KEY_TAG]
+
+        expected = [f"id{key}" for key in "123456"]
+        assert await pages(store.find_keyset_records, False) == expected
+        assert await pages(store.find_keyset_records, True) == expected[::-1]
+
+        def fallback(*args, **kwargs):
+            return BaseStorage.find_keyset_records(store, *args, **kwargs)
+
+        assert await pages(fallback, False) == expected
+        assert await pages(fallback, True) == expected[::-1]
+
+        rows = await store.find_keyset_records(
+            "TYPE", {"$not": {SORT_KEY_TAG: "2"}}, after="1", limit=2
+        )
+        assert [row.id for row in rows] == ["id3", "id4"]
+
+    @pytest.mark.asyncio
+    async def test_search_fetch_pages(self):
+        profile = await create_test_profile()
+        async with profile.session() as session:
+            storage = session.inject(BaseStorage)
+            for i in range(5):
+                await storage.add_record(StorageRecord("TYPE", "TEST", {}, id=f"id{i}"))
+
+        search = profile.inject(BaseStorageSearch).search_records("TYPE", page_size=2)
+        pages = [await search.fetch() for _ in range(4)]
+        assert [len(page) for page in pages] == [2, 2, 1, 0]
+        assert search._done
+
+    @pytest.mark.asyncio
+    async def test_batch_records(self):
+        profile = await create_test_profile()
+        records = [
+            StorageRecord("TYPE", "TEST", {"a": "1"}, id=f"id{i}") for i in range(3)
+        ]
+        async with profile.session() as session:
+            storage = session.inject(BaseStorage)
+            await storage.add_records(records)
+            assert len(await storage.find_all_records("TYPE")) == 3
+
+            await storage.update_records(
+                [record._replace(value="NEW", tags={"a": "2"}) for record in records]
+            )
+            found = await storage.find_all_records("TYPE", {"a": "2"})
+            assert {record.value for record in found} == {"NEW"}
+
+        # a failed batch in a transaction is rolled back as a whole
+        async with profile.transaction() as txn:
+            storage = txn.inject(BaseStorage)
+            with pytest.raises(StorageDuplicateError):
+                await storage.add_records(
+                    [StorageRecord("TYPE", "TEST", {}, id="id3"), records[0]]
+                )
+            await txn.rollback()
+        async with profile.transaction() as txn:
+            storage = txn.inject(BaseStorage)
+            with pytest.raises(StorageNotFoundError):
+                await storage.delete_records(
+                    [records[0], StorageRecord("TYPE", "TEST", {}, id="missing")]
+                )
+            await txn.rollback()
+        async with profile.session() as session:
+            storage = session.inject(BaseStorage)
+            assert len(await storage.find_all_records("TYPE")) == 3
+
+        async with profile.transaction() as txn:
+            await txn.inject(BaseStorage).delete_records(records[:2])
+            await txn.rollback()
+        async with profile.session() as session:
+            storage = session.inject(BaseStorage)
+            assert len(await storage.find_all_records("TYPE")) == 3
+            await storage.delete_records(records)
+            assert not await storage.find_all_records("TYPE")
+
+    @pytest.mark.asyncio
+    async def test_count_records(self):
+        profile = await create_test_profile()
+        async with profile.session() as session:
+            storage = session.inject(BaseStorage)
+            await storage.add_records(
+                [
+                    StorageRecord("TYPE", "TEST", {"a": str(i % 2)}, id=f"id{i}")
+                    for i in range(5)
+                ]
+            )
+            assert await storage.count_records("TYPE") == 5
+            assert await storage.count_records("TYPE", {"a": "1"}) == 2
+            assert await storage.count_records("OTHER") == 0
+
     # TODO get these to run in docker ci/cd
     @pytest.mark.skip
     @pytest.mark.asyncio
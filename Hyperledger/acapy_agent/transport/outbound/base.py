@@ -37,12 +37,15 @@ class QueuedOutboundMessage:
         self.payload: Union[str, bytes] = None
         self.retries = None
         self.retry_at: Optional[float] = None
+        self.attempts = 0
+        self.first_attempt_at: Optional[float] = None
         self.state = self.STATE_NEW
         self.target = target
         self.task: asyncio.Task = None
         self.transport_id: str = transport_id
         self.metadata: Optional[dict] = None
         self.api_key: Optional[str] = None
+        self.queue_id: Optional[str] = None
 
 
 class BaseOutboundTransport(ABC):
@@ -0,0 +1,226 @@
+"""Per-endpoint circuit breakers for outbound delivery."""
+
+import logging
+from collections import deque
+from enum import Enum
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from ...utils.stats import Collector
+from .base import QueuedOutboundMessage
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RESET_TIMEOUT = 30.0
+
+
+class CircuitState(Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class Admission(Enum):
+    """Outcome of a request to deliver a message to an endpoint."""
+
+    ALLOW = "allow"
+    WAIT = "wait"
+    OPEN = "open"
+
+
+class EndpointCircuit:
+    """Health of a single endpoint."""
+
+    def __init__(self):
+        """Initialize an `EndpointCircuit` instance."""
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.in_flight = 0
+        self.retry_at: Optional[float] = None
+        self.parked = deque()
+
+    @property
+    def idle(self) -> bool:
+        """Check whether the endpoint needs no tracking."""
+        return (
+            self.state == CircuitState.CLOSED
+            and not self.failures
+            and not self.in_flight
+            and not self.parked
+        )
+
+
+class EndpointCircuitBreakers:
+    """Track endpoint health and limit outbound delivery to each endpoint.
+
+    After `failure_threshold` consecutive failed deliveries to an endpoint its
+    circuit opens, and messages for it are not sent until `reset_timeout`
+    seconds have passed. A single probe message is then allowed through: the
+    circuit closes if it is delivered and opens again otherwise. Messages
+    waiting on a probe or on an in-flight slot are parked and handed back as
+    soon as they may be sent.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        max_in_flight: Optional[int] = None,
+        collector: Optional[Collector] = None,
+    ):
+        """Initialize an `EndpointCircuitBreakers` instance.
+
+        Args:
+            failure_threshold: The number of consecutive failures opening the
+                circuit of an endpoint, or `None` to never open circuits
+            reset_timeout: The number of seconds a circuit stays open before a
+                probe message is sent
+            max_in_flight: The maximum number of concurrent deliveries to an
+                endpoint, or `None` for no limit
+            collector: The stats collector to report circuit events to
+
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_in_flight = max_in_flight
+        self.collector = collector
+        self.circuits: Dict[str, EndpointCircuit] = {}
+
+    @staticmethod
+    def endpoint_key(endpoint: str) -> str:
+        """Get the key grouping the deliveries to the same endpoint."""
+        parsed = urlparse(endpoint)
+        return f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else endpoint
+
+    def _report(self, event: str):
+        if self.collector:
+            self.collector.log(f"outbound.circuit.{event}", 0.0)
+
+    def circuit(self, endpoint: str) -> EndpointCircuit:
+        """Get the circuit tracking an endpoint."""
+        key = self.endpoint_key(endpoint)
+        circuit = self.circuits.get(key)
+        if not circuit:
+            circuit = self.circuits[key] = EndpointCircuit()
+        return circuit
+
+    def prune(self, now: float):
+        """Stop tracking the open circuits of endpoints no longer in use.
+
+        A circuit is dropped once a reset timeout has passed since a probe was
+        allowed without any message being sent to its endpoint.
+        """
+        stale = [
+            key
+            for key, circuit in self.circuits.items()
+            if circuit.state == CircuitState.OPEN
+            and not circuit.in_flight
+            and not circuit.parked
+            and now >= circuit.retry_at + self.reset_timeout
+        ]
+        for key in stale:
+            del self.circuits[key]
+
+    def acquire(self, queued: QueuedOutboundMessage, now: float) -> Admission:
+        """Request to deliver a message to its endpoint.
+
+        Args:
+            queued: The message to deliver
+            now: The current timer value
+
+        Returns:
+            `Admission.ALLOW` if the delivery may start, `Admission.WAIT` if the
+            message has been parked until it may be sent, or `Admission.OPEN`
+            if the circuit is open until `queued.retry_at`
+
+        """
+        if self.endpoint_key(queued.endpoint) not in self.circuits:
+            self.prune(now)
+        circuit = self.circuit(queued.endpoint)
+        if circuit.state == CircuitState.OPEN:
+            if now < circuit.retry_at:
+                queued.retry_at = circuit.retry_at
+                self._report("rejected")
+                return Admission.OPEN
+            circuit.state = CircuitState.HALF_OPEN
+            self._report("probe")
+        elif circuit.state == CircuitState.HALF_OPEN or (
+            self.max_in_flight and circuit.in_flight >= self.max_in_flight
+        ):
+            # wait for the probe result or a free delivery slot
+            circuit.parked.append(queued)
+            self._report("parked")
+            return Admission.WAIT
+
+        circuit.in_flight += 1
+        return Admission.ALLOW
+
+    def release(
+        self, queued: QueuedOutboundMessage, delivered: bool, now: float
+    ) -> List[QueuedOutboundMessage]:
+        """Record the outcome of a delivery started with `acquire`.
+
+        Args:
+            queued: The message delivered
+            delivered: Whether the delivery succeeded
+            now: The current timer value
+
+        Returns:
+            The parked messages to request delivery for again
+
+        """
+        key = self.endpoint_key(queued.endpoint)
+        circuit = self.circuits.get(key)
+        if not circuit:
+            return []
+        circuit.in_flight = max(circuit.in_flight - 1, 0)
+
+        if delivered:
+            circuit.failures = 0
+            if circuit.state != CircuitState.CLOSED:
+                circuit.state = CircuitState.CLOSED
+                self._report("closed")
+                LOGGER.info("Outbound circuit closed for %s", key)
+        else:
+            circuit.failures += 1
+            if circuit.state == CircuitState.HALF_OPEN or (
+                self.failure_threshold
+                and circuit.state == CircuitState.CLOSED
+                and circuit.failures >= self.failure_threshold
+            ):
+                self.prune(now)
+                circuit.state = CircuitState.OPEN
+                circuit.retry_at = now + self.reset_timeout
+                self._report("opened")
+                LOGGER.warning(
+                    "Outbound circuit opened for %s after %d failures",
+                    key,
+                    circuit.failures,
+                )
+
+        if circuit.state == CircuitState.CLOSED and self.max_in_flight:
+            count = min(self.max_in_flight - circuit.in_flight, len(circuit.parked))
+        else:
+            count = len(circuit.parked)
+        resumed = [circuit.parked.popleft() for _ in range(count)]
+
+        if circuit.idle:
+            del self.circuits[key]
+        return resumed
+
+    @property
+    def open_count(self) -> int:
+        """Accessor for the number of endpoints whose circuit is not closed."""
+        return sum(
+            1
+            for circuit in self.circuits.values()
+            if circuit.state != CircuitState.CLOSED
+        )
+
+    @property
+    def parked_count(self) -> int:
+        """Accessor for the number of parked messages."""
+        return sum(len(circuit.parked) for circuit in self.circuits.values())
@@ -0,0 +1,259 @@
+"""Durable storage of outbound messages pending delivery."""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from ...core.profile import Profile
+from ...multitenant.base import BaseMultitenantManager
+from ...storage.base import BaseStorage
+from ...storage.error import StorageNotFoundError
+from ...storage.record import StorageRecord
+from ...wallet.models.wallet_record import WalletRecord
+from ...wallet.util import b64_to_bytes, bytes_to_b64
+from .base import QueuedOutboundMessage
+
+LOGGER = logging.getLogger(__name__)
+
+RECORD_TYPE_OUTBOUND_QUEUE = "outbound_queue"
+
+
+class DurableOutboundQueue:
+    """Keep outbound messages in the root profile store until they are delivered.
+
+    A message is recorded with its encoded payload as soon as it has one, updated
+    as its retries are used, and removed once it has been delivered or
+    abandoned, so that messages still pending when the agent stops are delivered
+    after a restart. Retry times are not kept: restored messages are delivered
+    right away with the retries they had left.
+
+    Changes requested with `record` and `discard` are written in the background,
+    in order, without waiting for a delivery slot. Only the latest change
+    requested for a message is written.
+
+    Several agent instances may share the store, as during a rolling upgrade.
+    Each record is tagged with the instance delivering it and a lease, renewed
+    while the instance runs and released when it stops. An instance only
+    restores the records whose lease has lapsed, claiming them in a transaction
+    first, so a message is not delivered again while its instance is running.
+    Records written before leases were kept have none and can be claimed at once.
+    """
+
+    LEASE_DURATION = 300.0
+
+    def __init__(self, profile: Profile):
+        """Initialize a `DurableOutboundQueue` instance.
+
+        Args:
+            profile: The root profile holding the queue records
+
+        """
+        self.profile = profile
+        self.instance_id = uuid4().hex
+        # looks like { id(queued): (queued, <keep the record>) }
+        self._changes: Dict[int, Tuple[QueuedOutboundMessage, bool]] = {}
+        self._writer: Optional[asyncio.Task] = None
+        # the messages recorded by this instance and not yet discarded
+        self._pending: Dict[int, QueuedOutboundMessage] = {}
+        self._lease_task: Optional[asyncio.Task] = None
+        self._stopped = False
+
+    def record(self, queued: QueuedOutboundMessage):
+        """Request that a message and its retry state be recorded.
+
+        The record is written in the background: a message accepted for delivery
+        is lost if the agent exits before its record has been written, and a
+        message delivered before its removal has been written is delivered again
+        after a restart.
+        """
+        self._changes[id(queued)] = (queued, True)
+        self._pending[id(queued)] = queued
+        self._start_writer()
+
+    def discard(self, queued: QueuedOutboundMessage):
+        """Request that a message which is no longer pending be removed."""
+        self._changes[id(queued)] = (queued, False)
+        self._pending.pop(id(queued), None)
+        self._start_writer()
+
+    def _start_writer(self):
+        if not self._writer or self._writer.done():
+            self._writer = asyncio.ensure_future(self._write_changes())
+
+    async def _write_changes(self):
+        """Write the requested changes until there are none left."""
+        while self._changes:
+            changes, self._changes = self._changes, {}
+            for queued, keep in changes.values():
+                try:
+                    if keep:
+                        await self.save(queued)
+                    else:
+                        await self.acknowledge(queued)
+                except Exception:
+                    LOGGER.exception(
+                        "Error updating queued outbound message to %s",
+                        queued.endpoint,
+                    )
+
+    async def flush(self):
+        """Wait for the requested changes to be written."""
+        while self._writer and not self._writer.done():
+            await asyncio.shield(self._writer)
+
+    def start(self, on_restored: Callable[[Sequence[QueuedOutboundMessage]], None]):
+        """Start renewing the leases held and claiming the lapsed ones.
+
+        Args:
+            on_restored: Called with the messages claimed from stopped instances
+
+        """
+        if not self._lease_task or self._lease_task.done():
+            self._lease_task = asyncio.ensure_future(self._keep_leases(on_restored))
+
+    async def _keep_leases(
+        self, on_restored: Callable[[Sequence[QueuedOutboundMessage]], None]
+    ):
+        """Periodically renew the leases held and claim the lapsed ones."""
+        while True:
+            await asyncio.sleep(self.LEASE_DURATION / 3)
+            try:
+                # recording the pending messages again renews their leases
+                for queued in list(self._pending.values()):
+                    self.record(queued)
+                await self.flush()
+                restored = await self.restore()
+                if restored:
+                    on_restored(restored)
+            except Exception:
+                LOGGER.exception("Error renewing queued outbound message leases")
+
+    async def stop(self):
+        """Release the leases held and write the requested changes.
+
+        Messages recorded after the queue has stopped are written without a
+        lease, so that any instance may deliver them.
+        """
+        if self._lease_task:
+            self._lease_task.cancel()
+            self._lease_task = None
+        self._stopped = True
+        for queued in list(self._pending.values()):
+            self.record(queued)
+        await self.flush()
+
+    def _lease_tags(self) -> Dict[str, str]:
+        expires = 0 if self._stopped else time.time() + self.LEASE_DURATION
+        return {"instance_id": self.instance_id, "lease_expires": str(expires)}
+
+    def _wallet_id(self, queued: QueuedOutboundMessage) -> Optional[str]:
+        if queued.profile and self.profile.settings.get("multitenant.enabled"):
+            return queued.profile.settings.get("wallet.id")
+        return None
+
+    async def save(self, queued: QueuedOutboundMessage):
+        """Record a message and its retry state."""
+        binary = isinstance(queued.payload, bytes)
+        value = json.dumps(
+            {
+                "payload": bytes_to_b64(queued.payload) if binary else queued.payload,
+                "binary": binary,
+                "endpoint": queued.endpoint,
+                "retries": queued.retries,
+                "metadata": queued.metadata,
+                "api_key": queued.api_key,
+            }
+        )
+        wallet_id = self._wallet_id(queued)
+        tags = {"wallet_id": wallet_id} if wallet_id else {}
+        tags.update(self._lease_tags())
+
+        async with self.profile.session() as session:
+            storage = session.inject(BaseStorage)
+            if queued.queue_id:
+                await storage.update_record(
+                    StorageRecord(RECORD_TYPE_OUTBOUND_QUEUE, value, id=queued.queue_id),
+                    value,
+                    tags,
+                )
+            else:
+                record = StorageRecord(RECORD_TYPE_OUTBOUND_QUEUE, value, tags)
+                await storage.add_record(record)
+                queued.queue_id = record.id
+
+    async def acknowledge(self, queued: QueuedOutboundMessage):
+        """Remove a message which is no longer pending delivery."""
+        self._pending.pop(id(queued), None)
+        if not queued.queue_id:
+            return
+        async with self.profile.session() as session:
+            storage = session.inject(BaseStorage)
+            try:
+                await storage.delete_record(
+                    StorageRecord(RECORD_TYPE_OUTBOUND_QUEUE, "", id=queued.queue_id)
+                )
+            except StorageNotFoundError:
+                pass
+        queued.queue_id = None
+
+    async def _wallet_profile(self, wallet_id: str) -> Profile:
+        """Open the profile a message was sent from, or the root profile."""
+        try:
+            multitenant_mgr = self.profile.inject(BaseMultitenantManager)
+            async with self.profile.session() as session:
+                wallet = await WalletRecord.retrieve_by_id(session, wallet_id)
+            return await multitenant_mgr.get_wallet_profile(self.profile.context, wallet)
+        except Exception:
+            # the payload is already encoded, so the root profile can deliver it
+            LOGGER.warning(
+                "Unable to open wallet %s for queued outbound message", wallet_id
+            )
+            return self.profile
+
+    async def restore(self) -> Sequence[QueuedOutboundMessage]:
+        """Claim the messages pending delivery whose lease has lapsed.
+
+        Returns:
+            The claimed messages, ready to be queued again
+
+        """
+        now = time.time()
+        records = []
+        async with self.profile.transaction() as txn:
+            storage = txn.inject(BaseStorage)
+            for record in await storage.find_all_records(RECORD_TYPE_OUTBOUND_QUEUE):
+                if record.tags.get("instance_id") == self.instance_id or (
+                    float(record.tags.get("lease_expires", 0)) > now
+                ):
+                    continue
+                tags = {**record.tags, **self._lease_tags()}
+                await storage.update_record(record, record.value, tags)
+                records.append(StorageRecord(record.type, record.value, tags, record.id))
+            await txn.commit()
+
+        profiles = {}
+        restored = []
+        for record in records:
+            value = json.loads(record.value)
+            wallet_id = record.tags.get("wallet_id")
+            if wallet_id and wallet_id not in profiles:
+                profiles[wallet_id] = await self._wallet_profile(wallet_id)
+
+            queued = QueuedOutboundMessage(
+                profiles[wallet_id] if wallet_id else self.profile, None, None, None
+            )
+            queued.endpoint = value["endpoint"]
+            queued.payload = (
+                b64_to_bytes(value["payload"]) if value["binary"] else value["payload"]
+            )
+            queued.retries = value["retries"]
+            queued.metadata = value["metadata"]
+            queued.api_key = value["api_key"]
+            queued.queue_id = record.id
+            queued.state = QueuedOutboundMessage.STATE_PENDING
+            self._pending[id(queued)] = queued
+            restored.append(queued)
+        return restored
@@ -1,15 +1,18 @@
 """Outbound transport manager."""
 
 import asyncio
+import heapq
+import itertools
 import json
 import logging
-import time
-from typing import Callable, Optional, Type
-from urllib.parse import urlparse
+from collections import deque
+from typing import Callable, Mapping, Optional, Sequence, Tuple, Type
+from urllib.parse import parse_qsl, urlencode, urlparse, urlsplit, urlunsplit
 
 from ...connections.models.connection_target import ConnectionTarget
 from ...core.profile import Profile
 from ...utils.classloader import ClassLoader, ClassNotFoundError, ModuleLoadError
+from ...utils.repeat import BackoffSequence
 from ...utils.stats import Collector
 from ...utils.task_queue import CompletedTask, TaskQueue, task_exc_info
 from ...utils.tracing import get_timer, trace_event
@@ -20,11 +23,61 @@ from .base import (
     OutboundTransportRegistrationError,
     QueuedOutboundMessage,
 )
+from .circuit import DEFAULT_RESET_TIMEOUT, Admission, EndpointCircuitBreakers
+from .durable import DurableOutboundQueue
 from .message import OutboundMessage
 
 LOGGER = logging.getLogger(__name__)
 MODULE_BASE_PATH = "acapy_agent.transport.outbound"
 
+# milliseconds to collect webhook events for when batching webhooks
+DEFAULT_WEBHOOK_BATCH_INTERVAL = 1000
+DEFAULT_WEBHOOK_BATCH_SIZE = 100
+
+# default retry policy for failed deliveries, each value overridden by the
+# `transport.retry.<name>` setting
+RETRY_POLICY_DEFAULTS = {
+    "delay": 10.0,
+    "multiplier": 2.0,
+    "max_delay": 300.0,
+    "jitter": 0.5,
+    "budget": None,
+}
+
+
+class WebhookBatch:
+    """Webhook events collected for delivery to a target in a single request."""
+
+    def __init__(
+        self,
+        transport_id: str,
+        endpoint: str,
+        api_key: Optional[str],
+        max_attempts: Optional[int],
+        metadata: Optional[dict],
+        size: int,
+    ):
+        """Initialize a `WebhookBatch` instance."""
+        self.transport_id = transport_id
+        self.endpoint = endpoint
+        self.api_key = api_key
+        self.size = size
+        self.max_attempts = max_attempts
+        self.metadata = metadata
+        self.events = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+def retry_sequence(config: Mapping) -> BackoffSequence:
+    """Create the backoff sequence for a retry policy configuration."""
+    return BackoffSequence(
+        interval=config["delay"],
+        multiplier=config["multiplier"],
+        max_interval=config["max_delay"],
+        jitter=config["jitter"],
+        budget=config["budget"],
+    )
+
 
 class OutboundTransportManager:
     """Outbound transport manager class."""
@@ -42,9 +95,31 @@ class OutboundTransportManager:
         self.root_profile = profile
         self.loop = asyncio.get_event_loop()
         self.handle_not_delivered = handle_not_delivered
-        self.outbound_buffer = []
+        # messages accepted by the processing loop and not yet finished
+        self.outbound_buffer = set()
         self.outbound_event = asyncio.Event()
         self.outbound_new = []
+        # messages whose state changed and need handling by the processing loop
+        self.outbound_ready = deque()
+        # min-heap of (retry_at, sequence, message) for messages awaiting retry
+        self.outbound_retry = []
+        self._retry_seq = itertools.count()
+        self.durable_queue: Optional[DurableOutboundQueue] = None
+        if self.root_profile.settings.get("transport.durable_outbound_queue"):
+            self.durable_queue = DurableOutboundQueue(self.root_profile)
+        self.retry_policy: BackoffSequence = None
+        self.scheme_retry_policies = {}
+        self._setup_retry_policies()
+        self.webhook_batch_size = self.root_profile.settings.get(
+            "admin.webhook_batch_size", DEFAULT_WEBHOOK_BATCH_SIZE
+        )
+        self.webhook_batch_interval = self.root_profile.settings.get(
+            "admin.webhook_batch_interval", DEFAULT_WEBHOOK_BATCH_INTERVAL
+        )
+        self.webhook_batches = {}
+        self.circuits: Optional[EndpointCircuitBreakers] = None
+        self.circuit_fail_fast = False
+        self._setup_circuits()
         self.registered_schemes = {}
         self.registered_transports = {}
         self.running_transports = {}
@@ -55,6 +130,46 @@ class OutboundTransportManager:
                 "transport.max_outbound_retry"
             ]
 
+    def _setup_retry_policies(self):
+        """Create the retry policies for failed deliveries from the settings."""
+        settings = self.root_profile.settings
+        config = dict(RETRY_POLICY_DEFAULTS)
+        for name in RETRY_POLICY_DEFAULTS:
+            value = settings.get(f"transport.retry.{name}")
+            if value is not None:
+                config[name] = value
+        self.retry_policy = retry_sequence(config)
+        self.scheme_retry_policies = {
+            scheme: retry_sequence({**config, **overrides})
+            for scheme, overrides in (
+                settings.get("transport.retry.schemes") or {}
+            ).items()
+        }
+
+    def get_retry_policy(self, endpoint: str) -> BackoffSequence:
+        """Get the retry policy for deliveries to an endpoint."""
+        if self.scheme_retry_policies:
+            scheme = urlparse(endpoint).scheme
+            if scheme in self.scheme_retry_policies:
+                return self.scheme_retry_policies[scheme]
+        return self.retry_policy
+
+    def _setup_circuits(self):
+        """Create the endpoint circuit breakers if they are configured."""
+        settings = self.root_profile.settings
+        failure_threshold = settings.get("transport.circuit.failure_threshold")
+        max_in_flight = settings.get("transport.endpoint_max_in_flight")
+        if failure_threshold or max_in_flight:
+            self.circuits = EndpointCircuitBreakers(
+                failure_threshold=failure_threshold,
+                reset_timeout=settings.get(
+                    "transport.circuit.reset_timeout", DEFAULT_RESET_TIMEOUT
+                ),
+                max_in_flight=max_in_flight,
+                collector=self.root_profile.inject_or(Collector),
+            )
+            self.circuit_fail_fast = bool(settings.get("transport.circuit.fail_fast"))
+
     async def setup(self):
         """Perform setup operations."""
         outbound_transports = (
@@ -157,11 +272,61 @@ class OutboundTransportManager:
         for transport_id in self.registered_transports:
             self.task_queue.run(self.start_transport(transport_id))
 
+    async def restore_queued(self):
+        """Queue the messages left undelivered in the durable outbound queue.
+
+        Called once the outbound transports have been started. Messages left by
+        other instances sharing the store are queued once their lease lapses.
+        """
+        if not self.durable_queue:
+            return
+        await self.task_queue.flush()
+        self._queue_restored(await self.durable_queue.restore())
+        self.durable_queue.start(self._queue_restored)
+
+    def _queue_restored(self, messages: Sequence[QueuedOutboundMessage]):
+        """Queue the messages restored from the durable outbound queue."""
+        restored = 0
+        for queued in messages:
+            try:
+                queued.transport_id = self.get_running_transport_for_endpoint(
+                    queued.endpoint
+                )
+            except OutboundDeliveryError:
+                LOGGER.warning(
+                    "Dropping queued outbound message to %s: no running transport",
+                    queued.endpoint,
+                )
+                self.durable_queue.discard(queued)
+                continue
+            self.outbound_new.append(queued)
+            restored += 1
+        if restored:
+            LOGGER.info("Restored %d queued outbound messages", restored)
+            self.process_queued()
+
     async def stop(self, wait: bool = True):
-        """Stop all running transports."""
+        """Stop all running transports.
+
+        Args:
+            wait: Whether to deliver the pending webhook batches and wait for the
+                deliveries in progress
+
+        """
+        if wait:
+            for key in list(self.webhook_batches):
+                self.flush_webhook_batch(key)
+            # start delivering the batches before the processing task stops
+            self._process_pending()
+        else:
+            for batch in self.webhook_batches.values():
+                batch.timer.cancel()
+            self.webhook_batches = {}
         if self._process_task and not self._process_task.done():
             self._process_task.cancel()
         await self.task_queue.complete(None if wait else 0)
+        if self.durable_queue:
+            await self.durable_queue.stop()
         for transport in self.running_transports.values():
             await transport.stop()
         self.running_transports = {}
@@ -295,6 +460,12 @@ class OutboundTransportManager:
 
         """
         transport_id = self.get_running_transport_for_endpoint(endpoint)
+        endpoint, batch_size = self._split_webhook_batch_size(endpoint)
+        if batch_size:
+            self._batch_webhook(
+                transport_id, topic, payload, endpoint, batch_size, max_attempts, metadata
+            )
+            return
         queued = QueuedOutboundMessage(None, None, None, transport_id)
         if len(endpoint.split("#")) > 1:
             endpoint_hash_split = endpoint.split("#")
@@ -309,6 +480,79 @@ class OutboundTransportManager:
         self.outbound_new.append(queued)
         self.process_queued()
 
+    def _split_webhook_batch_size(self, endpoint: str) -> Tuple[str, Optional[int]]:
+        """Remove the `batch` query parameter from a webhook target, if any.
+
+        Targets opt in to batched delivery with a `batch` query parameter, giving
+        the maximum number of events per batch or left empty to use the default.
+
+        Returns:
+            The target without the parameter, and the batch size if batched
+
+        """
+        url, hash_sep, api_key = endpoint.partition("#")
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        sizes = [value for name, value in query if name == "batch"]
+        if not sizes:
+            return endpoint, None
+        query = [(name, value) for name, value in query if name != "batch"]
+        url = urlunsplit(parts._replace(query=urlencode(query)))
+        size = int(sizes[-1]) if sizes[-1].isdigit() else 0
+        return url + hash_sep + api_key, size or self.webhook_batch_size
+
+    def _batch_webhook(
+        self,
+        transport_id: str,
+        topic: str,
+        payload: dict,
+        endpoint: str,
+        batch_size: int,
+        max_attempts: Optional[int] = None,
+        metadata: Optional[dict] = None,
+    ):
+        """Add a webhook event to the batch for its target."""
+        key = (endpoint, max_attempts, json.dumps(metadata, sort_keys=True))
+        batch = self.webhook_batches.get(key)
+        if not batch:
+            endpoint, _, api_key = endpoint.partition("#")
+            batch = WebhookBatch(
+                transport_id,
+                endpoint,
+                api_key or None,
+                max_attempts,
+                metadata,
+                batch_size,
+            )
+            batch.timer = self.loop.call_later(
+                self.webhook_batch_interval / 1000, self.flush_webhook_batch, key
+            )
+            self.webhook_batches[key] = batch
+        batch.events.append({"topic": topic, "payload": payload})
+        if len(batch.events) >= batch.size:
+            self.flush_webhook_batch(key)
+
+    def flush_webhook_batch(self, key: tuple):
+        """Queue the webhook events collected for a target as a single message.
+
+        The events are posted as a JSON array of `topic` and `payload` objects
+        to the `batch` path of the target, and retried as a unit.
+        """
+        batch: WebhookBatch = self.webhook_batches.pop(key, None)
+        if not batch:
+            return
+        if batch.timer:
+            batch.timer.cancel()
+        queued = QueuedOutboundMessage(None, None, None, batch.transport_id)
+        queued.api_key = batch.api_key
+        queued.endpoint = f"{batch.endpoint}/batch/"
+        queued.metadata = batch.metadata
+        queued.payload = json.dumps(batch.events)
+        queued.state = QueuedOutboundMessage.STATE_PENDING
+        queued.retries = 4 if batch.max_attempts is None else batch.max_attempts - 1
+        self.outbound_new.append(queued)
+        self.process_queued()
+
     def process_queued(self) -> asyncio.Task:
         """Start the process to deliver queued messages if necessary.
 
@@ -317,7 +561,7 @@ class OutboundTransportManager:
         """
         if self._process_task and not self._process_task.done():
             self.outbound_event.set()
-        elif self.outbound_new or self.outbound_buffer:
+        elif self.outbound_new or self.outbound_ready or self.outbound_buffer:
             self._process_task = self.loop.create_task(self._process_loop())
             self._process_task.add_done_callback(lambda task: self._process_done(task))
         return self._process_task
@@ -337,90 +581,141 @@ class OutboundTransportManager:
 
         while True:
             self.outbound_event.clear()
-            loop_time = get_timer()
-            upd_buffer = []
-            retry_count = 0
-
-            for queued in self.outbound_buffer:
-                if queued.state == QueuedOutboundMessage.STATE_DONE:
-                    if queued.error:
-                        LOGGER.exception(
-                            "Outbound message could not be delivered to %s",
-                            queued.endpoint,
-                            exc_info=queued.error,
-                        )
-                        if self.handle_not_delivered and queued.message:
-                            self.handle_not_delivered(queued.profile, queued.message)
-                    continue  # remove from buffer
-
-                deliver = False
-
-                if queued.state == QueuedOutboundMessage.STATE_PENDING:
-                    deliver = True
-                elif queued.state == QueuedOutboundMessage.STATE_RETRY:
-                    if queued.retry_at < loop_time:
-                        queued.retry_at = None
-                        deliver = True
-                    else:
-                        retry_count += 1
-
-                if deliver:
-                    queued.state = QueuedOutboundMessage.STATE_DELIVER
-                    p_time = trace_event(
-                        self.root_profile.settings,
-                        queued.message if queued.message else queued.payload,
-                        outcome="OutboundTransportManager.DELIVER.START."
-                        + queued.endpoint,
-                    )
-                    self.deliver_queued_message(queued)
-                    trace_event(
-                        self.root_profile.settings,
-                        queued.message if queued.message else queued.payload,
-                        outcome="OutboundTransportManager.DELIVER.END." + queued.endpoint,
-                        perf_counter=p_time,
-                    )
-
-                upd_buffer.append(queued)
-
-            new_pending = 0
-            new_messages = self.outbound_new
-            self.outbound_new = []
-
-            for queued in new_messages:
-                if queued.state == QueuedOutboundMessage.STATE_NEW:
-                    if queued.message and queued.message.enc_payload:
-                        queued.payload = queued.message.enc_payload
-                        queued.state = QueuedOutboundMessage.STATE_PENDING
-                        new_pending += 1
-                    else:
-                        queued.state = QueuedOutboundMessage.STATE_ENCODE
-                        p_time = trace_event(
-                            self.root_profile.settings,
-                            queued.message if queued.message else queued.payload,
-                            outcome="OutboundTransportManager.ENCODE.START",
-                        )
-                        self.encode_queued_message(queued)
-                        trace_event(
-                            self.root_profile.settings,
-                            queued.message if queued.message else queued.payload,
-                            outcome="OutboundTransportManager.ENCODE.END",
-                            perf_counter=p_time,
-                        )
-                else:
-                    new_pending += 1
-
-                upd_buffer.append(queued)
-
-            self.outbound_buffer = upd_buffer
-            if self.outbound_buffer:
-                if (not new_pending) and (not retry_count):
-                    await self.outbound_event.wait()
-                elif retry_count:
-                    # only retries - yield here so we don't hog resources
-                    await asyncio.sleep(0.05)
-            else:
+            self._process_pending()
+
+            if not self.outbound_buffer:
                 break
 
+            # sleep until the next retry is due or the state of a message changes
+            timeout = (
+                self.outbound_retry[0][0] - get_timer() if self.outbound_retry else None
+            )
+            try:
+                await asyncio.wait_for(self.outbound_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _process_pending(self):
+        """Advance the new messages, the messages due a retry and any others ready."""
+        loop_time = get_timer()
+
+        while self.outbound_retry and self.outbound_retry[0][0] <= loop_time:
+            _, _, queued = heapq.heappop(self.outbound_retry)
+            queued.retry_at = None
+            self.outbound_ready.append(queued)
+
+        new_messages = self.outbound_new
+        self.outbound_new = []
+        for queued in new_messages:
+            self.outbound_buffer.add(queued)
+            self.outbound_ready.append(queued)
+            if queued.state == QueuedOutboundMessage.STATE_PENDING:
+                self._record_pending(queued)
+
+        while self.outbound_ready:
+            self._process_ready(self.outbound_ready.popleft())
+
+    def _process_ready(self, queued: QueuedOutboundMessage):
+        """Advance a message which is ready for its next processing step."""
+        if queued.state == QueuedOutboundMessage.STATE_DONE:
+            self.outbound_buffer.discard(queued)
+            if self.durable_queue:
+                self.durable_queue.discard(queued)
+            if queued.error:
+                LOGGER.exception(
+                    "Outbound message could not be delivered to %s",
+                    queued.endpoint,
+                    exc_info=queued.error,
+                )
+                if self.handle_not_delivered and queued.message:
+                    self.handle_not_delivered(queued.profile, queued.message)
+
+        elif queued.state == QueuedOutboundMessage.STATE_NEW:
+            if queued.message and queued.message.enc_payload:
+                queued.payload = queued.message.enc_payload
+                queued.state = QueuedOutboundMessage.STATE_PENDING
+                self._record_pending(queued)
+                self._process_ready(queued)
+            else:
+                queued.state = QueuedOutboundMessage.STATE_ENCODE
+                p_time = trace_event(
+                    self.root_profile.settings,
+                    queued.message if queued.message else queued.payload,
+                    outcome="OutboundTransportManager.ENCODE.START",
+                )
+                self.encode_queued_message(queued)
+                trace_event(
+                    self.root_profile.settings,
+                    queued.message if queued.message else queued.payload,
+                    outcome="OutboundTransportManager.ENCODE.END",
+                    perf_counter=p_time,
+                )
+
+        elif queued.state in (
+            QueuedOutboundMessage.STATE_PENDING,
+            QueuedOutboundMessage.STATE_RETRY,
+        ):
+            if self.circuits and not self._admit(queued):
+                return
+            queued.state = QueuedOutboundMessage.STATE_DELIVER
+            if queued.first_attempt_at is None:
+                queued.first_attempt_at = get_timer()
+            p_time = trace_event(
+                self.root_profile.settings,
+                queued.message if queued.message else queued.payload,
+                outcome="OutboundTransportManager.DELIVER.START." + queued.endpoint,
+            )
+            self.deliver_queued_message(queued)
+            trace_event(
+                self.root_profile.settings,
+                queued.message if queued.message else queued.payload,
+                outcome="OutboundTransportManager.DELIVER.END." + queued.endpoint,
+                perf_counter=p_time,
+            )
+
+    def _record_pending(self, queued: QueuedOutboundMessage):
+        """Record a message with an encoded payload in the durable queue, if any."""
+        if self.durable_queue:
+            self.durable_queue.record(queued)
+
+    def _admit(self, queued: QueuedOutboundMessage) -> bool:
+        """Check the circuit of the message endpoint before delivery.
+
+        Returns:
+            True if the delivery may start; otherwise the message has been parked,
+            scheduled for when the circuit may close, or failed
+
+        """
+        now = get_timer()
+        admission = self.circuits.acquire(queued, now)
+        if admission == Admission.OPEN:
+            # waiting on an open circuit uses up retries and the retry budget
+            if queued.first_attempt_at is None:
+                queued.first_attempt_at = now
+            policy = self.get_retry_policy(queued.endpoint)
+            if (
+                self.circuit_fail_fast
+                or not queued.retries
+                or not policy.within_budget(queued.retry_at - queued.first_attempt_at)
+            ):
+                queued.error = OutboundDeliveryError(
+                    f"Outbound circuit is open for endpoint {queued.endpoint}"
+                )
+                queued.state = QueuedOutboundMessage.STATE_DONE
+                self._process_ready(queued)
+            else:
+                queued.retries -= 1
+                queued.state = QueuedOutboundMessage.STATE_RETRY
+                self._schedule_retry(queued)
+                self._record_pending(queued)
+        return admission == Admission.ALLOW
+
+    def _schedule_retry(self, queued: QueuedOutboundMessage):
+        """Queue a message for delivery once its retry time is reached."""
+        heapq.heappush(
+            self.outbound_retry, (queued.retry_at, next(self._retry_seq), queued)
+        )
+
     def encode_queued_message(self, queued: QueuedOutboundMessage) -> asyncio.Task:
         """Kick off encoding of a queued message."""
 
@@ -454,7 +749,9 @@ class OutboundTransportManager:
             queued.state = QueuedOutboundMessage.STATE_DONE
         else:
             queued.state = QueuedOutboundMessage.STATE_PENDING
+            self._record_pending(queued)
         queued.task = None
+        self.outbound_ready.append(queued)
         self.process_queued()
 
     def deliver_queued_message(self, queued: QueuedOutboundMessage) -> asyncio.Task:
@@ -499,25 +796,43 @@ class OutboundTransportManager:
 
     def finished_deliver(self, queued: QueuedOutboundMessage, completed: CompletedTask):
         """Handle completion of queued message delivery."""
+        if self.circuits:
+            self.outbound_ready.extend(
+                self.circuits.release(queued, not completed.exc_info, get_timer())
+            )
+        queued.attempts += 1
         if completed.exc_info:
             queued.error = completed.exc_info
+            policy = self.get_retry_policy(queued.endpoint)
+            now = get_timer()
+            retry_at = now + policy.next_interval(queued.attempts)
 
-            if queued.retries:
+            if queued.retries and policy.within_budget(
+                retry_at - (queued.first_attempt_at or now)
+            ):
                 self._finished_deliver_error_handler(queued, retry=True)
                 queued.retries -= 1
                 queued.state = QueuedOutboundMessage.STATE_RETRY
-                queued.retry_at = time.perf_counter() + 10
+                queued.retry_at = retry_at
+                self._schedule_retry(queued)
+                self._record_pending(queued)
             else:
                 self._finished_deliver_error_handler(queued, retry=False)
                 queued.state = QueuedOutboundMessage.STATE_DONE
+                self.outbound_ready.append(queued)
         else:
             queued.error = None
             queued.state = QueuedOutboundMessage.STATE_DONE
+            self.outbound_ready.append(queued)
         queued.task = None
         self.process_queued()
 
     async def flush(self):
         """Wait for any queued messages to be delivered."""
+        for key in list(self.webhook_batches):
+            self.flush_webhook_batch(key)
         proc_task = self.process_queued()
         if proc_task:
             await proc_task
+        if self.durable_queue:
+            await self.durable_queue.flush()
@@ -0,0 +1,100 @@
+from unittest import TestCase
+
+from ....utils.stats import Collector
+from ..base import QueuedOutboundMessage
+from ..circuit import Admission, CircuitState, EndpointCircuitBreakers
+
+
+def make_queued(endpoint: str = "http://mediator:8020/path") -> QueuedOutboundMessage:
+    queued = QueuedOutboundMessage(None, None, None, "transport")
+    queued.endpoint = endpoint
+    return queued
+
+
+class TestEndpointCircuitBreakers(TestCase):
+    def test_endpoint_key(self):
+        key = EndpointCircuitBreakers.endpoint_key
+        assert key("http://host:8020/topic/connections/") == "http://host:8020"
+        assert key("ws://host") == "ws://host"
+        assert key("local") == "local"
+
+    def test_open_and_probe(self):
+        collector = Collector()
+        circuits = EndpointCircuitBreakers(
+            failure_threshold=2, reset_timeout=30, collector=collector
+        )
+        first, second = make_queued(), make_queued("http://mediator:8020/other")
+
+        for queued in (first, second):
+            assert circuits.acquire(queued, 0) == Admission.ALLOW
+        assert circuits.release(first, False, 1) == []
+        assert circuits.circuit(first.endpoint).state == CircuitState.CLOSED
+        assert circuits.release(second, False, 2) == []
+        assert circuits.circuit(first.endpoint).state == CircuitState.OPEN
+        assert circuits.open_count == 1
+
+        # rejected until the reset timeout has passed
+        rejected = make_queued()
+        assert circuits.acquire(rejected, 10) == Admission.OPEN
+        assert rejected.retry_at == 32
+
+        # a single probe is sent while other messages are parked
+        probe, waiting = make_queued(), make_queued()
+        assert circuits.acquire(probe, 32) == Admission.ALLOW
+        assert circuits.circuit(probe.endpoint).state == CircuitState.HALF_OPEN
+        assert circuits.acquire(waiting, 33) == Admission.WAIT
+        assert circuits.parked_count == 1
+
+        # a failed probe opens the circuit again and hands back parked messages
+        assert circuits.release(probe, False, 40) == [waiting]
+        assert circuits.acquire(waiting, 41) == Admission.OPEN
+        assert waiting.retry_at == 70
+
+        # a delivered probe closes the circuit
+        assert circuits.acquire(probe, 70) == Admission.ALLOW
+        assert circuits.release(probe, True, 71) == []
+        assert circuits.circuits == {}
+        assert circuits.open_count == 0
+
+        counts = collector.results["count"]
+        assert counts["outbound.circuit.opened"] == 2
+        assert counts["outbound.circuit.rejected"] == 2
+        assert counts["outbound.circuit.probe"] == 2
+        assert counts["outbound.circuit.parked"] == 1
+        assert counts["outbound.circuit.closed"] == 1
+
+    def test_max_in_flight(self):
+        circuits = EndpointCircuitBreakers(max_in_flight=2)
+        messages = [make_queued() for _ in range(4)]
+        assert [circuits.acquire(queued, 0) for queued in messages] == [
+            Admission.ALLOW,
+            Admission.ALLOW,
+            Admission.WAIT,
+            Admission.WAIT,
+        ]
+        assert circuits.acquire(make_queued("http://other"), 0) == Admission.ALLOW
+
+        # failures never open the circuit without a threshold
+        assert circuits.release(messages[0], False, 1) == [messages[2]]
+        assert circuits.acquire(messages[2], 1) == Admission.ALLOW
+        assert circuits.release(messages[1], True, 2) == [messages[3]]
+        assert circuits.circuit(messages[0].endpoint).state == CircuitState.CLOSED
+
+    def test_prune(self):
+        circuits = EndpointCircuitBreakers(failure_threshold=1, reset_timeout=30)
+        stale = make_queued("http://stale")
+        assert circuits.acquire(stale, 0) == Admission.ALLOW
+        circuits.release(stale, False, 0)
+
+        # kept until a reset timeout has passed since the probe was allowed
+        assert circuits.acquire(make_queued(), 59) == Admission.ALLOW
+        assert circuits.circuit(stale.endpoint).state == CircuitState.OPEN
+        circuits.release(make_queued(), True, 59)
+
+        assert circuits.acquire(make_queued("http://other"), 60) == Admission.ALLOW
+        assert list(circuits.circuits) == ["http://other"]
+        assert circuits.open_count == 0
+
+    def test_release_untracked(self):
+        circuits = EndpointCircuitBreakers(failure_threshold=1)
+        assert circuits.release(make_queued(), True, 0) == []
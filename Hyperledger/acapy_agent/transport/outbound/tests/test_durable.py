@@ -0,0 +1,202 @@
+import asyncio
+import json
+import time
+from unittest import IsolatedAsyncioTestCase
+
+from ....multitenant.base import BaseMultitenantManager
+from ....storage.base import BaseStorage
+from ....tests import mock
+from ....utils.testing import create_test_profile
+from ....wallet.models.wallet_record import WalletRecord
+from .. import durable as test_module
+from ..base import QueuedOutboundMessage
+from ..durable import RECORD_TYPE_OUTBOUND_QUEUE, DurableOutboundQueue
+
+
+class TestDurableOutboundQueue(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.profile = await create_test_profile()
+        self.queue = DurableOutboundQueue(self.profile)
+
+    def make_queued(self, payload, profile=None):
+        queued = QueuedOutboundMessage(profile, None, None, "transport")
+        queued.endpoint = "http://localhost/"
+        queued.payload = payload
+        queued.retries = 3
+        queued.metadata = {"x-header": "value"}
+        queued.api_key = "api-key"
+        return queued
+
+    async def stored_records(self):
+        async with self.profile.session() as session:
+            return await session.inject(BaseStorage).find_all_records(
+                RECORD_TYPE_OUTBOUND_QUEUE
+            )
+
+    async def test_save_restore(self):
+        # leases lapse at once
+        self.queue.LEASE_DURATION = -600
+        binary = self.make_queued(b"\x00encrypted")
+        text = self.make_queued('{"webhook": true}')
+        await self.queue.save(binary)
+        await self.queue.save(text)
+        assert binary.queue_id and text.queue_id
+
+        binary.retries = 2
+        await self.queue.save(binary)
+        assert len(await self.stored_records()) == 2
+
+        # the records held by this instance are not restored
+        assert await self.queue.restore() == []
+
+        restarted = DurableOutboundQueue(self.profile)
+        restored = {queued.queue_id: queued for queued in await restarted.restore()}
+        assert restored.keys() == {binary.queue_id, text.queue_id}
+        queued = restored[binary.queue_id]
+        assert queued.payload == b"\x00encrypted"
+        assert queued.retries == 2
+        assert queued.endpoint == "http://localhost/"
+        assert queued.metadata == {"x-header": "value"}
+        assert queued.api_key == "api-key"
+        assert queued.profile is self.profile
+        assert queued.state == QueuedOutboundMessage.STATE_PENDING
+        assert restored[text.queue_id].payload == '{"webhook": true}'
+
+    async def test_acknowledge(self):
+        queued = self.make_queued("payload")
+        await self.queue.acknowledge(queued)
+
+        await self.queue.save(queued)
+        queue_id = queued.queue_id
+        await self.queue.acknowledge(queued)
+        assert queued.queue_id is None
+        assert await self.stored_records() == []
+
+        queued.queue_id = queue_id
+        await self.queue.acknowledge(queued)  # already removed
+
+    async def test_record_discard(self):
+        kept, dropped = self.make_queued("kept"), self.make_queued("dropped")
+        self.queue.record(kept)
+        self.queue.record(dropped)
+        # only the latest change for a message is written
+        self.queue.discard(dropped)
+        await self.queue.flush()
+        assert [record.id for record in await self.stored_records()] == [kept.queue_id]
+        assert dropped.queue_id is None
+
+        kept.retries = 1
+        self.queue.record(kept)
+        await self.queue.flush()
+        (record,) = await self.stored_records()
+        assert json.loads(record.value)["retries"] == 1
+
+        self.queue.discard(kept)
+        await self.queue.flush()
+        assert await self.stored_records() == []
+
+        with mock.patch.object(
+            self.queue, "save", mock.CoroutineMock(side_effect=Exception("error"))
+        ):
+            self.queue.record(kept)
+            await self.queue.flush()
+        assert await self.stored_records() == []
+
+    async def test_restore_wallet_profile(self):
+        self.queue.LEASE_DURATION = -600
+        self.profile.settings["multitenant.enabled"] = True
+        wallet_profile = await create_test_profile({"wallet.id": "wallet-id"})
+        await self.queue.save(self.make_queued("payload", wallet_profile))
+        (record,) = await self.stored_records()
+        assert record.tags["wallet_id"] == "wallet-id"
+        assert json.loads(record.value)["binary"] is False
+
+        multitenant_mgr = mock.MagicMock(
+            BaseMultitenantManager,
+            get_wallet_profile=mock.CoroutineMock(return_value=wallet_profile),
+        )
+        self.profile.context.injector.bind_instance(
+            BaseMultitenantManager, multitenant_mgr
+        )
+        with mock.patch.object(
+            WalletRecord, "retrieve_by_id", mock.CoroutineMock()
+        ) as mock_retrieve:
+            restarted = DurableOutboundQueue(self.profile)
+            restarted.LEASE_DURATION = -600
+            (queued,) = await restarted.restore()
+            assert queued.profile is wallet_profile
+            mock_retrieve.assert_awaited_once()
+
+            # fall back to the root profile if the wallet cannot be opened
+            mock_retrieve.side_effect = Exception("wallet removed")
+            (queued,) = await DurableOutboundQueue(self.profile).restore()
+            assert queued.profile is self.profile
+
+    async def test_leases(self):
+        queued = self.make_queued("payload")
+        await self.queue.save(queued)
+        (record,) = await self.stored_records()
+        assert record.tags["instance_id"] == self.queue.instance_id
+        assert float(record.tags["lease_expires"]) > time.time()
+
+        # another instance does not restore a message leased by a running instance
+        other = DurableOutboundQueue(self.profile)
+        assert await other.restore() == []
+
+        # but claims it once the lease lapses
+        with mock.patch.object(test_module.time, "time", return_value=time.time() + 600):
+            (claimed,) = await other.restore()
+        assert claimed.queue_id == queued.queue_id
+        (record,) = await self.stored_records()
+        assert record.tags["instance_id"] == other.instance_id
+        assert await self.queue.restore() == []
+
+        # records saved before leases were kept can be claimed at once
+        async with self.profile.session() as session:
+            await session.inject(BaseStorage).update_record(record, record.value, {})
+        (claimed,) = await self.queue.restore()
+        assert claimed.queue_id == queued.queue_id
+
+    async def test_stop_releases_leases(self):
+        queued = self.make_queued("payload")
+        self.queue.record(queued)
+        await self.queue.flush()
+        await self.queue.stop()
+        (record,) = await self.stored_records()
+        assert record.tags["lease_expires"] == "0"
+
+        # messages recorded once stopped are written without a lease
+        queued.retries = 1
+        self.queue.record(queued)
+        await self.queue.flush()
+        (record,) = await self.stored_records()
+        assert record.tags["lease_expires"] == "0"
+        (claimed,) = await DurableOutboundQueue(self.profile).restore()
+        assert claimed.retries == 1
+
+    async def test_keep_leases(self):
+        self.queue.LEASE_DURATION = 0.03
+        queued = self.make_queued("payload")
+        self.queue.record(queued)
+        await self.queue.flush()
+        other = DurableOutboundQueue(self.profile)
+        other.LEASE_DURATION = 0.03
+        await other.save(self.make_queued("other"))
+        await other.stop()
+
+        restored = asyncio.Queue()
+        self.queue.start(restored.put_nowait)
+        claimed = await asyncio.wait_for(restored.get(), 5)
+        assert [q.payload for q in claimed] == ["other"]
+
+        # the lease of a pending message is renewed while the instance runs
+        async def lease_expires():
+            (record,) = [
+                r for r in await self.stored_records() if r.id == queued.queue_id
+            ]
+            return float(record.tags["lease_expires"])
+
+        expires = await lease_expires()
+        await asyncio.sleep(0.05)
+        assert await lease_expires() > expires
+        await self.queue.stop()
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from unittest import IsolatedAsyncioTestCase
 
@@ -148,6 +149,101 @@ class TestOutboundTransportManager(IsolatedAsyncioTestCase):
             assert queued.retries == test_attempts - 1
             assert queued.state == QueuedOutboundMessage.STATE_PENDING
 
+    async def test_enqueue_webhook_batch(self):
+        self.profile = await create_test_profile(
+            {"admin.webhook_batch_size": 2, "admin.webhook_batch_interval": 10}
+        )
+        mgr = OutboundTransportManager(self.profile)
+        transport_cls = mock.MagicMock()
+        transport_cls.schemes = ["http"]
+        transport_cls.return_value = mock.MagicMock(
+            schemes=["http"], start=mock.CoroutineMock()
+        )
+        tid = mgr.register_class(transport_cls, "transport_cls")
+        await mgr.start_transport(tid)
+
+        metadata = {"x-wallet-id": "wallet"}
+        with mock.patch.object(
+            mgr, "process_queued", mock.MagicMock(return_value=None)
+        ) as mock_process:
+            # the batch is delivered once full
+            mgr.enqueue_webhook(
+                "connections", {"n": 1}, "http://host?batch#key", 3, metadata
+            )
+            mgr.enqueue_webhook("connections", {"n": 2}, "http://other?batch=5")
+            assert not mgr.outbound_new
+            mgr.enqueue_webhook(
+                "present_proof", {"n": 3}, "http://host?batch#key", 3, metadata
+            )
+            mock_process.assert_called_once_with()
+            (queued,) = mgr.outbound_new
+            assert queued.endpoint == "http://host/batch/"
+            assert queued.api_key == "key"
+            assert queued.metadata == metadata
+            assert queued.retries == 2
+            assert queued.state == QueuedOutboundMessage.STATE_PENDING
+            assert json.loads(queued.payload) == [
+                {"topic": "connections", "payload": {"n": 1}},
+                {"topic": "present_proof", "payload": {"n": 3}},
+            ]
+
+            # or once the batch interval has passed
+            await asyncio.sleep(0.05)
+            assert not mgr.webhook_batches
+            queued = mgr.outbound_new[1]
+            assert queued.endpoint == "http://other/batch/"
+            assert queued.api_key is None
+            assert queued.retries == 4
+            assert json.loads(queued.payload) == [
+                {"topic": "connections", "payload": {"n": 2}}
+            ]
+
+            # targets without the batch parameter are delivered one by one
+            mgr.enqueue_webhook("connections", {"n": 5}, "http://single#key")
+            queued = mgr.outbound_new[2]
+            assert queued.endpoint == "http://single/topic/connections/"
+            assert queued.api_key == "key"
+            assert json.loads(queued.payload) == {"n": 5}
+            assert not mgr.webhook_batches
+
+            mgr.enqueue_webhook("connections", {"n": 4}, "http://other?batch=5")
+            with mock.patch.object(mgr, "flush_webhook_batch") as mock_flush:
+                await mgr.flush()
+                mock_flush.assert_called_once()
+
+        # pending batches are delivered on a graceful stop
+        transport = transport_cls.return_value
+        transport.handle_message = mock.CoroutineMock()
+        transport.stop = mock.CoroutineMock()
+        mgr.outbound_new = []
+        await mgr.stop()
+        assert not mgr.webhook_batches
+        assert transport.handle_message.call_args[0][2] == "http://other/batch/"
+        transport.handle_message.assert_awaited_once()
+        assert json.loads(transport.handle_message.call_args[0][1]) == [
+            {"topic": "connections", "payload": {"n": 4}}
+        ]
+
+    async def test_split_webhook_batch_size(self):
+        self.profile = await create_test_profile({"admin.webhook_batch_size": 20})
+        mgr = OutboundTransportManager(self.profile)
+        assert mgr._split_webhook_batch_size("http://host#key") == (
+            "http://host#key",
+            None,
+        )
+        assert mgr._split_webhook_batch_size("http://host/hook?batch") == (
+            "http://host/hook",
+            20,
+        )
+        assert mgr._split_webhook_batch_size("http://host/hook?a=1&batch=5#key") == (
+            "http://host/hook?a=1#key",
+            5,
+        )
+        assert mgr._split_webhook_batch_size("http://host?batch=x") == (
+            "http://host",
+            20,
+        )
+
     async def test_process_done_x(self):
         mock_task = mock.MagicMock(
             done=mock.MagicMock(return_value=True),
@@ -163,7 +259,7 @@ class TestOutboundTransportManager(IsolatedAsyncioTestCase):
             mgr._process_done(mock_task)
 
     async def test_process_finished_x(self):
-        mock_queued = mock.MagicMock(retries=1)
+        mock_queued = mock.MagicMock(retries=1, attempts=0, first_attempt_at=None)
         mock_task = mock.MagicMock(
             exc_info=(KeyError, KeyError("nope"), None),
         )
@@ -184,7 +280,8 @@ class TestOutboundTransportManager(IsolatedAsyncioTestCase):
         self.profile = await create_test_profile()
         mock_handle_not_delivered = mock.MagicMock()
         mgr = OutboundTransportManager(self.profile, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.outbound_buffer.add(mock_queued)
+        mgr._schedule_retry(mock_queued)
 
         with mock.patch.object(
             test_module, "trace_event", mock.MagicMock()
@@ -203,15 +300,89 @@ class TestOutboundTransportManager(IsolatedAsyncioTestCase):
         self.profile = self.profile = await create_test_profile()
         mock_handle_not_delivered = mock.MagicMock()
         mgr = OutboundTransportManager(self.profile, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.outbound_buffer.add(mock_queued)
+        mgr._schedule_retry(mock_queued)
 
         with mock.patch.object(
-            test_module.asyncio, "sleep", mock.CoroutineMock()
-        ) as mock_sleep_x:
-            mock_sleep_x.side_effect = KeyError()
+            test_module.asyncio, "wait_for", mock.CoroutineMock()
+        ) as mock_wait_for:
+            mock_wait_for.side_effect = KeyError()
             with self.assertRaises(KeyError):  # cover retry logic and bail
                 await mgr._process_loop()
             assert mock_queued.retry_at is not None
+            # sleeps until the retry is due
+            timeout = mock_wait_for.call_args[0][1]
+            assert 3500 < timeout <= 3600
+            mock_wait_for.call_args[0][0].close()
+
+    async def test_process_loop_retry_order(self):
+        self.profile = await create_test_profile()
+        mgr = OutboundTransportManager(self.profile)
+        now = test_module.get_timer()
+        later, due, sooner = (
+            mock.MagicMock(state=QueuedOutboundMessage.STATE_RETRY, retry_at=retry_at)
+            for retry_at in (now + 3600, now - 1, now + 60)
+        )
+        for queued in (later, due, sooner):
+            mgr.outbound_buffer.add(queued)
+            mgr._schedule_retry(queued)
+
+        with (
+            mock.patch.object(
+                mgr, "deliver_queued_message", mock.MagicMock()
+            ) as mock_deliver,
+            mock.patch.object(
+                test_module.asyncio, "wait_for", mock.CoroutineMock()
+            ) as mock_wait_for,
+        ):
+            mock_wait_for.side_effect = KeyError()
+            with self.assertRaises(KeyError):
+                await mgr._process_loop()
+            mock_deliver.assert_called_once_with(due)
+            assert [entry[2] for entry in mgr.outbound_retry] == [sooner, later]
+            assert 0 < mock_wait_for.call_args[0][1] <= 60
+            mock_wait_for.call_args[0][0].close()
+
+    async def test_process_loop_finished(self):
+        self.profile = await create_test_profile()
+        mgr = OutboundTransportManager(self.profile)
+        queued = QueuedOutboundMessage(None, None, None, "transport_cls")
+        queued.endpoint = "http://localhost"
+        queued.payload = "{}"
+        queued.state = QueuedOutboundMessage.STATE_PENDING
+        queued.retries = 1
+        mgr.outbound_new.append(queued)
+
+        def deliver(queued):
+            queued.task = None
+            mgr.finished_deliver(queued, completed)
+
+        completed = mock.MagicMock(exc_info=(KeyError, KeyError("nope"), None))
+        with (
+            mock.patch.object(
+                mgr, "deliver_queued_message", mock.MagicMock(side_effect=deliver)
+            ) as mock_deliver,
+            mock.patch.object(mgr, "process_queued", mock.MagicMock()),
+            mock.patch.object(
+                test_module.asyncio, "wait_for", mock.CoroutineMock()
+            ) as mock_wait_for,
+        ):
+            mock_wait_for.side_effect = KeyError()
+            with self.assertRaises(KeyError):
+                await mgr._process_loop()
+            mock_wait_for.call_args[0][0].close()
+            assert queued.state == QueuedOutboundMessage.STATE_RETRY
+            assert mgr.outbound_retry[0][2] is queued
+
+            # deliver successfully on retry
+            queued.retry_at = test_module.get_timer() - 1
+            mgr.outbound_retry = [(queued.retry_at, 0, queued)]
+            completed = mock.MagicMock(exc_info=None)
+            await mgr._process_loop()
+            assert mock_deliver.call_count == 2
+            assert queued.state == QueuedOutboundMessage.STATE_DONE
+            assert not mgr.outbound_buffer
+            assert not mgr.outbound_retry
 
     async def test_process_loop_new(self):
         self.profile = await create_test_profile()
@@ -270,18 +441,181 @@ class TestOutboundTransportManager(IsolatedAsyncioTestCase):
         self.profile = await create_test_profile()
         mock_handle_not_delivered = mock.MagicMock()
         mgr = OutboundTransportManager(self.profile, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.outbound_new.append(mock_queued)
 
         await mgr._process_loop()
+        mock_handle_not_delivered.assert_called_once()
+        assert not mgr.outbound_buffer
+
+    async def test_durable_queue(self):
+        self.profile = await create_test_profile(
+            {"transport.durable_outbound_queue": True}
+        )
+        mgr = OutboundTransportManager(self.profile)
+        assert mgr.durable_queue
+
+        async def hang(*args):
+            await asyncio.Event().wait()
+
+        transport = mock.MagicMock(
+            schemes=["http"],
+            is_external=False,
+            start=mock.CoroutineMock(),
+            stop=mock.CoroutineMock(),
+            handle_message=mock.CoroutineMock(side_effect=hang),
+        )
+        mgr.register_class(
+            mock.MagicMock(schemes=["http"], return_value=transport), "transport_cls"
+        )
+        await mgr.start()
+        await mgr.restore_queued()
+
+        # the message is recorded as soon as it is queued, while it is in flight
+        mgr.enqueue_webhook("topic", {"test": "payload"}, "http://localhost")
+        queued = mgr.outbound_new[0]
+        while not transport.handle_message.await_count:
+            await asyncio.sleep(0.01)
+        await mgr.durable_queue.flush()
+        assert queued.queue_id
+        await mgr.stop(wait=False)
+
+        # pending messages are restored by a new manager
+        restarted = OutboundTransportManager(self.profile)
+        restarted.register_class(
+            mock.MagicMock(schemes=["http"], return_value=transport), "transport_cls"
+        )
+        await restarted.start()
+        transport.handle_message.side_effect = None
+        transport.handle_message.reset_mock()
+        await restarted.restore_queued()
+        await restarted.flush()
+        await restarted.task_queue
+        transport.handle_message.assert_awaited_once()
+        assert json.loads(transport.handle_message.call_args[0][1]) == {"test": "payload"}
+        assert await restarted.durable_queue.restore() == []
+
+        mgr.outbound_new = []
+        mgr.running_transports = {}
+        queued.endpoint = "ftp://localhost"
+        with mock.patch.object(
+            mgr.durable_queue, "restore", mock.CoroutineMock(return_value=[queued])
+        ):
+            await mgr.restore_queued()
+        assert not mgr.outbound_new
+        assert await mgr.durable_queue.restore() == []
+
+    async def test_circuit_breakers(self):
+        self.profile = await create_test_profile(
+            {
+                "transport.circuit.failure_threshold": 1,
+                "transport.endpoint_max_in_flight": 1,
+            }
+        )
+        mock_handle_not_delivered = mock.MagicMock()
+        mgr = OutboundTransportManager(self.profile, mock_handle_not_delivered)
+        assert mgr.circuits.failure_threshold == 1
+        assert mgr.circuits.reset_timeout == test_module.DEFAULT_RESET_TIMEOUT
+        assert not mgr.circuit_fail_fast
+
+        messages = []
+        for _ in range(3):
+            queued = QueuedOutboundMessage(None, None, None, "transport_cls")
+            queued.endpoint = "http://mediator/"
+            queued.payload = "{}"
+            queued.state = QueuedOutboundMessage.STATE_PENDING
+            queued.retries = 1
+            queued.message = mock.MagicMock()
+            mgr.outbound_buffer.add(queued)
+            messages.append(queued)
+
+        with mock.patch.object(
+            mgr, "deliver_queued_message", mock.MagicMock()
+        ) as mock_deliver:
+            # only one delivery at a time to the endpoint
+            for queued in messages:
+                mgr._process_ready(queued)
+            mock_deliver.assert_called_once_with(messages[0])
+            assert mgr.circuits.parked_count == 2
+
+            # the failed delivery opens the circuit and resumes parked messages
+            with mock.patch.object(mgr, "process_queued", mock.MagicMock()):
+                mgr.finished_deliver(
+                    messages[0], mock.MagicMock(exc_info=(KeyError, KeyError(), None))
+                )
+            assert list(mgr.outbound_ready) == messages[1:]
+            assert mgr.circuits.open_count == 1
+
+            # held until the circuit may close, using up a retry
+            mgr._process_ready(messages[1])
+            assert messages[1].state == QueuedOutboundMessage.STATE_RETRY
+            assert messages[1].retries == 0
+            assert messages[1].first_attempt_at is not None
+            assert mgr.outbound_retry[-1][2] is messages[1]
+
+            # and failed once the retries are used up
+            mgr._process_ready(messages[1])
+            assert messages[1].state == QueuedOutboundMessage.STATE_DONE
+            assert isinstance(messages[1].error, OutboundDeliveryError)
+            mock_handle_not_delivered.reset_mock()
+
+            # or failed right away
+            mgr.circuit_fail_fast = True
+            mgr._process_ready(messages[2])
+            assert messages[2].state == QueuedOutboundMessage.STATE_DONE
+            assert isinstance(messages[2].error, OutboundDeliveryError)
+            assert messages[2] not in mgr.outbound_buffer
+            mock_handle_not_delivered.assert_called_once_with(None, messages[2].message)
+            mock_deliver.assert_called_once()
+
+    async def test_retry_policy(self):
+        self.profile = await create_test_profile(
+            {
+                "transport.retry.delay": 1.0,
+                "transport.retry.jitter": 0.0,
+                "transport.retry.budget": 5.0,
+                "transport.retry.schemes": {"ws": {"delay": 30.0, "budget": None}},
+            }
+        )
+        mgr = OutboundTransportManager(self.profile)
+        policy = mgr.get_retry_policy("http://localhost")
+        assert (policy.interval, policy.multiplier, policy.budget) == (1.0, 2.0, 5.0)
+        policy = mgr.get_retry_policy("ws://localhost")
+        assert (policy.interval, policy.jitter, policy.budget) == (30.0, 0.0, None)
+
+        queued = QueuedOutboundMessage(None, None, None, "transport_cls")
+        queued.endpoint = "http://localhost"
+        queued.retries = 4
+        queued.first_attempt_at = test_module.get_timer()
+        failed = mock.MagicMock(exc_info=(KeyError, KeyError(), None))
+        with mock.patch.object(mgr, "process_queued", mock.MagicMock()):
+            # back off exponentially
+            delays = []
+            for _ in range(2):
+                before = test_module.get_timer()
+                mgr.finished_deliver(queued, failed)
+                assert queued.state == QueuedOutboundMessage.STATE_RETRY
+                delays.append(round(queued.retry_at - before))
+            assert delays == [1, 2]
+
+            # give up once the time budget is used up
+            queued.first_attempt_at -= 60
+            mgr.finished_deliver(queued, failed)
+            assert queued.state == QueuedOutboundMessage.STATE_DONE
+            assert queued.retries == 2
 
     async def test_finished_deliver_x_log_debug(self):
-        mock_queued = mock.MagicMock(state=QueuedOutboundMessage.STATE_DONE, retries=1)
+        mock_queued = mock.MagicMock(
+            state=QueuedOutboundMessage.STATE_DONE,
+            retries=1,
+            attempts=0,
+            first_attempt_at=None,
+        )
         mock_completed_x = mock.MagicMock(exc_info=KeyError("an error occurred"))
 
         self.profile = await create_test_profile()
         mock_handle_not_delivered = mock.MagicMock()
         mgr = OutboundTransportManager(self.profile, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.outbound_buffer.add(mock_queued)
         with (
             mock.patch.object(test_module.LOGGER, "exception", mock.MagicMock()),
             mock.patch.object(test_module.LOGGER, "error", mock.MagicMock()),
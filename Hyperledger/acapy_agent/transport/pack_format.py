@@ -1,6 +1,5 @@
 """Standard packed message format classes."""
 
-import json
 import logging
 from typing import List, Sequence, Tuple, Union
 
@@ -8,6 +7,7 @@ from ..core.profile import ProfileSession
 from ..messaging.base_message import DIDCommVersion
 from ..messaging.util import time_now
 from ..protocols.routing.v1_0.messages.forward import Forward
+from ..utils import json_codec
 from ..wallet.base import BaseWallet
 from ..wallet.error import WalletError
 from ..wallet.util import b64_to_str
@@ -31,11 +31,11 @@ def get_version_for_packed_msg(packed_msg: Union[str, bytes]):
     """Get the version of the packed message."""
 
     # Raise differnt errors? Not ValueError?
-    protected_b64 = json.loads(packed_msg).get("protected")
+    protected_b64 = json_codec.loads(packed_msg).get("protected")
     if not protected_b64:
         raise ValueError("Invalid message format")
 
-    protected = json.loads(b64_to_str(protected_b64))
+    protected = json_codec.loads(b64_to_str(protected_b64))
 
     typ = protected.get("typ")
     if not typ:
@@ -54,7 +54,7 @@ def get_version_for_packed_msg(packed_msg: Union[str, bytes]):
 def get_version_for_outbound_msg(outbound_msg: Union[str, bytes]):
     """Get the version of the packed message."""
 
-    msg_json = json.loads(outbound_msg)
+    msg_json = json_codec.loads(outbound_msg)
 
     if DIDCOMM_V2_ID in msg_json:
         return DIDCommVersion.v2
@@ -208,7 +208,7 @@ class V1PackWireFormat(BaseWireFormat):
             raise WireFormatParseError("Message body is empty")
 
         try:
-            message_dict = json.loads(message_json)
+            message_dict = json_codec.loads(message_json)
         except ValueError:
             raise WireFormatParseError("Message JSON parsing failed")
         if not isinstance(message_dict, dict):
@@ -223,7 +223,7 @@ class V1PackWireFormat(BaseWireFormat):
             else:
                 receipt.raw_message = message_json
                 try:
-                    message_dict = json.loads(message_json)
+                    message_dict = json_codec.loads(message_json)
                 except ValueError:
                     raise WireFormatParseError("Message JSON parsing failed")
                 if not isinstance(message_dict, dict):
@@ -324,7 +324,7 @@ class V1PackWireFormat(BaseWireFormat):
         if routing_keys:
             recip_keys = recipient_keys
             for router_key in routing_keys:
-                message = json.loads(message.decode("utf-8"))
+                message = json_codec.loads(message)
                 fwd_msg = Forward(to=recip_keys[0], msg=message)
                 # Forwards are anon packed
                 recip_keys = [router_key]
@@ -349,8 +349,10 @@ class V1PackWireFormat(BaseWireFormat):
         """
 
         try:
-            message_dict = json.loads(message_body)
-            protected = json.loads(b64_to_str(message_dict["protected"], urlsafe=True))
+            message_dict = json_codec.loads(message_body)
+            protected = json_codec.loads(
+                b64_to_str(message_dict["protected"], urlsafe=True)
+            )
             recipients = protected["recipients"]
 
             recipient_keys = [recipient["header"]["kid"] for recipient in recipients]
@@ -8,12 +8,12 @@ try:
 except ImportError as err:
     raise ImportError("Install the didcommv2 extra to use this module.") from err
 
-import json
 from typing import Sequence, Tuple, Union
 
 from ..core.profile import ProfileSession
 from ..messaging.base_message import DIDCommVersion
 from ..messaging.util import time_now
+from ..utils import json_codec
 from ..wallet.base import BaseWallet
 from ..wallet.error import WalletNotFoundError
 from .error import WireFormatParseError
@@ -47,7 +47,7 @@ class V2PackWireFormat(BaseWireFormat):
             raise WireFormatParseError("Message body is empty")
 
         try:
-            message_dict = json.loads(message_json)
+            message_dict = json_codec.loads(message_json)
         except ValueError:
             raise WireFormatParseError("Message JSON parsing failed")
         if not isinstance(message_dict, dict):
@@ -1,12 +1,12 @@
 """Abstract wire format classes."""
 
-import json
 import logging
 from abc import abstractmethod
 from typing import List, Sequence, Tuple, Union
 
 from ..core.profile import ProfileSession
 from ..messaging.util import time_now
+from ..utils import json_codec
 from .error import WireFormatParseError
 from .inbound.receipt import MessageReceipt
 
@@ -117,7 +117,7 @@ class JsonWireFormat(BaseWireFormat):
             raise WireFormatParseError("Message body is empty")
 
         try:
-            message_dict = json.loads(message_json)
+            message_dict = json_codec.loads(message_json)
         except ValueError:
             raise WireFormatParseError("Message JSON parsing failed")
         if not isinstance(message_dict, dict):
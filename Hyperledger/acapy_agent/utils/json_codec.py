@@ -0,0 +1,119 @@
+"""Pluggable JSON codec used for records, messages and admin responses.
+
+The accelerated `orjson` backend is used when it is installed, with the standard
+library as fallback. Values which the accelerated backend rejects (such as
+integers beyond 64 bits, or non-standard tokens like `NaN`) are handed to the
+standard library, so both backends produce the same values.
+"""
+
+import json
+import re
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JsonInput = Union[str, bytes, bytearray, memoryview]
+
+# integer literals which may not fit in 64 bits, which orjson parses as floats
+LONG_INT = re.compile(r"(?:^|[\[:,\s])-?\d{19}")
+LONG_INT_BYTES = re.compile(LONG_INT.pattern.encode())
+
+
+class JsonCodec:
+    """JSON codec backed by the standard library."""
+
+    name = "stdlib"
+
+    def dumps(self, obj: Any) -> str:
+        """Serialize a value to a JSON string."""
+        return json.dumps(obj)
+
+    def dumpb(self, obj: Any) -> bytes:
+        """Serialize a value to UTF-8 encoded JSON."""
+        return json.dumps(obj).encode("utf-8")
+
+    def loads(self, data: JsonInput) -> Any:
+        """Parse a JSON document from a string or UTF-8 encoded bytes."""
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec backed by `orjson`."""
+
+    name = "orjson"
+
+    # defer dates and dataclasses to the standard library, which rejects them
+    OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        if orjson
+        else 0
+    )
+
+    def dumps(self, obj: Any) -> str:
+        """Serialize a value to a JSON string."""
+        return self.dumpb(obj).decode("utf-8")
+
+    def dumpb(self, obj: Any) -> bytes:
+        """Serialize a value to UTF-8 encoded JSON."""
+        try:
+            return orjson.dumps(obj, option=self.OPTIONS)
+        except TypeError:
+            return super().dumpb(obj)
+
+    def loads(self, data: JsonInput) -> Any:
+        """Parse a JSON document from a string or UTF-8 encoded bytes."""
+        if (LONG_INT if isinstance(data, str) else LONG_INT_BYTES).search(data):
+            return super().loads(data)
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return super().loads(data)
+
+
+CODECS = {JsonCodec.name: JsonCodec}
+if orjson:
+    CODECS[OrjsonCodec.name] = OrjsonCodec
+
+_codec: JsonCodec = OrjsonCodec() if orjson else JsonCodec()
+
+
+def get_codec() -> JsonCodec:
+    """Get the JSON codec in use."""
+    return _codec
+
+
+def set_codec(codec: Union[str, JsonCodec]):
+    """Replace the JSON codec in use.
+
+    Args:
+        codec: A codec instance, or the name of a registered codec
+
+    """
+    global _codec
+    if isinstance(codec, str):
+        if codec not in CODECS:
+            raise ValueError(f"Unsupported JSON codec: {codec}")
+        codec = CODECS[codec]()
+    _codec = codec
+
+
+def dumps(obj: Any) -> str:
+    """Serialize a value to a JSON string using the current codec."""
+    return _codec.dumps(obj)
+
+
+def dumpb(obj: Any) -> bytes:
+    """Serialize a value to UTF-8 encoded JSON using the current codec."""
+    return _codec.dumpb(obj)
+
+
+def loads(data: JsonInput) -> Any:
+    """Parse a JSON document using the current codec."""
+    return _codec.loads(data)
@@ -1,6 +1,7 @@
 """Utils for repeating tasks."""
 
 import asyncio
+import random
 from typing import Optional
 
 
@@ -88,3 +89,65 @@ class RepeatSequence:
             f"<{self.__class__.__name__} "
             f"limit={self.limit} interval={self.interval} backoff={self.backoff}>"
         )
+
+
+class BackoffSequence(RepeatSequence):
+    """Represents a repetition sequence with capped exponential backoff and jitter.
+
+    The interval before attempt `n + 1` is `interval * multiplier ** (n - 1)`,
+    capped at `max_interval`, and reduced by a random fraction of up to
+    `jitter` so that clients retrying together spread out.
+    """
+
+    def __init__(
+        self,
+        limit: int = 0,
+        interval: float = 0.0,
+        multiplier: float = 2.0,
+        max_interval: Optional[float] = None,
+        jitter: float = 0.0,
+        budget: Optional[float] = None,
+    ):
+        """Initialize the sequence instance.
+
+        Args:
+            limit: The maximum number of attempts, or 0 for no limit
+            interval: The interval before the second attempt
+            multiplier: The factor applied to the interval after each attempt
+            max_interval: The maximum interval between attempts
+            jitter: The maximum fraction of each interval randomly skipped,
+                from 0 for none to 1 for the full interval
+            budget: The maximum time from the first to the last attempt
+
+        """
+        super().__init__(limit, interval)
+        self.multiplier = multiplier
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.budget = budget
+
+    def next_interval(self, index: int) -> float:
+        """Calculate the time before the next attempt."""
+        try:
+            interval = self.interval * pow(self.multiplier, index - 1)
+        except OverflowError:
+            # long past any cap, which still applies
+            interval = float("inf")
+        if self.max_interval is not None:
+            interval = min(interval, self.max_interval)
+        if self.jitter:
+            interval *= 1 - self.jitter * random.random()
+        return interval
+
+    def within_budget(self, elapsed: float) -> bool:
+        """Check whether an attempt this long after the first one is allowed."""
+        return self.budget is None or elapsed <= self.budget
+
+    def __repr__(self) -> str:
+        """Format as a string for debugging."""
+        return (
+            f"<{self.__class__.__name__} "
+            f"limit={self.limit} interval={self.interval} "
+            f"multiplier={self.multiplier} max_interval={self.max_interval} "
+            f"jitter={self.jitter} budget={self.budget}>"
+        )
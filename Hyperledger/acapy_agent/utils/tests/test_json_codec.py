@@ -0,0 +1,57 @@
+import json
+from datetime import datetime
+from unittest import TestCase
+
+import pytest
+
+from .. import json_codec as test_module
+
+DOCUMENT = {"a": [1, 2.5, None, True], "b": {"c": "é"}, "d": "1" * 30}
+
+
+class TestJsonCodec(TestCase):
+    def tearDown(self):
+        test_module.set_codec(
+            test_module.OrjsonCodec() if test_module.orjson else test_module.JsonCodec()
+        )
+
+    def test_stdlib(self):
+        codec = test_module.JsonCodec()
+        assert codec.dumps(DOCUMENT) == json.dumps(DOCUMENT)
+        assert codec.loads(codec.dumps(DOCUMENT)) == DOCUMENT
+        assert codec.loads(codec.dumpb(DOCUMENT)) == DOCUMENT
+        assert codec.loads(memoryview(codec.dumpb(DOCUMENT))) == DOCUMENT
+
+    @pytest.mark.skipif(not test_module.orjson, reason="orjson not installed")
+    def test_orjson(self):
+        codec = test_module.OrjsonCodec()
+        assert json.loads(codec.dumps(DOCUMENT)) == DOCUMENT
+        assert codec.loads(codec.dumps(DOCUMENT)) == DOCUMENT
+        assert codec.loads(memoryview(codec.dumpb(DOCUMENT))) == DOCUMENT
+        assert codec.loads(codec.dumps({1: "one"})) == {"1": "one"}
+
+    @pytest.mark.skipif(not test_module.orjson, reason="orjson not installed")
+    def test_orjson_stdlib_fallback(self):
+        codec = test_module.OrjsonCodec()
+        big = {"n": 2**70, "m": [-(2**64) - 1]}
+        assert codec.loads(codec.dumps(big)) == big
+        assert codec.loads(b"18446744073709551617") == 2**64 + 1
+        assert codec.loads("[NaN]")[0] != codec.loads("[NaN]")[0]
+        with self.assertRaises(TypeError):
+            codec.dumps({"when": datetime.now()})
+        with self.assertRaises(json.JSONDecodeError):
+            codec.loads("{not json")
+
+    def test_set_codec(self):
+        test_module.set_codec("stdlib")
+        assert test_module.get_codec().name == "stdlib"
+        assert test_module.dumps({"a": 1}) == '{"a": 1}'
+        assert test_module.dumpb({"a": 1}) == b'{"a": 1}'
+        assert test_module.loads(b'{"a": 1}') == {"a": 1}
+
+        codec = test_module.JsonCodec()
+        test_module.set_codec(codec)
+        assert test_module.get_codec() is codec
+
+        with self.assertRaises(ValueError):
+            test_module.set_codec("simplejson")
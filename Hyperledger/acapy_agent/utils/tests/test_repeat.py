@@ -31,8 +31,30 @@ class TestRepeat(IsolatedAsyncioTestCase):
                 seen += 1
             assert seen == len(expect)
 
+    def test_backoff(self):
+        seq = test_module.BackoffSequence(
+            5, interval=10.0, multiplier=2.0, max_interval=50.0
+        )
+        assert [attempt.next_interval for attempt in seq] == [10, 20, 40, 50, 50]
+        # the interval stays capped where the power would overflow
+        assert seq.next_interval(2000) == 50
+
+        seq = test_module.BackoffSequence(interval=10.0, jitter=0.5)
+        with mock.patch.object(test_module.random, "random", return_value=1.0):
+            assert seq.next_interval(2) == 10.0
+        with mock.patch.object(test_module.random, "random", return_value=0.0):
+            assert seq.next_interval(2) == 20.0
+
+        assert seq.within_budget(3600)
+        seq = test_module.BackoffSequence(interval=10.0, budget=60.0)
+        assert seq.within_budget(60)
+        assert not seq.within_budget(61)
+
     def test_repr(self):
         assert repr(test_module.RepeatSequence(5, interval=5.0, backoff=0.25)).startswith(
             "<RepeatSequence"
         )
         assert repr(test_module.RepeatAttempt(None)).startswith("<RepeatAttempt")
+        assert repr(test_module.BackoffSequence(interval=5.0)).startswith(
+            "<BackoffSequence"
+        )